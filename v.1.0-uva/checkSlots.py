@@ -1,26 +1,28 @@
-def checkSlotsFirstFit(n, l):
+def consecutiveBlocks(l):
+    # Percorre a lista ordenada uma única vez e devolve os blocos de slots consecutivos
     l = sorted(l)
-    for i in range(len(l)):
-        sublist = l[i:n+i]
-        if len(sublist) < n:
-            return []
-        consecutive = sorted(sublist) == list(range(min(sublist), max(sublist)+1))
-        if consecutive:
-            return sublist
+    blocks = []
+    start = 0
+    for i in range(1, len(l) + 1):
+        if i == len(l) or l[i] != l[i-1] + 1:
+            blocks.append(l[start:i])
+            start = i
+    return blocks
+
+def checkSlotsFirstFit(n, l):
+    # Os n primeiros slots do primeiro bloco de slots consecutivos com pelo menos n slots
+    for block in consecutiveBlocks(l):
+        if len(block) >= n:
+            return block[:n]
     return []
 
 def checkSlotsBestGap(n, l):
-    l = sorted(l)
+    # Procura o menor bloco de slots consecutivos com pelo menos n slots e devolve os seus n primeiros slots
     best_gap = None
-    for i in range(len(l)):
-        sublist = l[i:n+i]
-        if len(sublist) < n:
-            break
-        consecutive = sorted(sublist) == list(range(min(sublist), max(sublist)+1))
-        if consecutive:
-            if best_gap is None or (max(sublist) - min(sublist) < max(best_gap) - min(best_gap)):
-                best_gap = sublist
-    return best_gap if best_gap else []
+    for block in consecutiveBlocks(l):
+        if len(block) >= n and (best_gap is None or len(block) < len(best_gap)):
+            best_gap = block
+    return best_gap[:n] if best_gap else []
 
 # Dados fornecidos
 lista = [0, 2, 3, 4, 5, 7, 8, 9, 12, 20, 21, 22]
@@ -0,0 +1,163 @@
+"""
+Escalabilidade do controlador em topologias sintéticas grandes (components.topology_generators).
+Para cada combinação de topologia, número de nós, número de slots e tráfego oferecido corre o ciclo completo de
+chegada/alocação/libertação (núcleo rápido sobre um traço) e reporta pedidos/s, pico de memória residente e o tempo
+de cada fase:
+    - topologia: geração e compilação;
+    - traço: geração dos pedidos;
+    - controlador: construção do Control (caminhos calculados a pedido, precompute_routes=False);
+    - encaminhamento: cálculo dos k caminhos dos pares que recebem pedidos;
+    - simulação: chegadas, alocações e libertações.
+Cada ponto corre num processo novo, para que o pico de memória (getrusage) seja apenas o desse ponto.
+O tráfego é indicado em Erlang para toda a rede e convertido na carga por par de nós usada pelo simulador,
+load = erlangs / (N·(N-1)), de forma que a ocupação não cresce com N² quando a rede aumenta.
+
+Uso: python benchmarks/bench_scaling.py [--kinds waxman grid] [--nodes 50 100 250 500 1000] [--slots 80 320]
+                                        [--erlangs 500 2000] [--requests 20000] [--json resultados.json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import simulation  # noqa: E402
+from components.fast_kernel import Clock, run_fast  # noqa: E402
+from components.light_path_control import Control  # noqa: E402
+from components.topology_generators import GENERATORS, generate_topology  # noqa: E402
+
+console = Console()
+
+PHASES = ("topology", "trace", "control", "routing", "simulation")
+PHASE_LABELS = {"topology": "Topologia", "trace": "Traço", "control": "Controlador", "routing": "Rotas", "simulation": "Simulação"}
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo (MB); no Linux ru_maxrss vem em KB, no macOS em bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_point(kind, nodes, num_slots, erlangs, requests, holding_time=10.0, num_max_slots=8, routing="k_shortest", seed=0):
+    """
+    Corre um ponto do benchmark (função de topo para poder ser enviada aos processos).
+
+    Returns:
+        dict: Parâmetros do ponto, tempo de cada fase (s), pedidos/s, pico de memória (MB) e taxa de bloqueio.
+    """
+    times = {}
+    start = time.perf_counter()
+    topology = generate_topology(kind, nodes, seed=seed)
+    times["topology"] = time.perf_counter() - start
+
+    load = erlangs / (nodes * (nodes - 1))
+    config = simulation.make_config(seed=seed, load=load, holding_time=holding_time, num_max_pet=requests,
+                                    num_max_slots=num_max_slots, num_slots=num_slots, duration=float("inf"))
+    start = time.perf_counter()
+    trace = simulation.build_trace(topology, config)
+    times["trace"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    control = Control(Clock(), topology, debug=True, tab=False, verbose=False, record_lost=False, num_slots=num_slots,
+                      num_txrx=requests, routing=routing, precompute_routes=False)
+    times["control"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for src, dst in np.unique(np.column_stack([trace["src"], trace["dst"]]), axis=0).tolist():
+        control.routing.routes(src, dst)
+    times["routing"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    run_fast(control, trace)
+    times["simulation"] = time.perf_counter() - start
+
+    total = control.accepted + control.blocked
+    return {
+        "kind": kind,
+        "nodes": nodes,
+        "edges": topology.num_edges,
+        "slots": num_slots,
+        "erlangs": erlangs,
+        "requests": total,
+        "blocking_probability": control.blocked / total if total else 0.0,
+        "requests_per_second": total / times["simulation"] if times["simulation"] else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "times": times,
+    }
+
+
+def run_benchmark(kinds, nodes, slots, erlangs, requests, workers=1, **kwargs):
+    """
+    Corre todos os pontos, cada um num processo novo.
+
+    Args:
+        workers (int): Pontos executados em simultâneo (1 para não perturbar os tempos).
+
+    Returns:
+        list: Resultados de run_point, pela ordem da grelha.
+    """
+    points = list(product(kinds, nodes, slots, erlangs))
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_point, kind, n, s, e, requests, **kwargs) for kind, n, s, e in points]
+        return [f.result() for f in futures]
+
+
+def print_results(results):
+    """Apresenta as tabelas de desempenho e de tempos por fase (um ponto por linha: topologia-nós/slots/Erlang)."""
+    labels = [f"{r['kind']}-{r['nodes']}/{r['slots']}/{r['erlangs']:g}" for r in results]
+    table = Table(title="Escalabilidade do controlador")
+    table.add_column("Ponto", style="cyan")
+    table.add_column("Fibras", justify="right")
+    table.add_column("Bloqueio", justify="right")
+    table.add_column("Pedidos/s", justify="right", style="green")
+    table.add_column("Pico RSS (MB)", justify="right", style="yellow")
+    for label, r in zip(labels, results):
+        table.add_row(label, str(r["edges"]), f"{r['blocking_probability']:.4f}", f"{r['requests_per_second']:,.0f}",
+                      f"{r['peak_rss_mb']:.0f}")
+    console.print(table)
+
+    table = Table(title="Tempo por fase (s)")
+    table.add_column("Ponto", style="cyan")
+    for phase in PHASES:
+        table.add_column(PHASE_LABELS[phase], justify="right")
+    for label, r in zip(labels, results):
+        table.add_row(label, *[f"{r['times'][phase]:.3f}" for phase in PHASES])
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escalabilidade em topologias sintéticas")
+    parser.add_argument("--kinds", nargs="+", choices=list(GENERATORS), default=["waxman"], help="tipos de topologia")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[50, 100, 250, 500, 1000], help="números de nós")
+    parser.add_argument("--slots", type=int, nargs="+", default=[80, 320], help="números de slots por fibra")
+    parser.add_argument("--erlangs", type=float, nargs="+", default=[500.0], help="tráfego oferecido a toda a rede (Erlang)")
+    parser.add_argument("--requests", type=int, default=20000, help="pedidos por ponto")
+    parser.add_argument("--holding-time", dest="holding_time", type=float, default=10.0, help="duração média dos lightpaths (s)")
+    parser.add_argument("--max-slots", dest="num_max_slots", type=int, default=8, help="número máximo de slots por pedido")
+    parser.add_argument("--routing", default="k_shortest", help="estratégia de encaminhamento")
+    parser.add_argument("--workers", type=int, default=1, help="pontos executados em simultâneo")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="grava os resultados num ficheiro JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.kinds, args.nodes, args.slots, args.erlangs, args.requests, args.workers,
+                            holding_time=args.holding_time, num_max_slots=args.num_max_slots, routing=args.routing,
+                            seed=args.seed)
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"[bold green]Resultados gravados em {args.json}[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
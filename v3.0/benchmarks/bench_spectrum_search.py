@@ -0,0 +1,133 @@
+"""
+Compara a biblioteca de procura espectral (components.spectrum_search) com as implementações anteriores de
+checkSlotsFirstFit e checkSlotsBestGap, copiadas abaixo tal como estavam em Control.
+Verifica também que first fit em listas coincide com a versão anterior (o best gap anterior escolhia mal os blocos)
+e que fit_slots, fit_mask e search_all coincidem com search sobre os blocos extraídos.
+
+Uso: python benchmarks/bench_spectrum_search.py [--slots 10 80 320] [--occupancy 0.5] [--samples 2000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.spectrum_search import POLICIES, runs_from_mask, search, search_all, fit_mask, fit_slots, block_slots  # noqa: E402
+
+console = Console()
+
+
+def legacy_first_fit(n, l):
+    """checkSlotsFirstFit anterior."""
+    l = sorted(l)
+    for i in range(len(l)):
+        sublist = l[i:n + i]
+        if len(sublist) < n:
+            return []
+        consecutive = sorted(sublist) == list(range(min(sublist), max(sublist) + 1))
+        if consecutive:
+            return sublist
+    return []
+
+
+def legacy_best_gap(n_slot, lista):
+    """checkSlotsBestGap anterior."""
+    index = []
+    sublist = []
+    for i in range(len(lista)):
+        try:
+            if lista[i] + 1 == lista[i + 1]:
+                index.append(lista[i])
+                if i + 1 == len(lista) - 1:
+                    index.append(lista[i + 1])
+            else:
+                if lista[i - 1] == lista[i] - 1:
+                    index.append(lista[i])
+                if len(index) >= n_slot:
+                    sublist.append(index)
+                index = []
+        except:
+            if len(index) >= n_slot:
+                sublist.append(index)
+
+    if sublist:
+        while True:
+            for lista2 in sublist:
+                if len(lista2) == n_slot:
+                    return lista2
+            n_slot += 1
+    else:
+        return []
+
+
+def make_samples(num_slots, occupancy, samples, seed=0):
+    """Gera listas de slots livres e as máscaras equivalentes."""
+    rng = np.random.default_rng(seed)
+    lists, masks = [], []
+    for _ in range(samples):
+        free = np.flatnonzero(rng.random(num_slots) >= occupancy).tolist()
+        lists.append(free)
+        mask = 0
+        for s in free:
+            mask |= 1 << s
+        masks.append(mask)
+    return lists, masks
+
+
+def bench(num_slots, occupancy, samples, n=3, repeat=3):
+    """
+    Mede o tempo médio por consulta de cada implementação.
+
+    Returns:
+        dict: Microssegundos por consulta de cada implementação.
+    """
+    lists, masks = make_samples(num_slots, occupancy, samples)
+    for l, m in zip(lists, masks):
+        assert legacy_first_fit(n, l) == block_slots(fit_slots(l, n, "first_fit"), n)
+        runs = runs_from_mask(m)
+        assert fit_slots(l, n, "best_fit") == search(runs, n, "best_fit")
+        deterministic = [p for p in POLICIES if p != "random_fit"]
+        assert all(fit_mask(m, n, p) == search(runs, n, p) for p in deterministic)
+        assert fit_mask(m, n, "random_fit", np.random.default_rng(1)) == search(runs, n, "random_fit", np.random.default_rng(1))
+        assert search_all(m, n, np.random.default_rng(1)) == {p: search(runs, n, p, np.random.default_rng(1)) for p in POLICIES}
+
+    rng = np.random.default_rng(0)
+    cases = {
+        "legado first fit": lambda: [legacy_first_fit(n, l) for l in lists],
+        "legado best gap": lambda: [legacy_best_gap(n, l) for l in lists],
+        "lista -> first fit": lambda: [fit_slots(l, n, "first_fit") for l in lists],
+        "lista -> best fit": lambda: [fit_slots(l, n, "best_fit") for l in lists],
+        "máscara -> first fit": lambda: [fit_mask(m, n, "first_fit") for m in masks],
+        "máscara -> last fit": lambda: [fit_mask(m, n, "last_fit") for m in masks],
+        "máscara -> best fit": lambda: [fit_mask(m, n, "best_fit") for m in masks],
+        "máscara -> todas, uma a uma": lambda: [[fit_mask(m, n, p, rng) for p in POLICIES] for m in masks],
+        "máscara -> todas (search_all)": lambda: [search_all(m, n, rng) for m in masks],
+    }
+    return {name: min(timeit.repeat(fn, number=1, repeat=repeat)) / samples * 1e6 for name, fn in cases.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da procura espectral")
+    parser.add_argument("--slots", type=int, nargs="+", default=[10, 80, 320])
+    parser.add_argument("--occupancy", type=float, default=0.5, help="fração de slots ocupados")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--n", type=int, default=3, help="número de slots pedidos")
+    args = parser.parse_args()
+
+    results = {num_slots: bench(num_slots, args.occupancy, args.samples, args.n) for num_slots in args.slots}
+    table = Table(title=f"Procura espectral (µs por consulta, n={args.n}, ocupação={args.occupancy:g})")
+    table.add_column("Implementação", style="cyan")
+    for num_slots in args.slots:
+        table.add_column(f"{num_slots} slots", justify="right")
+    for name in next(iter(results.values())):
+        table.add_row(name, *[f"{results[s][name]:.2f}" for s in args.slots])
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+Suite de benchmarks do caminho crítico da alocação.
+Micro-benchmarks (µs por operação): checkSlotsFirstFit, checkSlotsBestGap, get_available_channels, get_edge_indices,
+Control.allocate e Control.remove, sobre a NSFNET com o espectro parcialmente ocupado.
+Macro-benchmarks: simulações completas da NSFNET para várias cargas e números de slots (pedidos/s e taxa de bloqueio).
+
+Cada benchmark é uma função registada com @benchmark; para acrescentar um basta definir a função, que recebe os
+parâmetros do caso e devolve (função a medir, número de operações por chamada) ou, nos macro-benchmarks, um dicionário
+já medido. Os resultados são gravados em benchmarks/results/<commit>.json (com o commit, a data e a máquina), de
+forma que as regressões se vejam de commit para commit, e --compare compara com uma execução anterior.
+Os tempos só são comparáveis na mesma máquina e com a mesma versão do Python: os resultados ficam apenas na máquina
+local (benchmarks/results/ não é versionado) e --compare recusa-se a comparar execuções de máquinas diferentes
+(sistema operativo, arquitetura, processador ou versão do Python), salvo com --force; as diferenças na versão do
+kernel são apenas mostradas.
+
+Uso: python benchmarks/run_benchmarks.py [--group micro|macro] [--filter allocate] [--compare HEAD~1] [--threshold 0.1]
+                                         [--force]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import numpy as np
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_spectrum_search import make_samples  # noqa: E402
+from components.fast_kernel import Clock  # noqa: E402
+from components.light_path_control import Control  # noqa: E402
+from components.light_path_request import LightPathRequest  # noqa: E402
+from components.topology import load_topology  # noqa: E402
+import nsfnet_network  # noqa: E402
+
+console = Console()
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, group: str = "micro", params=None):
+    """
+    Decorador que regista um benchmark.
+
+    Args:
+        name (str): Nome do benchmark.
+        group (str): "micro" (tempo por operação) ou "macro" (simulação completa).
+        params (list): Dicionários de parâmetros; o benchmark é executado uma vez por cada.
+    """
+    def register(fn):
+        BENCHMARKS[name] = {"fn": fn, "group": group, "params": params or [{}]}
+        return fn
+    return register
+
+
+def loaded_control(num_slots=80, occupancy=0.5, seed=0):
+    """
+    Controlador NSFNET com cerca de occupancy dos slots ocupados por lightpaths de 1 a 8 slots que nunca expiram.
+
+    Returns:
+        tuple: (controlador, gerador aleatório, pares (origem, destino) com caminho).
+    """
+    rng = np.random.default_rng(seed)
+    control = Control(Clock(), load_topology("nsfnet"), debug=True, tab=False, verbose=False, record_lost=False,
+                      num_slots=num_slots, num_txrx=10 ** 6, routing="k_shortest")
+    pairs = [(s, d) for s in control.topology.nodes for d in control.topology.nodes if s != d]
+    target = occupancy * num_slots * control.topology.num_edges
+    attempts = 0
+    while sum(control.slots.used) < target and attempts < 100 * len(pairs):
+        src, dst = pairs[rng.integers(len(pairs))]
+        control.allocate(src, dst, int(rng.integers(1, 9)))
+        attempts += 1
+    return control, rng, pairs
+
+
+@benchmark("checkSlotsFirstFit", params=[{"slots": 80}, {"slots": 320}])
+def bench_check_first_fit(slots, samples=2000, n=3):
+    control = Control(Clock(), load_topology("nsfnet"), tab=False, verbose=False)
+    lists, _ = make_samples(slots, 0.5, samples)
+    return lambda: [control.checkSlotsFirstFit(n, l) for l in lists], samples
+
+
+@benchmark("checkSlotsBestGap", params=[{"slots": 80}, {"slots": 320}])
+def bench_check_best_gap(slots, samples=2000, n=3):
+    control = Control(Clock(), load_topology("nsfnet"), tab=False, verbose=False)
+    lists, _ = make_samples(slots, 0.5, samples)
+    return lambda: [control.checkSlotsBestGap(n, l) for l in lists], samples
+
+
+@benchmark("get_available_channels", params=[{"slots": 80}, {"slots": 320}])
+def bench_available_channels(slots, samples=2000):
+    control, rng, pairs = loaded_control(slots)
+    routes = [control.routing.shortest(*pairs[i]) for i in rng.integers(len(pairs), size=samples)]
+    return lambda: [control.get_available_channels(path, index) for path, index in routes], samples
+
+
+@benchmark("get_edge_indices")
+def bench_edge_indices(samples=2000):
+    control, rng, pairs = loaded_control()
+    paths = [control.routing.shortest(*pairs[i])[0] for i in rng.integers(len(pairs), size=samples)]
+    return lambda: [control.get_edge_indices(path) for path in paths], samples
+
+
+@benchmark("Control.allocate", params=[{"slots": 80}, {"slots": 320}])
+def bench_allocate(slots, samples=2000):
+    """Alocação sobre a rede meio ocupada; cada lightpath alocado é libertado a seguir, para manter a ocupação."""
+    control, rng, pairs = loaded_control(slots)
+    requests = [(*pairs[i], int(n)) for i, n in zip(rng.integers(len(pairs), size=samples), rng.integers(1, 9, size=samples))]
+    allocate, release, txrx, node_index = control.allocate, control.slots.release, control.txrx, control.node_index
+
+    def run():
+        for src, dst, n in requests:
+            disp, slot_used, _ = allocate(src, dst, n)
+            if disp:
+                release(*slot_used)
+                txrx[node_index[src]][0] += 1
+                txrx[node_index[dst]][1] += 1
+    return run, samples
+
+
+@benchmark("Control.remove", params=[{"slots": 80}, {"slots": 320}])
+def bench_remove(slots, samples=2000):
+    """Expiração de samples lightpaths (heap de partidas e libertação do espectro); a preparação não é medida."""
+    def prepare():
+        rng = np.random.default_rng(0)
+        control = Control(Clock(), load_topology("nsfnet"), debug=True, tab=False, verbose=False, record_lost=False,
+                          num_slots=slots, num_txrx=10 ** 6, routing="k_shortest")
+        nodes = control.topology.nodes
+        for i in range(samples):
+            src, dst = rng.choice(nodes, 2, replace=False).tolist()
+            control.put(LightPathRequest(i, src, dst, 0.0, float(rng.exponential(10.0)), int(rng.integers(1, 5))))
+        return control
+
+    def run():
+        control = prepare()
+        start = time.perf_counter()
+        control.remove(float("inf"))
+        return time.perf_counter() - start, control.accepted
+    return run, None
+
+
+@benchmark("nsfnet", group="macro", params=[{"load": load, "slots": slots} for slots in (80, 320) for load in (0.5, 1.0, 2.0)])
+def bench_nsfnet(load, slots, requests=20000):
+    results = nsfnet_network.run_simulation({"load": load, "num_slots": slots, "num_max_pet": requests, "duration": 1e9,
+                                             "holding_time": 10.0, "num_max_slots": 12, "routing": "k_shortest",
+                                             "seed": 0})
+    return {
+        "requests_per_second": results["requests"] / results["wall_time"],
+        "blocking_probability": results["blocking_probability"],
+        "wall_time": results["wall_time"],
+    }
+
+
+def measure(entry, params, repeat=5):
+    """
+    Executa um benchmark com os parâmetros indicados.
+
+    Returns:
+        dict: Para os micro-benchmarks, µs por operação (mínimo e mediana das repetições); para os macro, o
+            dicionário devolvido pelo benchmark na repetição mais rápida.
+    """
+    if entry["group"] == "macro":
+        runs = [entry["fn"](**params) for _ in range(max(1, repeat // 2))]
+        return max(runs, key=lambda r: r["requests_per_second"])
+    fn, ops = entry["fn"](**params)
+    if ops is None:
+        # O próprio benchmark mede a parte relevante e devolve (segundos, operações)
+        times = [t / n for t, n in (fn() for _ in range(repeat))]
+    else:
+        fn()  # aquecimento
+        times = [t / ops for t in timeit.repeat(fn, number=1, repeat=repeat)]
+    return {"us_per_op": min(times) * 1e6, "us_per_op_median": float(np.median(times)) * 1e6}
+
+
+def case_name(name, params):
+    """Identificador de um caso, por exemplo "Control.allocate[slots=80]"."""
+    return name + ("[" + ",".join(f"{k}={v:g}" if isinstance(v, float) else f"{k}={v}" for k, v in params.items()) + "]" if params else "")
+
+
+def git_commit():
+    """Commit atual (abreviado), com o sufixo -dirty se houver alterações por gravar."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=BENCH_DIR).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, cwd=BENCH_DIR).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def run_suite(group=None, name_filter=None, repeat=5):
+    """
+    Executa os benchmarks selecionados.
+
+    Args:
+        group (str): Apenas o grupo indicado ("micro" ou "macro"); None executa ambos.
+        name_filter (str): Apenas os casos cujo identificador contém este texto.
+        repeat (int): Número de repetições de cada caso.
+
+    Returns:
+        dict: Metadados da execução e resultados por caso.
+    """
+    cases = {}
+    for name, entry in BENCHMARKS.items():
+        if group is not None and entry["group"] != group:
+            continue
+        for params in entry["params"]:
+            case = case_name(name, params)
+            if name_filter and name_filter not in case:
+                continue
+            console.print(f"[dim]{escape(case)}...[/dim]")
+            cases[case] = dict(measure(entry, params, repeat), group=entry["group"])
+    return {
+        "commit": git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "results": cases,
+    }
+
+
+# Campos de machine_info que tornam os tempos incomparáveis; os restantes (a versão do kernel, por exemplo, que muda
+# a cada atualização do sistema) são apenas informativos
+MACHINE_KEYS = ("system", "machine", "processor", "python")
+
+
+def machine_info():
+    """Máquina e versão do Python em que os benchmarks correm."""
+    return {"system": platform.system(), "machine": platform.machine(),
+            "processor": platform.processor() or platform.machine(), "python": platform.python_version(),
+            "release": platform.release(), "platform": platform.platform()}
+
+
+def machine_mismatch(current, previous):
+    """
+    Diferenças entre as máquinas de duas execuções, nos campos de MACHINE_KEYS.
+
+    Returns:
+        list: Tuplos (campo, valor na referência, valor atual) dos campos que diferem.
+    """
+    before = previous.get("machine", {})
+    return [(key, before.get(key), current.get(key)) for key in MACHINE_KEYS if before.get(key) != current.get(key)]
+
+
+def machine_changes(current, previous):
+    """
+    Diferenças informativas entre as máquinas de duas execuções, fora de MACHINE_KEYS.
+
+    Returns:
+        list: Tuplos (campo, valor na referência, valor atual) dos campos que diferem.
+    """
+    before = previous.get("machine", {})
+    return [(key, before.get(key), value) for key, value in current.items()
+            if key not in MACHINE_KEYS and before.get(key) != value]
+
+
+def metric(result):
+    """Métrica principal de um caso e se valores maiores são melhores."""
+    if "us_per_op" in result:
+        return result["us_per_op"], False
+    return result["requests_per_second"], True
+
+
+def find_results(ref):
+    """
+    Localiza os resultados de uma execução anterior.
+
+    Procura results/<commit>.json, com o commit abreviado completo (e não um prefixo, que apanharia outros commits).
+    Os resultados de uma árvore com alterações por gravar (<commit>-dirty.json) só são usados na falta daqueles, com
+    um aviso, porque não correspondem ao código do commit.
+
+    Args:
+        ref (str): Caminho de um ficheiro JSON ou referência git (commit, HEAD~1, ...) com resultados em RESULTS_DIR.
+    """
+    if os.path.exists(ref):
+        return ref
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", ref], capture_output=True, text=True, check=True, cwd=BENCH_DIR).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ref
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    if os.path.exists(path):
+        return path
+    dirty = os.path.join(RESULTS_DIR, f"{commit}-dirty.json")
+    if os.path.exists(dirty):
+        console.print(f"[bold yellow]Aviso: sem resultados limpos para {escape(commit)}; a usar {escape(dirty)}, medido com "
+                      "alterações por gravar (pode não corresponder ao código do commit).[/bold yellow]")
+        return dirty
+    raise FileNotFoundError(f"Sem resultados gravados para {ref} em {RESULTS_DIR}")
+
+
+def compare(current, previous, threshold=0.1):
+    """
+    Compara duas execuções e apresenta a variação de cada caso comum.
+
+    Args:
+        current (dict): Execução atual.
+        previous (dict): Execução de referência.
+        threshold (float): Piora relativa a partir da qual um caso é marcado como regressão.
+
+    Returns:
+        list: Casos com regressão (ou cujo resultado de simulação mudou).
+    """
+    title = f"{current['commit']} vs. {previous['commit']}"
+    if machine_mismatch(current["machine"], previous):
+        title += " [bold red](máquinas diferentes: tempos não comparáveis)[/bold red]"
+    table = Table(title=title)
+    table.add_column("Caso", style="cyan")
+    table.add_column("Antes", justify="right")
+    table.add_column("Agora", justify="right")
+    table.add_column("Variação", justify="right")
+    table.add_column("", justify="left")
+    regressions = []
+    for case, result in current["results"].items():
+        if case not in previous["results"]:
+            continue
+        before, higher_is_better = metric(previous["results"][case])
+        now, _ = metric(result)
+        change = (now - before) / before if before else 0.0
+        worse = -change if higher_is_better else change
+        status = ""
+        if worse > threshold:
+            status = "[bold red]regressão[/bold red]"
+            regressions.append(case)
+        elif worse < -threshold:
+            status = "[bold green]melhoria[/bold green]"
+        if result.get("blocking_probability") != previous["results"][case].get("blocking_probability"):
+            # Com a mesma semente, a taxa de bloqueio só muda se o comportamento do simulador mudou
+            status += " [bold yellow]bloqueio mudou[/bold yellow]"
+            regressions.append(case)
+        table.add_row(escape(case), f"{before:,.2f}", f"{now:,.2f}", f"{change:+.1%}", status)
+    console.print(table)
+    return regressions
+
+
+def print_results(run):
+    """Apresenta os resultados de uma execução."""
+    table = Table(title=f"Benchmarks ({run['commit']})")
+    table.add_column("Caso", style="cyan")
+    table.add_column("µs/op (mín.)", justify="right", style="green")
+    table.add_column("µs/op (mediana)", justify="right")
+    table.add_column("Pedidos/s", justify="right", style="green")
+    table.add_column("Bloqueio", justify="right")
+    for case, r in run["results"].items():
+        if r["group"] == "micro":
+            table.add_row(escape(case), f"{r['us_per_op']:.2f}", f"{r['us_per_op_median']:.2f}", "", "")
+        else:
+            table.add_row(escape(case), "", "", f"{r['requests_per_second']:,.0f}", f"{r['blocking_probability']:.4f}")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks do caminho crítico da alocação")
+    parser.add_argument("--group", choices=["micro", "macro"], default=None, help="executa apenas um grupo")
+    parser.add_argument("--filter", dest="name_filter", default=None, help="executa apenas os casos que contêm este texto")
+    parser.add_argument("--repeat", type=int, default=5, help="repetições de cada caso")
+    parser.add_argument("--output", default=None, help="ficheiro de resultados (por omissão, results/<commit>.json)")
+    parser.add_argument("--no-save", dest="save", action="store_false", help="não grava os resultados")
+    parser.add_argument("--compare", default=None, help="compara com os resultados de um commit ou ficheiro")
+    parser.add_argument("--threshold", type=float, default=0.1, help="piora relativa considerada regressão")
+    parser.add_argument("--force", action="store_true", help="compara mesmo que a referência seja de outra máquina ou versão do Python")
+    parser.add_argument("--list", action="store_true", help="lista os casos disponíveis e termina")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, entry in BENCHMARKS.items():
+            for params in entry["params"]:
+                print(f"{entry['group']:5}  {case_name(name, params)}")
+        return
+
+    previous = None
+    if args.compare:
+        try:
+            with open(find_results(args.compare)) as f:
+                previous = json.load(f)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        for key, before, now in machine_changes(machine_info(), previous):
+            console.print(f"[dim]{key}: {escape(str(before))} -> {escape(str(now))} (informativo)[/dim]")
+        mismatch = machine_mismatch(machine_info(), previous)
+        if mismatch:
+            console.print(f"[bold red]A referência {escape(str(previous.get('commit')))} foi medida noutra máquina: "
+                          "os tempos não são comparáveis.[/bold red]")
+            for key, before, now in mismatch:
+                console.print(f"[red]  {key}: {escape(str(before))} -> {escape(str(now))}[/red]")
+            if not args.force:
+                console.print("[bold red]Comparação recusada (use --force para comparar mesmo assim).[/bold red]")
+                sys.exit(2)
+
+    run = run_suite(args.group, args.name_filter, args.repeat)
+    print_results(run)
+    if args.save:
+        path = args.output or os.path.join(RESULTS_DIR, f"{run['commit']}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(run, f, indent=2)
+        console.print(f"[bold green]Resultados gravados em {path}[/bold green]")
+    if previous is not None:
+        if compare(run, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
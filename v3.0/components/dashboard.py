@@ -0,0 +1,139 @@
+"""
+Painel de recursos em tempo real.
+Em vez de reconstruir as tabelas a cada pedido, o painel é desenhado por uma thread própria (a do Rich Live),
+a uma taxa fixa, a partir de uma cópia do estado espectral. Mostra resumos por fibra (ocupação e fragmentação)
+em vez de uma coluna por slot.
+"""
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+
+
+class ResourceDashboard:
+    """
+    Painel Rich Live com o estado dos recursos de um controlador.
+    Usa-se como gestor de contexto à volta do ciclo de simulação.
+    """
+
+    def __init__(self, control, refresh_per_second: float = 2, max_fibers: int = 20, console: Console = None):
+        """
+        Inicializa o painel.
+
+        Args:
+            control (Control): O controlador cujos recursos são apresentados.
+            refresh_per_second (float): Taxa de atualização do painel.
+            max_fibers (int): Número máximo de fibras listadas (as mais ocupadas).
+            console (rich.console.Console): Consola de saída.
+        """
+        self.control = control
+        self.refresh_per_second = refresh_per_second
+        self.max_fibers = max_fibers
+        self.console = console if console is not None else Console()
+        self.live = None
+
+    def snapshot(self):
+        """
+        Copia o estado atual do controlador (operação barata, feita na thread de desenho).
+
+        Returns:
+            tuple: (tempo simulado, máscaras das fibras, matriz tx/rx).
+        """
+        control = self.control
+        return control.env.now, list(control.slots.masks), control.txrx.copy()
+
+    def fiber_summaries(self, masks):
+        """
+        Calcula o resumo de cada fibra a partir das máscaras de slots livres.
+
+        Args:
+            masks (list): Máscaras das fibras (bit a 1 = slot livre).
+
+        Returns:
+            list: Tuplos (fibra, ocupação, blocos livres, maior bloco livre, fragmentação externa).
+        """
+        grid = self.control.slots
+        num_slots = grid.num_slots
+        tracker = grid.fragmentation
+        if tracker is not None:
+            # Métricas já mantidas pelo controlador: leitura sem percorrer os slots
+            summaries = []
+            for i in range(grid.num_fibers):
+                m = tracker.fiber(i)
+                summaries.append((i, 1 - m["free_slots"] / num_slots, m["free_blocks"], m["largest_block"], m["external_fragmentation"]))
+            return summaries
+
+        summaries = []
+        for i, mask in enumerate(masks):
+            free = mask.bit_count()
+            blocks = grid.free_blocks(mask)
+            largest = max((length for _, length in blocks), default=0)
+            fragmentation = 1 - largest / free if free else 0.0
+            summaries.append((i, 1 - free / num_slots, len(blocks), largest, fragmentation))
+        return summaries
+
+    def render(self, snapshot=None):
+        """
+        Constrói a vista do painel a partir de uma cópia do estado.
+
+        Args:
+            snapshot (tuple): Estado devolvido por snapshot() (por omissão, o estado atual).
+
+        Returns:
+            rich.console.RenderableType: A vista a desenhar.
+        """
+        now, masks, txrx = snapshot if snapshot is not None else self.snapshot()
+        summaries = self.fiber_summaries(masks)
+        edges = list(self.control.network.edges())
+
+        # Tabela de tx/rx
+        table_txrx = Table(title="Recursos dos Nós (Tx/Rx)", show_header=True, header_style="bold magenta")
+        table_txrx.add_column("Nó", justify="right")
+        table_txrx.add_column("Tx", justify="right")
+        table_txrx.add_column("Rx", justify="right")
+        for node, (tx, rx) in zip(self.control.topology.nodes, txrx):
+            table_txrx.add_row(str(node), str(int(tx)), str(int(rx)))
+
+        # Resumo das fibras mais ocupadas
+        table_slots = Table(title="Recursos das Fibras (Resumo)", show_header=True, header_style="bold magenta")
+        table_slots.add_column("Fibra", justify="right")
+        table_slots.add_column("Ligação", justify="center")
+        table_slots.add_column("Ocupação", justify="right")
+        table_slots.add_column("Blocos Livres", justify="right")
+        table_slots.add_column("Maior Bloco", justify="right")
+        table_slots.add_column("Fragmentação", justify="right")
+        busiest = sorted(summaries, key=lambda s: s[1], reverse=True)[:self.max_fibers]
+        for i, used, blocks, largest, fragmentation in busiest:
+            u, v = edges[i][:2]
+            table_slots.add_row(str(i + 1), f"{u} -> {v}", f"{used:.0%}", str(blocks), str(largest), f"{fragmentation:.2f}")
+
+        count = len(summaries) or 1
+        mean_used = sum(s[1] for s in summaries) / count
+        mean_fragmentation = sum(s[4] for s in summaries) / count
+        header = Panel(f"[bold cyan]Tempo Simulado: {now:.2f}s[/bold cyan]    "
+                       f"Lightpaths ativos: {len(self.control.pkt_sent)}    "
+                       f"Ocupação média: {mean_used:.1%}    Fragmentação média: {mean_fragmentation:.2f}")
+
+        body = Table.grid(padding=(0, 2))
+        body.add_row(table_txrx, table_slots)
+        return Group(header, body)
+
+    def start(self):
+        """Inicia a thread de desenho do painel."""
+        self.live = Live(get_renderable=self.render, console=self.console,
+                         refresh_per_second=self.refresh_per_second, screen=False)
+        self.live.start()
+
+    def stop(self):
+        """Termina a thread de desenho do painel."""
+        if self.live is not None:
+            self.live.stop()
+            self.live = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,224 @@
+"""
+Desfragmentação do espectro com re-sintonização make-before-break.
+Os lightpaths ativos são deslocados, no mesmo caminho, para o bloco livre de menor índice. Como o novo bloco é
+reservado antes de o antigo ser libertado (make-before-break), só são aceites destinos que não se sobreponham ao
+bloco atual e o tráfego nunca é interrompido.
+O planeamento é guloso: os lightpaths são percorridos por ordem crescente do primeiro slot, de forma que cada um
+assenta sobre os que já foram compactados, e só se move um lightpath se o destino for estritamente mais baixo.
+Quando a desfragmentação é provocada por um bloqueio, apenas se consideram os lightpaths que partilham fibras com os
+caminhos candidatos do pedido bloqueado. O plano é primeiro ensaiado sobre cópias das máscaras das fibras movidas e
+pára assim que o pedido passa a caber; só então os movimentos são aplicados, pelo que um bloqueio que a compactação
+não resolve não move nenhum lightpath.
+"""
+
+import time
+from components.spectrum_search import fit_mask
+
+TRIGGERS = ("blocking", "periodic")
+
+
+class Defragmenter:
+    """
+    Motor de desfragmentação de um controlador.
+    """
+
+    def __init__(self, control, trigger: str = "blocking", period: float = 100.0, max_moves: int = None):
+        """
+        Inicializa o motor.
+
+        Args:
+            control (Control): O controlador cujos lightpaths (control.pkt_sent) são re-sintonizados.
+            trigger (str): "blocking" (desfragmenta quando um pedido é bloqueado e volta a tentá-lo) ou
+                "periodic" (desfragmenta toda a rede a cada period segundos simulados).
+            period (float): Intervalo entre desfragmentações periódicas.
+            max_moves (int): Número máximo de lightpaths movidos por execução (None para não limitar).
+        """
+        if trigger not in TRIGGERS:
+            raise ValueError(f"Modo de desfragmentação desconhecido: {trigger} (disponíveis: {', '.join(TRIGGERS)})")
+        self.control = control
+        self.trigger = trigger
+        self.period = period
+        self.max_moves = max_moves
+        self.next_run = period
+        self.runs = 0
+        self.moves = 0
+        self.recovered = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def plan(self, fibers=None):
+        """
+        Lightpaths candidatos a mover, por ordem crescente do primeiro slot.
+
+        Args:
+            fibers (set): Se indicado, apenas os lightpaths que usam alguma destas fibras.
+
+        Returns:
+            list: Lightpaths ativos (LightPathRequest).
+        """
+        active = self.control.pkt_sent.values()
+        if fibers is not None:
+            active = [p for p in active if not fibers.isdisjoint(p.slot_used[0])]
+        return sorted(active, key=lambda p: p.slot_used[1])
+
+    @staticmethod
+    def target(slots, slot_used) -> int:
+        """
+        Bloco livre de menor índice para um lightpath no seu caminho, se for mais baixo que o atual.
+        Make-before-break: o bloco atual continua ocupado, pelo que o destino nunca se sobrepõe a ele.
+
+        Args:
+            slots (SpectrumGrid): Estado espectral onde se procura.
+            slot_used (tuple): (índices das fibras, primeiro slot, número de slots) do lightpath.
+
+        Returns:
+            int: Primeiro slot do destino, ou -1 se o lightpath não deve ser movido.
+        """
+        index, start, n = slot_used
+        target = slots.fit(index, n, "first_fit")
+        return target if 0 <= target < start else -1
+
+    @staticmethod
+    def move(slots, slot_used, target: int) -> tuple:
+        """Reserva o destino e só depois liberta o bloco atual; devolve o novo slot_used."""
+        index, start, n = slot_used
+        slots.allocate(index, target, n)
+        slots.release(index, start, n)
+        return (index, target, n)
+
+    def retune(self, p) -> bool:
+        """
+        Move um lightpath para o bloco livre de menor índice no seu caminho, se for mais baixo que o atual.
+
+        Returns:
+            bool: Se o lightpath foi movido.
+        """
+        target = self.target(self.control.slots, p.slot_used)
+        if target < 0:
+            return False
+        p.slot_used = self.move(self.control.slots, p.slot_used, target)
+        return True
+
+    def run(self, fibers=None) -> int:
+        """
+        Executa uma desfragmentação, movendo diretamente os lightpaths.
+
+        Args:
+            fibers (set): Restringe o plano aos lightpaths que usam estas fibras.
+
+        Returns:
+            int: Número de lightpaths movidos.
+        """
+        start = time.perf_counter()
+        moves = 0
+        for p in self.plan(fibers):
+            if self.max_moves is not None and moves >= self.max_moves:
+                break
+            if self.retune(p):
+                moves += 1
+        self.runs += 1
+        self.moves += moves
+        self.elapsed += time.perf_counter() - start
+        return moves
+
+    def simulate(self, fibers, candidates) -> list:
+        """
+        Ensaia a compactação até o pedido caber, sem tocar no espectro nem nos lightpaths.
+        Só as máscaras das fibras movidas são copiadas, e a viabilidade é testada com uma procura first fit, que não
+        depende da política do RSA (todas encontram um bloco se existir alguma janela suficiente) nem consome o
+        gerador das estratégias aleatórias.
+
+        Args:
+            fibers (set): Restringe o plano aos lightpaths que usam estas fibras.
+            candidates (list): Caminhos candidatos do pedido, como tuplos (índices das fibras, número de slots).
+
+        Returns:
+            list: Movimentos (lightpath, primeiro slot do destino) a aplicar por ordem, o menor prefixo do plano com
+                que o pedido passa a caber, ou None se não passar a caber dentro de max_moves movimentos.
+        """
+        grid = self.control.slots
+        masks, full, edge, num_slots = grid.masks, grid.full, grid.edge, grid.num_slots
+        trial = {}  # Fibra -> máscara depois dos movimentos ensaiados
+
+        def available(index):
+            mask = full
+            for i in index:
+                mask &= trial[i] if i in trial else masks[i]
+            return mask | edge
+
+        moves = []
+        for p in self.plan(fibers):
+            index, start, n = p.slot_used
+            target = fit_mask(available(index), n, "first_fit")
+            if target < 0 or target >= start:
+                continue
+            if self.max_moves is not None and len(moves) >= self.max_moves:
+                return None
+            freed = grid.block(start, min(n, num_slots - start))
+            taken = grid.block(target, min(n, num_slots - target))
+            for i in index:
+                trial[i] = ((trial[i] if i in trial else masks[i]) | freed) & ~taken
+            moves.append((p, target))
+            if any(fit_mask(available(path), width, "first_fit") >= 0 for path, width in candidates):
+                return moves
+        return None
+
+    def on_arrival(self, now: float):
+        """Executa a desfragmentação periódica, se estiver na altura."""
+        if self.trigger == "periodic" and now >= self.next_run:
+            self.run()
+            self.next_run = now + self.period
+
+    def on_blocking(self, src, dst, n: int, widths: dict = None) -> bool:
+        """
+        Desfragmenta os caminhos candidatos de um pedido bloqueado, apenas se isso o fizer caber.
+        Os candidatos são os da estratégia de encaminhamento do RSA. Se nenhum tiver, em todas as fibras, pelo menos
+        a largura pedida em slots livres, nenhuma compactação o pode servir e o motor não corre. Caso contrário, a
+        compactação é ensaiada (simulate) e só é aplicada se o pedido passar a caber, com o menor número de movimentos
+        do plano.
+
+        Args:
+            src: O nó de origem do pedido.
+            dst: O nó de destino do pedido.
+            n (int): Número de slots do pedido, incluindo a banda de guarda (ver Control.demand).
+            widths (dict): Número de slots de cada caminho (modulação adaptativa), ou None.
+
+        Returns:
+            bool: Se o pedido passou a caber e deve ser tentado de novo.
+        """
+        if self.trigger != "blocking":
+            return False
+        control = self.control
+        slots = control.slots
+        candidates = []
+        fibers = set()
+        for _, index in control.rsa.routing.candidates(control.routing, slots, src, dst):
+            width = widths[index] if widths is not None else n
+            if width >= 0 and min(slots.available((i,)).bit_count() for i in index) >= width:
+                candidates.append((index, width))
+                fibers.update(index)
+        if not candidates:
+            self.skipped += 1
+            return False
+
+        start = time.perf_counter()
+        moves = self.simulate(fibers, candidates)
+        if moves is not None:
+            for p, target in moves:
+                p.slot_used = self.move(slots, p.slot_used, target)
+            self.moves += len(moves)
+            self.recovered += 1
+        self.runs += 1
+        self.elapsed += time.perf_counter() - start
+        return moves is not None
+
+    def report(self) -> dict:
+        """
+        Resumo da atividade do motor.
+
+        Returns:
+            dict: Execuções, lightpaths movidos, pedidos recuperados após bloqueio, bloqueios em que o motor não
+                correu por nenhum candidato ter slots livres suficientes e tempo gasto (s).
+        """
+        return {"trigger": self.trigger, "runs": self.runs, "moves": self.moves,
+                "recovered": self.recovered, "skipped": self.skipped, "elapsed": self.elapsed}
@@ -0,0 +1,145 @@
+"""
+Registo estruturado de eventos do controlador (lightpaths enviados, perdidos e expirados).
+Cada destino tem um nível mínimo; o controlador compara o nível antes de construir o evento,
+pelo que com NullSink o custo por evento é apenas uma comparação.
+"""
+
+import json
+from collections import deque
+from rich.console import Console
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning"}
+
+
+class EventSink:
+    """
+    Destino de eventos. As subclasses implementam write(record).
+    """
+
+    def __init__(self, level: int = INFO):
+        """
+        Args:
+            level (int): Nível mínimo dos eventos aceites (DEBUG, INFO, WARNING ou OFF).
+        """
+        self.level = level
+
+    def enabled(self, level: int) -> bool:
+        """Indica se os eventos deste nível são registados."""
+        return level >= self.level
+
+    def emit(self, level: int, kind: str, **fields):
+        """
+        Regista um evento, se o nível o permitir.
+
+        Args:
+            level (int): Nível do evento.
+            kind (str): Tipo do evento ("sent", "lost", "expired", ...).
+            **fields: Campos do evento.
+        """
+        if level >= self.level:
+            fields["level"] = LEVEL_NAMES.get(level, level)
+            fields["event"] = kind
+            self.write(fields)
+
+    def write(self, record: dict):
+        raise NotImplementedError
+
+    def close(self):
+        """Liberta os recursos do destino."""
+
+
+class NullSink(EventSink):
+    """Descarta todos os eventos."""
+
+    def __init__(self):
+        super().__init__(OFF)
+
+    def write(self, record: dict):
+        pass
+
+
+class RingBufferSink(EventSink):
+    """Guarda em memória apenas os últimos eventos."""
+
+    def __init__(self, capacity: int = 1000, level: int = INFO):
+        """
+        Args:
+            capacity (int): Número máximo de eventos guardados.
+            level (int): Nível mínimo dos eventos aceites.
+        """
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+
+    def write(self, record: dict):
+        self.records.append(record)
+
+
+class JsonlSink(EventSink):
+    """Escreve um evento por linha, em JSON, num ficheiro."""
+
+    def __init__(self, path: str, level: int = INFO):
+        """
+        Args:
+            path (str): Caminho do ficheiro JSONL.
+            level (int): Nível mínimo dos eventos aceites.
+        """
+        super().__init__(level)
+        self.file = open(path, "w")
+
+    def write(self, record: dict):
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ConsoleSink(EventSink):
+    """Apresenta os eventos no terminal com Rich, no formato legível original."""
+
+    STYLES = {"sent": "bright_white", "lost": "bright_red", "expired": "bright_yellow"}
+
+    def __init__(self, level: int = INFO, console: Console = None):
+        """
+        Args:
+            level (int): Nível mínimo dos eventos aceites.
+            console (rich.console.Console): Consola de saída (por omissão, uma nova).
+        """
+        super().__init__(level)
+        self.console = console if console is not None else Console()
+
+    def write(self, record: dict):
+        kind = record["event"]
+        if kind == "sent":
+            text = "[{}sec] Pacote Enviado: \t id #{} \t\t Nó {} -> Nó {} \t\t #slots usados = {} \t duracao = {}sec \t caminho = {}".format(
+                round(record["time"], 2), record["id"], record["src"], record["dst"], record["nslots"], round(record["duration"], 2), record["path"])
+        elif kind == "lost":
+            text = "[{}sec] Pacote Perdido: \t id #{} \t\t Nó {} -> Nó {} \t\t #slots solicitados = {} \t duracao = {}sec\n\tRECURSOS NÃO DISPONÍVEIS!".format(
+                round(record["time"], 2), record["id"], record["src"], record["dst"], record["nslots"], round(record["duration"], 2))
+        elif kind == "expired":
+            text = "[{}sec] TEMPO EXPIRADO \t id #{} \t\t Nó {} -> Nó {} \t\t #slots libertados = {}".format(
+                round(record["time"], 2), record["id"], record["src"], record["dst"], record["nslots"])
+        else:
+            text = json.dumps(record)
+        self.console.print(text, style=self.STYLES.get(kind), markup=False, highlight=False, soft_wrap=True)
+
+
+class FanoutSink(EventSink):
+    """Reencaminha cada evento para vários destinos."""
+
+    def __init__(self, *sinks: EventSink):
+        super().__init__(min((sink.level for sink in sinks), default=OFF))
+        self.sinks = sinks
+
+    def emit(self, level: int, kind: str, **fields):
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.emit(level, kind, **dict(fields))
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
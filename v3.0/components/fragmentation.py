@@ -0,0 +1,210 @@
+"""
+Métricas de fragmentação espectral mantidas incrementalmente.
+Em cada alocação ou libertação só mudam o bloco livre partido ou os blocos vizinhos juntados, localizados na máscara da
+fibra com operações de bits. O maior bloco vem de uma máscara dos comprimentos presentes (bit l a 1 se houver algum
+bloco livre de comprimento l), lido com bit_length(). Por isso as métricas de cada fibra e da rede são atualizadas
+com um número constante de operações sobre inteiros (de S bits, no pior caso, para o maior bloco) e podem ser
+amostradas em todos os eventos, sem percorrer os slots nem os histogramas.
+"""
+
+import math
+
+
+class FragmentationTracker:
+    """
+    Métricas de fragmentação de todas as fibras de uma SpectrumGrid.
+    Por fibra mantém o número de slots livres, o número de blocos livres, o maior bloco livre (por histograma de
+    comprimentos e máscara dos comprimentos presentes) e a soma de l·ln(l) dos blocos, de onde se obtêm:
+        - fragmentação externa: 1 - maior bloco / slots livres;
+        - entropia: -Σ (l/S)·ln(l/S) sobre os blocos livres de comprimento l, com S slots por fibra.
+    """
+
+    METRICS = ("external_fragmentation", "entropy", "largest_block", "free_blocks")
+
+    def __init__(self, num_fibers: int, num_slots: int):
+        """
+        Inicializa as métricas com todos os slots livres.
+
+        Args:
+            num_fibers (int): Número de fibras.
+            num_slots (int): Número de slots por fibra.
+        """
+        self.num_fibers = num_fibers
+        self.num_slots = num_slots
+        self.log_slots = math.log(num_slots) if num_slots else 0.0
+        self.xlogx = [0.0] + [l * math.log(l) for l in range(1, num_slots + 1)]
+        self.reset()
+        self.clear_samples()
+
+    def reset(self):
+        """Repõe as métricas de uma grelha totalmente livre."""
+        S, F = self.num_slots, self.num_fibers
+        self.free = [S] * F
+        self.blocks = [1 if S else 0] * F
+        self.sum_xlogx = [self.xlogx[S]] * F
+        self.histograms = [[0] * (S + 1) for _ in range(F)]
+        for hist in self.histograms:
+            hist[S] += 1 if S else 0
+        self.present = [1 << S if S else 0] * F  # Bit l a 1 se a fibra tiver algum bloco livre de comprimento l
+        self.largest = [S] * F
+        # Totais da rede
+        self.total_free = S * F
+        self.total_blocks = sum(self.blocks)
+        self.total_xlogx = self.xlogx[S] * F
+        self.total_external = 0.0
+        self.network_histogram = [0] * (S + 1)
+        self.network_histogram[S] = F if S else 0
+        self.network_present = 1 << S if S and F else 0
+        self.network_largest = S if F else 0
+
+    def clear_samples(self):
+        """Descarta as amostras acumuladas por observe()."""
+        self.samples = 0
+        self.sample_sums = dict.fromkeys(self.METRICS, 0.0)
+        self.blocked_samples = 0
+        self.blocked_sums = dict.fromkeys(self.METRICS, 0.0)
+
+    def _external(self, i: int) -> float:
+        free = self.free[i]
+        return 1.0 - self.largest[i] / free if free else 0.0
+
+    def _add(self, i: int, length: int):
+        self.blocks[i] += 1
+        self.sum_xlogx[i] += self.xlogx[length]
+        hist = self.histograms[i]
+        hist[length] += 1
+        if hist[length] == 1:
+            self.present[i] |= 1 << length
+            if length > self.largest[i]:
+                self.largest[i] = length
+        self.total_blocks += 1
+        self.total_xlogx += self.xlogx[length]
+        hist = self.network_histogram
+        hist[length] += 1
+        if hist[length] == 1:
+            self.network_present |= 1 << length
+            if length > self.network_largest:
+                self.network_largest = length
+
+    def _remove(self, i: int, length: int):
+        self.blocks[i] -= 1
+        self.sum_xlogx[i] -= self.xlogx[length]
+        hist = self.histograms[i]
+        hist[length] -= 1
+        if not hist[length]:
+            present = self.present[i] = self.present[i] & ~(1 << length)
+            self.largest[i] = max(present.bit_length() - 1, 0)
+        self.total_blocks -= 1
+        self.total_xlogx -= self.xlogx[length]
+        hist = self.network_histogram
+        hist[length] -= 1
+        if not hist[length]:
+            present = self.network_present = self.network_present & ~(1 << length)
+            self.network_largest = max(present.bit_length() - 1, 0)
+
+    def allocate(self, i: int, mask: int, start: int, n: int):
+        """
+        Atualiza a fibra i antes de ocupar [start, start + n), que tem de estar livre.
+
+        Args:
+            i (int): Índice da fibra.
+            mask (int): Máscara de slots livres da fibra antes da alocação.
+            start (int): Primeiro slot do bloco.
+            n (int): Número de slots.
+        """
+        external = self._external(i)
+        free = ~mask
+        low = (free & ((1 << start) - 1)).bit_length()
+        above = free >> start
+        high = start + (above & -above).bit_length() - 1
+        self._remove(i, high - low)
+        if start > low:
+            self._add(i, start - low)
+        if high > start + n:
+            self._add(i, high - start - n)
+        self.free[i] -= n
+        self.total_free -= n
+        self.total_external += self._external(i) - external
+
+    def release(self, i: int, mask: int, start: int, n: int):
+        """
+        Atualiza a fibra i antes de libertar [start, start + n), que tem de estar ocupado.
+
+        Args:
+            i (int): Índice da fibra.
+            mask (int): Máscara de slots livres da fibra antes da libertação.
+            start (int): Primeiro slot do bloco.
+            n (int): Número de slots.
+        """
+        external = self._external(i)
+        low = (~mask & ((1 << start) - 1)).bit_length()
+        end = start + n
+        above = ~mask >> end
+        high = end + (above & -above).bit_length() - 1
+        if start > low:
+            self._remove(i, start - low)
+        if high > end:
+            self._remove(i, high - end)
+        self._add(i, high - low)
+        self.free[i] += n
+        self.total_free += n
+        self.total_external += self._external(i) - external
+
+    def fiber(self, i: int) -> dict:
+        """
+        Métricas atuais de uma fibra.
+
+        Returns:
+            dict: Fragmentação externa, entropia, maior bloco livre, número de blocos livres e slots livres.
+        """
+        S = self.num_slots
+        return {
+            "external_fragmentation": self._external(i),
+            "entropy": (self.log_slots * self.free[i] - self.sum_xlogx[i]) / S if S else 0.0,
+            "largest_block": self.largest[i],
+            "free_blocks": self.blocks[i],
+            "free_slots": self.free[i],
+        }
+
+    def network(self) -> dict:
+        """
+        Métricas atuais da rede: médias por fibra da fragmentação externa, da entropia e do número de blocos,
+        e o maior bloco livre de todas as fibras.
+        """
+        F, S = self.num_fibers or 1, self.num_slots or 1
+        return {
+            "external_fragmentation": self.total_external / F,
+            "entropy": (self.log_slots * self.total_free - self.total_xlogx) / (S * F),
+            "largest_block": self.network_largest,
+            "free_blocks": self.total_blocks / F,
+            "free_slots": self.total_free,
+        }
+
+    def observe(self, blocked: bool = False):
+        """
+        Acumula uma amostra das métricas da rede (em O(1)), separando as amostras tiradas em bloqueios.
+
+        Args:
+            blocked (bool): Se a amostra corresponde a um pedido bloqueado.
+        """
+        metrics = self.network()
+        sums = self.sample_sums
+        for key in self.METRICS:
+            sums[key] += metrics[key]
+        self.samples += 1
+        if blocked:
+            sums = self.blocked_sums
+            for key in self.METRICS:
+                sums[key] += metrics[key]
+            self.blocked_samples += 1
+
+    def summary(self) -> dict:
+        """
+        Médias das amostras acumuladas por observe().
+
+        Returns:
+            dict: "mean" (todas as chegadas) e "at_blocking" (apenas os pedidos bloqueados).
+        """
+        def mean(sums, count):
+            return {key: value / count if count else 0.0 for key, value in sums.items()}
+        return {"mean": mean(self.sample_sums, self.samples), "at_blocking": mean(self.blocked_sums, self.blocked_samples)}
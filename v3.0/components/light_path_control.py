@@ -1,35 +1,86 @@
+import heapq
 import numpy as np
-import networkx as nx
 from rich.console import Console
-from rich.table import Table
-from rich.layout import Layout
+from components.spectrum import SpectrumGrid
+from components.spectrum_search import fit_slots, block_slots
+from components.routing import RoutingTable
+from components.rsa import make_rsa
+from components.modulation import ModulationTable, SLOT_WIDTH
+from components.defragmentation import Defragmenter
+from components.topology import as_topology
+from components.events import INFO, WARNING, ConsoleSink, NullSink
+from components.dashboard import ResourceDashboard
 
 console = Console()
 
 class Control(object):
-    def __init__(self, env, network, debug=True, tab=True, allocation_algorithm="first_fit"):
+    def __init__(self, env, network, debug=True, tab=True, allocation_algorithm="first_fit", num_slots=10, k_paths=3, num_txrx=10, verbose=True, record_lost=True, events=None, block_index=False, routing="shortest", rng=None, bitrates=None, slot_width=SLOT_WIDTH, guard_band=0, fragmentation=False, defragmentation=None, defrag_period=100.0, defrag_max_moves=None, precompute_routes=True):
         """
         Inicializa o controlador de lightpaths.
         
         Args:
             env (simpy.Environment): O ambiente de simulação.
-            network (networkx.Graph): O grafo da rede.
+            network (networkx.Graph ou Topology): O grafo da rede, ou a topologia já compilada (ver components.topology).
+                Os recursos dos nós são indexados pelos índices densos da topologia.
             debug (bool): Habilita ou desabilita mensagens de depuração.
-            tab (bool): Habilita ou desabilita a tabulação das tabelas.
-            allocation_algorithm (str): Algoritmo de alocação de slots ("first_fit" ou "best_gap").
+            tab (bool): Se verdadeiro, cria um painel de recursos (self.dashboard) desenhado a taxa fixa numa thread própria.
+            allocation_algorithm (str): Estratégia de atribuição de espectro registada em rsa.SPECTRUM_STRATEGIES
+                ("first_fit", "best_gap", "last_fit", "exact_fit" ou "random_fit").
+            num_slots (int): Número de slots espectrais por fibra.
+            k_paths (int): Número de caminhos candidatos pré-calculados por par de nós.
+            num_txrx (int): Número de transmissores/receptores por nó.
+            verbose (bool): Se verdadeiro e events não for indicado, apresenta cada lightpath enviado, perdido ou expirado na consola.
+            record_lost (bool): Se verdadeiro, guarda os pedidos perdidos em pkt_lost; caso contrário, apenas os conta.
+            events (EventSink): Destino dos eventos do controlador (por omissão, ConsoleSink se verbose, senão NullSink).
+            block_index (bool): Se verdadeiro, mantém um índice de blocos livres por fibra, atualizado em cada alocação
+                e libertação, para procuras logarítmicas nas fibras com muitos slots.
+            routing (str): Estratégia de encaminhamento registada em rsa.ROUTING_STRATEGIES ("shortest", "k_shortest",
+                "least_loaded" ou "largest_block").
+            rng (numpy.random.Generator): Gerador usado pelas estratégias aleatórias.
+            bitrates (list): Classes de débito (Gb/s) dos pedidos com bitrate; se indicadas, o número de slots destes
+                pedidos vem da ModulationTable (requer o atributo "length" nas arestas).
+            slot_width (float): Largura de um slot (GHz) usada na conversão de débito em slots.
+            guard_band (int): Slots de banda de guarda reservados acima de cada lightpath, de forma que lightpaths
+                vizinhos fiquem separados por pelo menos guard_band slots livres (a guarda não é reservada para lá
+                do último slot do espectro).
+            fragmentation (bool): Se verdadeiro, mantém as métricas de fragmentação (self.slots.fragmentation)
+                e amostra as da rede em cada chegada.
+            defragmentation (str): Modo do motor de desfragmentação ("blocking" ou "periodic"; None desativa).
+            defrag_period (float): Intervalo entre desfragmentações no modo "periodic".
+            defrag_max_moves (int): Número máximo de lightpaths movidos por desfragmentação (None para não limitar).
+            precompute_routes (bool): Se verdadeiro, calcula os caminhos de todos os pares na construção; caso
+                contrário, cada par é calculado no primeiro pedido (recomendado em topologias grandes, onde há
+                O(N²) pares e só uma parte recebe pedidos).
         """
         self.env = env
-        self.network = network
+        self.topology = as_topology(network)
+        self.network = network = self.topology.network
+        self.node_index = self.topology.node_index
         self.debug = debug
         self.tab = tab
+        self.verbose = verbose
+        self.events = events if events is not None else (ConsoleSink(console=console) if verbose else NullSink())
+        self.record_lost = record_lost
+        self.num_txrx = num_txrx
         self.allocation_algorithm = allocation_algorithm
-        self.pkt_sent = []
+        self.pkt_sent = {}
         self.pkt_lost = []
-        self.txrx = np.ndarray([network.number_of_nodes(), 2])
-        self.slots = np.ndarray([network.number_of_edges(), 10]) 
+        self.departures = []
+        self.accepted = 0
+        self.blocked = 0
+        self.txrx = np.ndarray([self.topology.num_nodes, 2])
+        self.rsa = make_rsa(routing, allocation_algorithm, rng)
+        self.fragmentation = fragmentation
+        # As estratégias que ordenam pelo maior bloco livre usam as métricas do tracker, mesmo sem amostragem
+        self.slots = SpectrumGrid(self.topology.num_edges, num_slots, indexed=block_index,
+                                  fragmentation=fragmentation or self.rsa.routing.uses_largest_blocks, guard_band=guard_band)
+        self.routing = RoutingTable(network, k=k_paths, precompute=precompute_routes, topology=self.topology)
+        self.guard_band = guard_band
+        self.modulation = ModulationTable(self.routing, bitrates, slot_width, guard_band=guard_band, lengths=self.topology.lengths) if bitrates else None
+        self.defragmenter = Defragmenter(self, defragmentation, defrag_period, defrag_max_moves) if defragmentation else None
+        self.dashboard = ResourceDashboard(self, console=console) if tab else None
 
-        self.txrx.fill(10)  
-        self.slots.fill(True)
+        self.txrx.fill(num_txrx)
 
     def put(self, pkt):
         """
@@ -42,47 +93,63 @@ class Control(object):
             if self.debug:
                 now = self.env.now
                 self.remove(now)
+                if self.defragmenter is not None:
+                    self.defragmenter.on_arrival(now)
 
-                disp, slot_used, path = self.allocate(pkt.src, pkt.dst, pkt.nslots)
+                disp, slot_used, path = self.allocate(pkt.src, pkt.dst, pkt.nslots, pkt.bitrate)
+                if not disp and self.defragmenter is not None and self.has_txrx(pkt.src, pkt.dst):
+                    num_slots, widths = self.demand(pkt.src, pkt.dst, pkt.nslots, pkt.bitrate)
+                    if self.defragmenter.on_blocking(pkt.src, pkt.dst, num_slots, widths):
+                        disp, slot_used, path = self.allocate(pkt.src, pkt.dst, pkt.nslots, pkt.bitrate)
 
                 if disp:
                     pkt.slot_used = slot_used
-                    self.pkt_sent.append(pkt)
-                    print('\033[97m' + "[{}sec] Pacote Enviado: \t id #{} \t\t Nó {} -> Nó {} \t\t #slots usados = {} \t duracao = {}sec \t caminho = {}".format(round(pkt.time, 2), pkt.id, pkt.src, pkt.dst, pkt.nslots, round(pkt.duration, 2), path) + '\033[0m')
+                    pkt.nslots = slot_used[2] - self.guard_band
+                    pkt.path = path
+                    self.accepted += 1
+                    self.pkt_sent[self.accepted] = pkt
+                    heapq.heappush(self.departures, (pkt.fim, self.accepted))
+                    if self.events.level <= INFO:
+                        self.events.emit(INFO, "sent", time=pkt.time, id=pkt.id, src=pkt.src, dst=pkt.dst, nslots=pkt.nslots, duration=pkt.duration, path=list(path))
                 else:
-                    print('\033[91m' + "[{}sec] Pacote Perdido: \t id #{} \t\t Nó {} -> Nó {} \t\t #slots solicitados = {} \t duracao = {}sec".format(round(pkt.time, 2), pkt.id, pkt.src, pkt.dst, pkt.nslots, round(pkt.duration, 2)) + '\033[91m')
-                    print('\033[91m' + '\tRECURSOS NÃO DISPONÍVEIS!' + '\033[91m')
-                    self.pkt_lost.append(pkt)
+                    if self.events.level <= WARNING:
+                        self.events.emit(WARNING, "lost", time=pkt.time, id=pkt.id, src=pkt.src, dst=pkt.dst, nslots=pkt.nslots, duration=pkt.duration)
+                    self.blocked += 1
+                    if self.record_lost:
+                        self.pkt_lost.append(pkt)
+
+                # Amostra depois da tentativa: nos bloqueios, é exatamente o estado que impediu a alocação
+                if self.fragmentation:
+                    self.slots.fragmentation.observe(blocked=not disp)
         else:
             self.remove(None)
-        
-        if self.tab:
-            self.display_resources(self.txrx, self.slots)
 
     def remove(self, now):
         """
         Remove pacotes cujo tempo de duração expirou.
+        As partidas estão num heap ordenado pelo tempo de fim, pelo que cada lightpath é libertado em O(log n).
         
         Args:
             now (float): O tempo atual da simulação.
         """
-        pkt_sent = self.pkt_sent if now is not None else sorted(self.pkt_sent, key=lambda x: x.time + x.duration)
-
         if now is not None:
-            for p in pkt_sent:
-                if (p.time + p.duration) < now:
-                    self.pkt_sent.remove(p)
-                    self.txrx[p.src-1][0] += 1
-                    self.txrx[p.dst-1][1] += 1
-                    for slo in p.slot_used:
-                        self.slots[slo[0]][slo[1]] = True
-                    print('\033[93m' + "[{}sec] TEMPO EXPIRADO \t id #{} \t\t Nó {} -> Nó {} \t\t #slots libertados = {}".format(round(p.time + p.duration, 2), p.id, p.src, p.dst, p.nslots) + '\033[0m')
+            departures = self.departures
+            log = self.events.level <= INFO
+            while departures and departures[0][0] < now:
+                _, seq = heapq.heappop(departures)
+                p = self.pkt_sent.pop(seq)
+                self.txrx[self.node_index[p.src]][0] += 1
+                self.txrx[self.node_index[p.dst]][1] += 1
+                self.slots.release(*p.slot_used)
+                if log:
+                    self.events.emit(INFO, "expired", time=p.fim, id=p.id, src=p.src, dst=p.dst, nslots=p.nslots)
         else:
             self.pkt_sent.clear()
-            self.txrx.fill(10)
-            self.slots.fill(True)
+            self.departures.clear()
+            self.txrx.fill(self.num_txrx)
+            self.slots.reset()
 
-    def allocate(self, src, dst, num_slots):
+    def allocate(self, src, dst, num_slots, bitrate=0):
         """
         Aloca recursos para um pacote.
         
@@ -90,67 +157,84 @@ class Control(object):
             src (int): O nó de origem.
             dst (int): O nó de destino.
             num_slots (int): O número de slots necessários.
+            bitrate (int): Débito pedido (Gb/s); se for diferente de 0 e houver tabela de modulação, o número de slots
+                de cada caminho candidato vem da tabela em vez de num_slots.
         
         Returns:
             bool: Indica se a alocação foi bem-sucedida.
             list: Lista de slots usados.
             list: Caminho utilizado.
         """
-        edges = list(self.network.edges())
-        paths = nx.shortest_path(self.network, src, dst)
-        index = self.get_edge_indices(paths, edges)
-        channels = self.get_available_channels(paths, index)
+        if not self.has_txrx(src, dst):
+            return False, [], []
 
-        if num_slots > 1:
-            if self.allocation_algorithm == "best_gap":
-                channels = self.checkSlotsBestGap(num_slots, channels)
-            else:
-                channels = self.checkSlotsFirstFit(num_slots, channels)
+        num_slots, widths = self.demand(src, dst, num_slots, bitrate)
+        assignment = self.rsa.assign(self.routing, self.slots, src, dst, num_slots, widths)
+        if assignment is None:
+            return False, [], []
 
-        if not channels:
-            return False, [], paths
-
-        disp, slot_used = self.allocate_slots(src, dst, num_slots, index, channels)
+        paths, index, start = assignment
+        if widths is not None:
+            num_slots = widths[index]
+        disp, slot_used = self.allocate_slots(src, dst, num_slots, index, start)
         return disp, slot_used, paths
     
-    def get_edge_indices(self, paths, edges):
+    def has_txrx(self, src, dst):
+        """Indica se a origem tem um transmissor e o destino um receptor livres."""
+        return self.txrx[self.node_index[src]][0] > 0 and self.txrx[self.node_index[dst]][1] > 0
+
+    def demand(self, src, dst, num_slots, bitrate=0):
+        """
+        Largura a procurar no espectro para um pedido.
+        Cada lightpath ocupa os seus slots seguidos da banda de guarda, procurados como um único bloco contíguo.
+
+        Returns:
+            int: Número de slots, incluindo a banda de guarda.
+            dict: Número de slots por caminho candidato (modulação adaptativa), ou None.
+        """
+        widths = self.modulation.widths(src, dst, bitrate) if bitrate and self.modulation is not None else None
+        return num_slots + self.guard_band, widths
+
+    def get_edge_indices(self, paths, edges=None):
         """
         Obtém os índices das arestas no caminho.
         
         Args:
             paths (list): Lista de nós no caminho.
-            edges (list): Lista de arestas na rede.
+            edges (list): Ignorado; os índices vêm da tabela de encaminhamento (mantido por compatibilidade).
         
         Returns:
             list: Lista de índices das arestas.
         """
-        index = []
-        for i in range(len(paths) - 1):
-            if (paths[i], paths[i + 1]) in edges:
-                index.append(edges.index((paths[i], paths[i + 1])))
-            else:
-                index.append(edges.index((paths[i + 1], paths[i])))
-        return index
+        return self.routing.edge_indices(paths)
     
+    def get_available_mask(self, paths, index):
+        """
+        Obtém a máscara de bits dos slots livres em todas as fibras do caminho (continuidade espectral).
+        
+        Args:
+            paths (list): Lista de nós no caminho.
+            index (list): Lista de índices das arestas.
+        
+        Returns:
+            int: Máscara dos slots disponíveis (bit a 1 = slot livre).
+        """
+        return self.slots.common(index)
+
     def get_available_channels(self, paths, index):
         """
-        Obtém os canais disponíveis para alocação.
+        Obtém os blocos contíguos de slots livres ao longo do caminho.
         
         Args:
             paths (list): Lista de nós no caminho.
             index (list): Lista de índices das arestas.
         
         Returns:
-            list: Lista de canais disponíveis.
+            list: Blocos livres como tuplos (primeiro slot, comprimento).
         """
-        if len(paths) > 2:
-            trans_slot = self.slots.T
-            channels = [k for k in range(trans_slot.shape[0]) if np.all(trans_slot[k])]
-        else:
-            channels = [i for i in range(10) if self.slots[index][0][i]]
-        return channels
+        return self.slots.free_blocks(self.get_available_mask(paths, index))
 
-    def allocate_slots(self, src, dst, num_slots, index, channels):
+    def allocate_slots(self, src, dst, num_slots, index, start):
         """
         Aloca slots para um pacote.
         
@@ -159,68 +243,29 @@ class Control(object):
             dst (int): O nó de destino.
             num_slots (int): O número de slots necessários.
             index (list): Lista de índices das arestas.
-            channels (list): Lista de canais disponíveis.
+            start (int): Primeiro slot do bloco contíguo a ocupar.
         
         Returns:
             bool: Indica se a alocação foi bem-sucedida.
-            list: Lista de slots usados.
+            tuple: Slots usados no formato (índices das arestas, primeiro slot, número de slots).
         """
-        slot_used = []
-        disp = False
+        if not self.has_txrx(src, dst):
+            return False, []
 
-        for i in range(len(index)):
-            for k in range(num_slots):
-                for j in channels:
-                    if self.slots[index[i]][j] and self.txrx[src-1][0] > 0 and self.txrx[dst-1][1] > 0:
-                        self.slots[index[i]][j] = False
-                        slot_used.append([index[i], j])
-                        disp = True
-                        break
+        self.slots.allocate(index, start, num_slots)
+        self.txrx[self.node_index[src]][0] -= 1
+        self.txrx[self.node_index[dst]][1] -= 1
 
-        if disp and self.txrx[src-1][0] > 0 and self.txrx[dst-1][1] > 0:
-            self.txrx[src-1][0] -= 1
-            self.txrx[dst-1][1] -= 1
-        else:
-            disp = False
+        return True, (index, start, num_slots)
 
-        return disp, slot_used
-
-    def display_resources(self, txrx, slots):
+    def display_resources(self):
         """
-        Exibe as tabelas de tx/rx e slots.
-        
-        Args:
-            txrx (ndarray): Matriz de tx/rx.
-            slots (ndarray): Matriz de slots.
+        Exibe uma única vez o resumo atual dos recursos (tx/rx e ocupação/fragmentação por fibra).
+        Durante a simulação, a vista é atualizada pelo painel (self.dashboard) e não a cada pedido.
         """
         if self.debug:
-            layout = Layout()
-
-            # Tabela de tx/rx
-            table_txrx = Table(title="Recursos dos Nós (Tx/Rx)", show_header=True, header_style="bold magenta")
-            table_txrx.add_column("Nó", justify="right")
-            table_txrx.add_column("Tx", justify="right")
-            table_txrx.add_column("Rx", justify="right")
-
-            for i, (tx, rx) in enumerate(txrx, start=1):
-                table_txrx.add_row(str(i), str(int(tx)), str(int(rx)))
-
-            # Tabela de slots
-            table_slots = Table(title="Recursos das Fibras (Slots)", show_header=True, header_style="bold magenta")
-            table_slots.add_column("Fibra", justify="right")
-            for i in range(slots.shape[1]):
-                table_slots.add_column(f"Slot {i+1}", justify="right")
-
-            for i, row in enumerate(slots, start=1):
-                table_slots.add_row(str(i), *[str(int(slot)) for slot in row])
-
-            # Adiciona as tabelas ao layout
-            layout.split_row(
-                Layout(table_txrx, name="left"),
-                Layout(table_slots, name="right")
-            )
-
-            console.print(layout)
+            dashboard = self.dashboard if self.dashboard is not None else ResourceDashboard(self, console=console)
+            console.print(dashboard.render())
 
     def checkSlotsFirstFit(self, n, l):
         """
@@ -233,19 +278,12 @@ class Control(object):
         Returns:
             list: Lista de slots alocados.
         """
-        l = sorted(l)
-        for i in range(len(l)):
-            sublist = l[i:n + i]
-            if len(sublist) < n:
-                return []
-            consecutive = sorted(sublist) == list(range(min(sublist), max(sublist) + 1))
-            if consecutive:
-                return sublist
-        return []
+        return block_slots(fit_slots(l, n, "first_fit"), n)
 
     def checkSlotsBestGap(self, n_slot, lista):
         """
-        Verifica a melhor combinação de slots disponíveis.
+        Verifica a melhor combinação de slots disponíveis: os n_slot primeiros slots do menor bloco livre
+        com pelo menos n_slot slots.
         
         Args:
             n_slot (int): Número de slots necessários.
@@ -254,29 +292,4 @@ class Control(object):
         Returns:
             list: Lista de slots alocados.
         """
-        index = []
-        sublist = []
-        for i in range(len(lista)):
-            try:
-                if lista[i] + 1 == lista[i + 1]:
-                    index.append(lista[i])
-                    if i + 1 == len(lista) - 1:
-                        index.append(lista[i + 1])
-                else:
-                    if lista[i - 1] == lista[i] - 1:
-                        index.append(lista[i])
-                    if len(index) >= n_slot:
-                        sublist.append(index)
-                    index = []
-            except:
-                if len(index) >= n_slot:
-                    sublist.append(index)
-
-        if sublist:
-            while True:
-                for lista2 in sublist:
-                    if len(lista2) == n_slot:
-                        return lista2
-                n_slot += 1
-        else:
-            return []
\ No newline at end of file
+        return block_slots(fit_slots(lista, n_slot, "best_fit"), n_slot)
@@ -1,4 +1,4 @@
-import random
+import numpy as np
 import simpy
 from components.light_path_request import LightPathRequest
 from components.packet_sink import PacketSink
@@ -10,7 +10,7 @@ class LightPathGenerator:
     Estabelece a variável membro "out" à entidade que receberá o pacote.
     """
 
-    def __init__(self, env: simpy.Environment, id: int, avegLightpathDuration: float, load: float, numberNodes: int = 5, num_max_pet: int = 10, num_max_slots: int = 3, node_range: Optional[range] = None):
+    def __init__(self, env: simpy.Environment, id: int, avegLightpathDuration: float, load: float, numberNodes: int = 5, num_max_pet: int = 10, num_max_slots: int = 3, node_range: Optional[range] = None, rng: Optional[np.random.Generator] = None, bitrates: Optional[list] = None):
         """
         Inicializa o gerador de lightpaths.
 
@@ -23,6 +23,9 @@ class LightPathGenerator:
             num_max_pet: Número máximo de pedidos.
             num_max_slots: Número máximo de slots.
             node_range: Intervalo de nós permitidos.
+            rng: Gerador de números aleatórios próprio desta fonte (por omissão, um gerador com entropia nova).
+            bitrates: Classes de débito (Gb/s); se indicadas, cada pedido tem um débito escolhido ao acaso e o número
+                de slots é decidido pelo controlador a partir do comprimento do caminho.
         """
         self.env = env
         self.id = id
@@ -35,6 +38,8 @@ class LightPathGenerator:
         self.num_max_slots = num_max_slots
         self.node_range = node_range if node_range else range(numberNodes)
         self.flow_id = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.bitrates = bitrates
         self.action = env.process(self.run())
 
     def run(self):
@@ -43,13 +48,14 @@ class LightPathGenerator:
         """
         global PKT_SENTS
         PKT_SENTS = 0
+        rng = self.rng
 
         while PKT_SENTS < self.num_max_pet:
             # Espera pela próxima transmissão
-            duration = random.expovariate(1.0 / self.avegLightpathDuration)
+            duration = float(rng.exponential(self.avegLightpathDuration))
 
             # O tempo entre pedidos feitos por cada fonte é calculado de forma aleatória com uma variável de tipo exponencial com média
-            yield self.env.timeout(random.expovariate(1.0 / self.timeBetweenReq))
+            yield self.env.timeout(float(rng.exponential(self.timeBetweenReq)))
 
             # O nodo de destino do pedido do lightpath é gerado aleatoriamente entre os restantes destinos
             destino = list(self.node_range)
@@ -59,19 +65,22 @@ class LightPathGenerator:
                 destino.remove(self.id)
 
             # Escolhe aleatoriamente um destino da lista atualizada de destinos possíveis
-            dst = random.choice(destino)
+            dst = destino[rng.integers(len(destino))]
 
             # Gera um número aleatório de slots para o pedido, dentro do limite máximo definido
-            nslots = random.randint(1, self.num_max_slots)
+            nslots = int(rng.integers(1, self.num_max_slots + 1))
 
             # Obtém o tempo atual do ambiente de simulação para marcar o início do pedido
             now = self.env.now
 
             # Tamanho do pacote entre 1 e 1000 unidades
-            packet_size = random.randint(1, 1000)  
+            packet_size = int(rng.integers(1, 1001))
+
+            # Débito do pedido, se o tráfego for expresso em Gb/s
+            bitrate = int(self.bitrates[rng.integers(len(self.bitrates))]) if self.bitrates else 0
 
             # Cria um novo LightPathRequest
-            p = LightPathRequest(PKT_SENTS, self.id, dst, now, duration, nslots, size=packet_size)
+            p = LightPathRequest(PKT_SENTS, self.id, dst, now, duration, nslots, size=packet_size, bitrate=bitrate)
 
             # Estabelece a variável membro "out" à entidade que receberá o pacote
             if self.out:
@@ -4,7 +4,10 @@ class LightPathRequest:
     Envolve os detalhes de uma solicitação para estabelecer um caminho óptico entre dois nós na rede.
     """
 
-    def __init__(self, id: int, src: int, dst: int, time: float, duration: float = 0, nslots: int = 0, flow_id: int = 0, size: int = 100):
+    # Evita um dicionário por instância: em traços longos existem muitos pedidos ativos em simultâneo
+    __slots__ = ("id", "src", "dst", "time", "duration", "nslots", "fim", "flow_id", "size", "bitrate", "slot_used", "path")
+
+    def __init__(self, id: int, src: int, dst: int, time: float, duration: float = 0, nslots: int = 0, flow_id: int = 0, size: int = 100, bitrate: int = 0):
         """
         Inicializa a instância de LightPathRequest com os parâmetros fornecidos.
 
@@ -17,6 +20,8 @@ class LightPathRequest:
             nslots (int): Número de slots espectrais necessários para a solicitação (o padrão é 0)
             flow_id (int): Identificador do fluxo ao qual a solicitação pertence (o padrão é 0)
             size (int): Tamanho do pacote associado à solicitação (o padrão é 100)
+            bitrate (int): Débito pedido em Gb/s; se for diferente de 0, o número de slots é decidido pelo controlador
+                a partir do comprimento do caminho (o padrão é 0, que usa nslots)
         """
         self.id = id
         self.src = src
@@ -27,6 +32,7 @@ class LightPathRequest:
         self.fim = self.time + self.duration  # Calcula o tempo de término da solicitação
         self.flow_id = flow_id
         self.size = size
+        self.bitrate = bitrate
 
     def __repr__(self) -> str:
         """
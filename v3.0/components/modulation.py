@@ -0,0 +1,124 @@
+"""
+Modulação adaptativa à distância.
+Converte o débito pedido (Gb/s) e o comprimento do caminho (km) no número de slots, escolhendo o formato de modulação
+mais eficiente cujo alcance cobre o caminho. As conversões são pré-calculadas por (origem, destino, caminho, débito),
+pelo que a consulta durante a simulação é uma leitura de dicionário.
+"""
+
+import math
+
+# Formatos de modulação: (nome, bits por símbolo, alcance máximo em km), do mais eficiente para o mais robusto
+MODULATION_FORMATS = [
+    ("64QAM", 6, 300),
+    ("32QAM", 5, 600),
+    ("16QAM", 4, 1200),
+    ("8QAM", 3, 2400),
+    ("QPSK", 2, 4800),
+    ("BPSK", 1, 9600),
+]
+
+SLOT_WIDTH = 12.5  # Largura de um slot (GHz); cada slot transporta SLOT_WIDTH Gb/s por bit por símbolo
+
+BITRATES = [10, 40, 100, 400]  # Classes de débito (Gb/s) usadas por omissão
+
+
+def select_modulation(length: float, formats=MODULATION_FORMATS):
+    """
+    Escolhe o formato mais eficiente com alcance suficiente.
+
+    Args:
+        length (float): Comprimento do caminho (km).
+        formats (list): Tabela de formatos (nome, bits por símbolo, alcance).
+
+    Returns:
+        tuple: O formato escolhido, ou None se o caminho exceder o alcance de todos.
+    """
+    for fmt in formats:
+        if length <= fmt[2]:
+            return fmt
+    return None
+
+
+def slots_for(bitrate: float, length: float, slot_width: float = SLOT_WIDTH, formats=MODULATION_FORMATS) -> int:
+    """
+    Número de slots necessários para transmitir um débito num caminho.
+
+    Args:
+        bitrate (float): Débito pedido (Gb/s).
+        length (float): Comprimento do caminho (km).
+        slot_width (float): Largura de um slot (GHz).
+        formats (list): Tabela de formatos de modulação.
+
+    Returns:
+        int: Número de slots, ou -1 se nenhum formato alcançar o destino.
+    """
+    fmt = select_modulation(length, formats)
+    if fmt is None:
+        return -1
+    return math.ceil(bitrate / (slot_width * fmt[1]))
+
+
+class ModulationTable:
+    """
+    Número de slots por (origem, destino, caminho, classe de débito), calculado a partir dos caminhos da RoutingTable
+    e do atributo "length" das arestas.
+    """
+
+    def __init__(self, routing, bitrates=BITRATES, slot_width: float = SLOT_WIDTH, formats=MODULATION_FORMATS, length: str = "length", guard_band: int = 0, lengths=None):
+        """
+        Inicializa a tabela, pré-calculando os pares já presentes na tabela de encaminhamento.
+
+        Args:
+            routing (RoutingTable): Tabela de encaminhamento com os caminhos candidatos.
+            bitrates (list): Classes de débito (Gb/s).
+            slot_width (float): Largura de um slot (GHz).
+            formats (list): Tabela de formatos de modulação.
+            length (str): Atributo das arestas com o comprimento (km).
+            guard_band (int): Slots de banda de guarda acrescentados a cada caminho alcançável.
+            lengths (list): Comprimento (km) de cada fibra pelo seu índice, normalmente Topology.lengths (NaN quando
+                desconhecido); por omissão é lido do atributo length das arestas.
+        """
+        self.routing = routing
+        self.bitrates = list(bitrates)
+        self.slot_width = slot_width
+        self.formats = formats
+        self.length = length
+        self.guard_band = guard_band
+        if lengths is None:
+            lengths = [data.get(length, math.nan) for _, _, data in routing.network.edges(data=True)]
+        self.lengths = [float(l) for l in lengths]
+        for (u, v), l in zip(routing.network.edges(), self.lengths):
+            if math.isnan(l):
+                raise ValueError(f"A aresta {u} -> {v} não tem o atributo '{length}' necessário à modulação adaptativa.")
+        self._widths = {}
+        for src, dst in list(routing._routes):
+            for bitrate in self.bitrates:
+                self.widths(src, dst, bitrate)
+
+    def path_length(self, index) -> float:
+        """Comprimento total (km) das fibras indicadas."""
+        lengths = self.lengths
+        return sum(lengths[i] for i in index)
+
+    def widths(self, src, dst, bitrate) -> dict:
+        """
+        Número de slots em cada caminho candidato de um par, para um débito.
+
+        Args:
+            src: O nó de origem.
+            dst: O nó de destino.
+            bitrate (float): Débito pedido (Gb/s).
+
+        Returns:
+            dict: Índices das fibras do caminho -> número de slots, incluindo a banda de guarda (-1 se o caminho
+                exceder o alcance).
+        """
+        key = (src, dst, bitrate)
+        try:
+            return self._widths[key]
+        except KeyError:
+            widths = self._widths[key] = {}
+            for _, index in self.routing.routes(src, dst):
+                n = slots_for(bitrate, self.path_length(index), self.slot_width, self.formats)
+                widths[index] = n + self.guard_band if n >= 0 else -1
+            return widths
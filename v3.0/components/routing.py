@@ -0,0 +1,87 @@
+from itertools import islice
+import networkx as nx
+from components.topology import Topology
+
+
+class RoutingTable:
+    """
+    Tabela de encaminhamento pré-calculada.
+    Guarda, para cada par (origem, destino), os k caminhos mais curtos (algoritmo de Yen) já convertidos em listas de índices de fibras,
+    de forma que a consulta durante a simulação seja O(1).
+    """
+
+    def __init__(self, network: nx.Graph, k: int = 3, precompute: bool = True, weight=None, topology: Topology = None):
+        """
+        Inicializa a tabela de encaminhamento.
+
+        Args:
+            network (networkx.Graph): O grafo da rede.
+            k (int): Número de caminhos candidatos guardados por par de nós.
+            precompute (bool): Se verdadeiro, calcula todos os pares na construção; caso contrário, calcula cada par na primeira consulta.
+            weight (str): Atributo das arestas usado como custo (None para contar saltos).
+            topology (Topology): Topologia compilada do grafo, cuja adjacência CSR converte os caminhos em índices de
+                fibras; por omissão é compilada a partir de network.
+        """
+        self.network = network
+        self.k = k
+        self.weight = weight
+        self.topology = topology if topology is not None else Topology(network)
+        self._routes = {}
+
+        if precompute:
+            for src in network.nodes():
+                for dst in network.nodes():
+                    if src != dst:
+                        self._routes[(src, dst)] = self._compute(src, dst)
+
+    def _compute(self, src, dst) -> list:
+        """
+        Calcula os k caminhos mais curtos entre dois nós.
+
+        Returns:
+            list: Lista de tuplos (caminho, índices das fibras), do mais curto para o mais longo.
+        """
+        try:
+            paths = list(islice(nx.shortest_simple_paths(self.network, src, dst, weight=self.weight), self.k))
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            return []
+        return [(path, tuple(self.edge_indices(path))) for path in paths]
+
+    def edge_indices(self, path) -> list:
+        """
+        Converte um caminho (lista de nós) na lista de índices das fibras percorridas.
+
+        Args:
+            path (list): Lista de nós no caminho.
+
+        Returns:
+            list: Lista de índices das arestas.
+        """
+        return self.topology.path_edges(path)
+
+    def routes(self, src, dst) -> list:
+        """
+        Devolve os caminhos candidatos entre dois nós.
+
+        Args:
+            src: O nó de origem.
+            dst: O nó de destino.
+
+        Returns:
+            list: Lista de tuplos (caminho, índices das fibras).
+        """
+        try:
+            return self._routes[(src, dst)]
+        except KeyError:
+            routes = self._routes[(src, dst)] = self._compute(src, dst)
+            return routes
+
+    def shortest(self, src, dst):
+        """
+        Devolve o caminho mais curto entre dois nós.
+
+        Returns:
+            tuple: (caminho, índices das fibras), ou ([], ()) se não existir caminho.
+        """
+        routes = self.routes(src, dst)
+        return routes[0] if routes else ([], ())
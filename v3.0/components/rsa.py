@@ -0,0 +1,236 @@
+"""
+Estratégias de encaminhamento e atribuição de espectro (RSA).
+As estratégias de encaminhamento propõem caminhos candidatos e as de espectro escolhem o bloco de slots num caminho.
+Ambas são classes registadas por nome, combinadas num RSA e usadas pelo Control sem que este conheça cada heurística:
+para acrescentar uma nova basta definir a classe com @register_routing ou @register_spectrum.
+"""
+
+import numpy as np
+from components.spectrum_search import fit_mask, largest_run
+
+ROUTING_STRATEGIES = {}
+SPECTRUM_STRATEGIES = {}
+
+
+def register_routing(name: str):
+    """Decorador que regista uma estratégia de encaminhamento com o nome indicado."""
+    def register(cls):
+        cls.name = name
+        ROUTING_STRATEGIES[name] = cls
+        return cls
+    return register
+
+
+def register_spectrum(name: str):
+    """Decorador que regista uma estratégia de atribuição de espectro com o nome indicado."""
+    def register(cls):
+        cls.name = name
+        SPECTRUM_STRATEGIES[name] = cls
+        return cls
+    return register
+
+
+class RoutingStrategy:
+    """
+    Estratégia de encaminhamento: ordena os caminhos candidatos de um pedido.
+    As subclasses implementam candidates(routing, slots, src, dst). As que definem uses_largest_blocks precisam do
+    maior bloco livre de cada fibra, mantido pelo FragmentationTracker da grelha (o Control cria-o nesse caso).
+    """
+    name = None
+    uses_largest_blocks = False
+
+    def candidates(self, routing, slots, src, dst) -> list:
+        """
+        Devolve os caminhos a experimentar, por ordem de preferência.
+
+        Args:
+            routing (RoutingTable): Tabela com os k caminhos mais curtos de cada par.
+            slots (SpectrumGrid): Estado espectral atual.
+            src: O nó de origem.
+            dst: O nó de destino.
+
+        Returns:
+            list: Tuplos (caminho, índices das fibras).
+        """
+        raise NotImplementedError
+
+
+class SpectrumStrategy:
+    """
+    Estratégia de atribuição de espectro: escolhe o bloco de slots contíguos num caminho.
+    Por omissão aplica a política de procura policy (ver spectrum_search.search) à grelha espectral.
+    """
+    name = None
+    policy = None
+
+    def select(self, slots, index, n: int) -> int:
+        """
+        Escolhe o primeiro slot do bloco a ocupar.
+
+        Args:
+            slots (SpectrumGrid): Estado espectral atual.
+            index (tuple): Índices das fibras do caminho.
+            n (int): Número de slots necessários.
+
+        Returns:
+            int: Índice do primeiro slot, ou -1 se o caminho não tiver um bloco suficiente.
+        """
+        return slots.fit(index, n, self.policy)
+
+
+@register_routing("shortest")
+class ShortestPath(RoutingStrategy):
+    """Apenas o caminho mais curto (o comportamento original)."""
+
+    def candidates(self, routing, slots, src, dst):
+        return routing.routes(src, dst)[:1]
+
+
+@register_routing("k_shortest")
+class KShortestPaths(RoutingStrategy):
+    """Os k caminhos mais curtos, do mais curto para o mais longo; usa-se o primeiro com espectro disponível."""
+
+    def candidates(self, routing, slots, src, dst):
+        return routing.routes(src, dst)
+
+
+@register_routing("least_loaded")
+class LeastLoaded(RoutingStrategy):
+    """
+    Os k caminhos mais curtos, ordenados pelo total de slots ocupados nas fibras do caminho.
+    O total penaliza tanto as fibras carregadas como os desvios longos, que consomem espectro em mais fibras.
+    A ocupação vem dos contadores SpectrumGrid.used, pelo que ordenar os k caminhos não exige percorrer os slots.
+    """
+
+    def candidates(self, routing, slots, src, dst):
+        routes = routing.routes(src, dst)
+        if len(routes) < 2:
+            return routes
+        used = slots.used
+        return sorted(routes, key=lambda route: sum([used[i] for i in route[1]]))
+
+
+@register_routing("largest_block")
+class LargestBlock(RoutingStrategy):
+    """
+    Os k caminhos mais curtos ordenados pelo maior bloco livre ao longo do caminho (do maior para o menor), deixando
+    mais espaço contíguo para pedidos futuros; em caso de empate mantém-se a ordem dos k caminhos mais curtos.
+    O bloco de cada caminho é estimado pelo mínimo, sobre as suas fibras, do maior bloco livre de cada fibra, que o
+    FragmentationTracker mantém em cada alocação e libertação: ordenar os k caminhos custa O(saltos) por caminho, sem
+    percorrer os slots. A estimativa é um majorante do bloco comum; a procura exata (máscara comum) só é feita pelo
+    RSA nos caminhos que experimenta, por esta ordem.
+    """
+    uses_largest_blocks = True
+
+    def candidates(self, routing, slots, src, dst):
+        routes = routing.routes(src, dst)
+        if len(routes) < 2:
+            return routes
+        tracker = slots.fragmentation
+        if tracker is None:
+            # Grelha sem métricas de fragmentação: maior bloco exato da máscara comum
+            return sorted(routes, key=lambda route: -largest_run(slots.common(route[1])))
+        largest = tracker.largest
+        return sorted(routes, key=lambda route: -min([largest[i] for i in route[1]]))
+
+
+@register_spectrum("first_fit")
+class FirstFit(SpectrumStrategy):
+    """Bloco de menor índice."""
+    policy = "first_fit"
+
+
+@register_spectrum("best_gap")
+class BestGap(SpectrumStrategy):
+    """Menor bloco livre com pelo menos n slots."""
+    policy = "best_fit"
+
+
+@register_spectrum("last_fit")
+class LastFit(SpectrumStrategy):
+    """Bloco de maior índice."""
+    policy = "last_fit"
+
+
+@register_spectrum("exact_fit")
+class ExactFit(SpectrumStrategy):
+    """Primeiro bloco livre com exatamente n slots; sem bloco exato, recorre ao first fit."""
+    policy = "exact_fit"
+
+    def select(self, slots, index, n):
+        mask = slots.available(index)
+        start = fit_mask(mask, n, "exact_fit")
+        return start if start >= 0 else fit_mask(mask, n, "first_fit")
+
+
+@register_spectrum("random_fit")
+class RandomFit(SpectrumStrategy):
+    """Um bloco suficiente escolhido ao acaso."""
+    policy = "random_fit"
+
+    def __init__(self, rng: np.random.Generator = None):
+        """
+        Args:
+            rng (numpy.random.Generator): Gerador usado na escolha (por omissão, um novo).
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def select(self, slots, index, n):
+        return fit_mask(slots.available(index), n, self.policy, self.rng)
+
+
+class RSA:
+    """
+    Combinação de uma estratégia de encaminhamento com uma de atribuição de espectro.
+    """
+
+    def __init__(self, routing: RoutingStrategy, spectrum: SpectrumStrategy):
+        self.routing = routing
+        self.spectrum = spectrum
+
+    def assign(self, routing_table, slots, src, dst, n: int, widths: dict = None):
+        """
+        Experimenta os caminhos candidatos por ordem e devolve o primeiro com espectro disponível.
+
+        Args:
+            routing_table (RoutingTable): Tabela de encaminhamento.
+            slots (SpectrumGrid): Estado espectral atual.
+            src: O nó de origem.
+            dst: O nó de destino.
+            n (int): Número de slots necessários.
+            widths (dict): Número de slots de cada caminho (índices das fibras -> slots, -1 se inalcançável), quando
+                depende do caminho (modulação adaptativa); substitui n.
+
+        Returns:
+            tuple: (caminho, índices das fibras, primeiro slot), ou None se nenhum caminho servir.
+        """
+        select = self.spectrum.select
+        for path, index in self.routing.candidates(routing_table, slots, src, dst):
+            if widths is not None:
+                n = widths[index]
+                if n < 0:
+                    continue
+            start = select(slots, index, n)
+            if start >= 0:
+                return path, index, start
+        return None
+
+
+def make_rsa(routing: str = "shortest", spectrum: str = "first_fit", rng: np.random.Generator = None) -> RSA:
+    """
+    Cria um RSA a partir dos nomes registados.
+
+    Args:
+        routing (str): Nome da estratégia de encaminhamento (chave de ROUTING_STRATEGIES).
+        spectrum (str): Nome da estratégia de espectro (chave de SPECTRUM_STRATEGIES).
+        rng (numpy.random.Generator): Gerador das estratégias aleatórias.
+
+    Returns:
+        RSA: A combinação pedida.
+    """
+    if routing not in ROUTING_STRATEGIES:
+        raise ValueError(f"Estratégia de encaminhamento desconhecida: {routing} (disponíveis: {', '.join(ROUTING_STRATEGIES)})")
+    if spectrum not in SPECTRUM_STRATEGIES:
+        raise ValueError(f"Estratégia de espectro desconhecida: {spectrum} (disponíveis: {', '.join(SPECTRUM_STRATEGIES)})")
+    spectrum_cls = SPECTRUM_STRATEGIES[spectrum]
+    return RSA(ROUTING_STRATEGIES[routing](), spectrum_cls(rng) if spectrum_cls is RandomFit else spectrum_cls())
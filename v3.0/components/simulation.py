@@ -0,0 +1,314 @@
+"""
+Execução da simulação em modo não interativo (batch).
+Corre à velocidade máxima do CPU: sem perguntas ao utilizador, sem renderização e sem sincronização com o tempo real.
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+import simpy
+from components.light_path_control import Control
+from components.light_path_generator import LightPathGenerator
+from components.rsa import ROUTING_STRATEGIES, SPECTRUM_STRATEGIES
+from components.defragmentation import TRIGGERS
+from components.topology import as_topology, load_topology
+from components.events import DEBUG, INFO, WARNING, JsonlSink, NullSink
+from components.fast_kernel import Clock, run_fast
+from components.traffic import TraceReplayer, generate_trace, generate_trace_chunks, load_trace, save_trace
+
+DEFAULT_CONFIG = {
+    "duration": 1000.0,                 # Duração da simulação (s)
+    "load": 0.1,                        # Carga da rede
+    "allocation_algorithm": "first_fit",  # Estratégia de espectro (rsa.SPECTRUM_STRATEGIES)
+    "routing": "shortest",              # Estratégia de encaminhamento (rsa.ROUTING_STRATEGIES)
+    "holding_time": None,               # Duração média dos lightpaths (None usa a duração, como no modo interativo)
+    "num_slots": 10,                    # Número de slots por fibra
+    "num_txrx": 10,                     # Número de transmissores/receptores por nó
+    "num_max_pet": 10,                  # Número máximo de pedidos
+    "num_max_slots": 3,                 # Número máximo de slots por pedido
+    "bitrates": None,                   # Classes de débito (Gb/s); se indicadas, os slots vêm da modulação adaptativa
+    "slot_width": 12.5,                 # Largura de um slot (GHz)
+    "guard_band": 0,                    # Slots de banda de guarda entre lightpaths vizinhos
+    "fragmentation": False,             # Mantém e amostra as métricas de fragmentação espectral
+    "defragmentation": None,            # Desfragmentação: "blocking", "periodic" ou None
+    "defrag_period": 100.0,             # Intervalo entre desfragmentações periódicas (s)
+    "defrag_max_moves": None,           # Máximo de lightpaths movidos por desfragmentação (None para não limitar)
+    "k_paths": 3,                       # Caminhos candidatos por par de nós
+    "block_index": False,               # Mantém um índice de blocos livres por fibra (útil com muitos slots)
+    "precompute_routes": True,          # Calcula os caminhos de todos os pares no arranque (False: no primeiro pedido)
+    "seed": None,                       # Semente do gerador aleatório (None para não fixar)
+    "replication": None,                # Índice da replicação independente derivada da semente
+    "traffic": "trace",                 # "trace" (traço gerado em bloco) ou "generators" (um processo SimPy por fonte)
+    "trace_file": None,                 # Traço .npy a reproduzir a partir de um mapeamento em memória
+    "kernel": "simpy",                  # "simpy" ou "fast" (núcleo sem SimPy, apenas com traços)
+    "log_file": None,                   # Ficheiro JSONL para os eventos do controlador (None para não registar)
+    "log_level": "info",                # Nível mínimo dos eventos registados ("debug", "info" ou "warning")
+}
+
+LOG_LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING}
+
+
+def make_config(config=None, **defaults) -> dict:
+    """
+    Combina a configuração fornecida com os valores por omissão.
+
+    Args:
+        config (dict): Parâmetros fornecidos pelo utilizador.
+        **defaults: Valores por omissão específicos da topologia, com prioridade sobre DEFAULT_CONFIG.
+
+    Returns:
+        dict: Configuração completa.
+    """
+    merged = dict(DEFAULT_CONFIG)
+    merged.update(defaults)
+    if config:
+        unknown = set(config) - set(merged)
+        if unknown:
+            raise ValueError(f"Parâmetros de configuração desconhecidos: {sorted(unknown)}")
+        merged.update(config)
+    return merged
+
+
+def seed_sequence(config) -> np.random.SeedSequence:
+    """
+    Obtém a SeedSequence raiz de uma simulação.
+    A replicação r usa o mesmo fluxo que SeedSequence(seed).spawn(r + 1)[r], pelo que replicações diferentes são independentes.
+
+    Args:
+        config (dict): Configuração com as chaves "seed" e "replication".
+
+    Returns:
+        numpy.random.SeedSequence: Sequência a partir da qual se derivam os fluxos de cada gerador.
+    """
+    spawn_key = () if config["replication"] is None else (config["replication"],)
+    return np.random.SeedSequence(config["seed"], spawn_key=spawn_key)
+
+
+def trace_arguments(network, config, node_range=None) -> dict:
+    """Parâmetros de generate_trace/generate_trace_chunks correspondentes a uma configuração."""
+    nodes = as_topology(network).nodes
+    node_range = list(node_range if node_range is not None else nodes)
+    return {
+        "sources": node_range,
+        "node_range": node_range,
+        "num_requests": config["num_max_pet"],
+        "holding_time": config["holding_time"] or config["duration"],
+        "load": config["load"],
+        "num_max_slots": config["num_max_slots"],
+        "numberNodes": len(nodes),
+        "streams": seed_sequence(config).spawn(len(node_range)),
+        "until": config["duration"],
+        "bitrates": config["bitrates"],
+    }
+
+
+def build_trace(network, config, node_range=None) -> np.ndarray:
+    """
+    Gera em bloco o traço de pedidos de uma simulação, para poder ser reutilizado entre execuções.
+
+    Args:
+        network (networkx.Graph): O grafo da rede.
+        config (dict): Configuração completa (ver make_config).
+        node_range (range): Identificadores dos nós que geram e recebem pedidos (por omissão, os nós do grafo).
+
+    Returns:
+        numpy.ndarray: Traço com dtype TRACE_DTYPE.
+    """
+    return generate_trace(**trace_arguments(network, config, node_range))
+
+
+def write_trace(path, network, config, node_range=None) -> int:
+    """
+    Gera o traço de uma simulação por blocos e grava-o diretamente num ficheiro .npy.
+
+    Args:
+        path (str): Caminho do ficheiro.
+        network (networkx.Graph): O grafo da rede.
+        config (dict): Configuração completa (ver make_config).
+        node_range (range): Identificadores dos nós que geram e recebem pedidos.
+
+    Returns:
+        int: Número de pedidos gravados.
+    """
+    return save_trace(path, generate_trace_chunks(**trace_arguments(network, config, node_range)))
+
+
+def run_simulation(network, config, node_range=None, trace=None) -> dict:
+    """
+    Executa uma simulação completa sem interação.
+
+    Args:
+        network (networkx.Graph ou Topology): O grafo da rede ou a topologia compilada.
+        config (dict): Configuração completa (ver make_config).
+        node_range (range): Identificadores dos nós que geram e recebem pedidos (por omissão, os nós do grafo).
+        trace (numpy.ndarray): Traço de pedidos já gerado (por omissão, gerado a partir da configuração).
+
+    Returns:
+        dict: Resultados da simulação (pedidos, aceites, bloqueados, probabilidade de bloqueio e tempos).
+    """
+    topology = as_topology(network)
+    network = topology.network
+    nodes = topology.nodes
+    node_range = node_range if node_range is not None else nodes
+    holding_time = config["holding_time"] or config["duration"]
+
+    start = time.perf_counter()
+    fast = config["kernel"] == "fast"
+    if fast and config["traffic"] == "generators" and trace is None:
+        raise ValueError('O núcleo "fast" só reproduz traços: use traffic="trace".')
+
+    env = Clock() if fast else simpy.Environment()
+    events = JsonlSink(config["log_file"], LOG_LEVELS[config["log_level"]]) if config["log_file"] else NullSink()
+    # Fluxo próprio para as estratégias RSA aleatórias, independente dos fluxos das fontes
+    rsa_rng = np.random.default_rng(seed_sequence(config).spawn(len(node_range) + 1)[-1])
+    control = Control(env, topology, debug=True, tab=False, verbose=False, record_lost=False, events=events,
+                      allocation_algorithm=config["allocation_algorithm"], num_slots=config["num_slots"],
+                      k_paths=config["k_paths"], num_txrx=config["num_txrx"], block_index=config["block_index"],
+                      routing=config["routing"], rng=rsa_rng, bitrates=config["bitrates"], slot_width=config["slot_width"],
+                      guard_band=config["guard_band"], fragmentation=config["fragmentation"],
+                      defragmentation=config["defragmentation"], defrag_period=config["defrag_period"],
+                      defrag_max_moves=config["defrag_max_moves"],
+                      precompute_routes=config["precompute_routes"])
+    if config["traffic"] == "generators" and trace is None:
+        streams = seed_sequence(config).spawn(len(node_range))
+        for i, stream in zip(node_range, streams):
+            pg = LightPathGenerator(env, i, holding_time, config["load"], numberNodes=len(nodes),
+                                    num_max_pet=config["num_max_pet"], num_max_slots=config["num_max_slots"],
+                                    node_range=node_range, rng=np.random.default_rng(stream), bitrates=config["bitrates"])
+            pg.out = control
+    else:
+        if trace is None and config["trace_file"]:
+            trace = load_trace(config["trace_file"])
+        elif trace is None:
+            trace = build_trace(network, config, node_range)
+
+    if fast:
+        run_fast(control, trace, until=config["duration"])
+    else:
+        if trace is not None:
+            replayer = TraceReplayer(env, trace)
+            replayer.out = control
+        env.run(until=config["duration"])
+    events.close()
+    wall_time = time.perf_counter() - start
+
+    requests = control.accepted + control.blocked
+    results = {
+        "config": dict(config),
+        "requests": requests,
+        "accepted": control.accepted,
+        "blocked": control.blocked,
+        "blocking_probability": control.blocked / requests if requests > 0 else 0.0,
+        "sim_time": env.now,
+        "wall_time": wall_time,
+    }
+    if control.fragmentation:
+        results["fragmentation"] = control.slots.fragmentation.summary()
+    if control.defragmenter is not None:
+        results["defragmentation"] = control.defragmenter.report()
+    return results
+
+
+def build_arg_parser(description, defaults) -> argparse.ArgumentParser:
+    """
+    Cria o parser da linha de comandos comum aos scripts de simulação.
+
+    Args:
+        description (str): Descrição apresentada na ajuda.
+        defaults (dict): Configuração por omissão da topologia.
+
+    Returns:
+        argparse.ArgumentParser: O parser configurado.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--batch", action="store_true", help="executa sem interação, renderização nem sincronização com o tempo real")
+    parser.add_argument("--topology-file", dest="topology_file", default=None, help="simula a topologia de um ficheiro (.json, .gml, .graphml ou .txt do SNDlib) em vez da predefinida")
+    parser.add_argument("--duration", type=float, default=defaults["duration"], help="duração da simulação (s)")
+    parser.add_argument("--load", type=float, default=defaults["load"], help="carga de tráfego")
+    parser.add_argument("--algorithm", dest="allocation_algorithm", choices=list(SPECTRUM_STRATEGIES), default=defaults["allocation_algorithm"], help="estratégia de atribuição de espectro")
+    parser.add_argument("--routing", choices=list(ROUTING_STRATEGIES), default=defaults["routing"], help="estratégia de encaminhamento")
+    parser.add_argument("--holding-time", dest="holding_time", type=float, default=defaults["holding_time"], help="duração média dos lightpaths (s)")
+    parser.add_argument("--slots", dest="num_slots", type=int, default=defaults["num_slots"], help="número de slots por fibra")
+    parser.add_argument("--requests", dest="num_max_pet", type=int, default=defaults["num_max_pet"], help="número máximo de pedidos")
+    parser.add_argument("--block-index", dest="block_index", action="store_true", default=defaults["block_index"], help="mantém um índice de blocos livres por fibra")
+    parser.add_argument("--lazy-routes", dest="precompute_routes", action="store_false", default=defaults["precompute_routes"], help="calcula os caminhos de cada par apenas no primeiro pedido")
+    parser.add_argument("--max-slots", dest="num_max_slots", type=int, default=defaults["num_max_slots"], help="número máximo de slots por pedido")
+    parser.add_argument("--guard-band", dest="guard_band", type=int, default=defaults["guard_band"], help="slots de banda de guarda entre lightpaths")
+    parser.add_argument("--fragmentation", action="store_true", default=defaults["fragmentation"], help="mede a fragmentação espectral")
+    parser.add_argument("--defrag", dest="defragmentation", choices=list(TRIGGERS), default=defaults["defragmentation"], help="modo de desfragmentação do espectro")
+    parser.add_argument("--defrag-period", dest="defrag_period", type=float, default=defaults["defrag_period"], help="intervalo entre desfragmentações periódicas (s)")
+    parser.add_argument("--defrag-max-moves", dest="defrag_max_moves", type=int, default=defaults["defrag_max_moves"], help="número máximo de lightpaths movidos por desfragmentação")
+    parser.add_argument("--bitrates", type=int, nargs="+", default=defaults["bitrates"], help="classes de débito (Gb/s) para a modulação adaptativa")
+    parser.add_argument("--traffic", choices=["trace", "generators"], default=defaults["traffic"], help="modo de geração de tráfego")
+    parser.add_argument("--trace-file", dest="trace_file", default=None, help="reproduz um traço .npy gravado (mapeado em memória)")
+    parser.add_argument("--save-trace", dest="save_trace", default=None, help="grava o traço gerado num ficheiro .npy e termina")
+    parser.add_argument("--kernel", choices=["simpy", "fast"], default=defaults["kernel"], help="núcleo de simulação")
+    parser.add_argument("--log-file", dest="log_file", default=None, help="regista os eventos do controlador num ficheiro JSONL")
+    parser.add_argument("--log-level", dest="log_level", choices=sorted(LOG_LEVELS), default=defaults["log_level"], help="nível mínimo dos eventos registados")
+    parser.add_argument("--seed", type=int, default=defaults["seed"], help="semente do gerador aleatório")
+    parser.add_argument("--json", action="store_true", help="imprime os resultados em JSON")
+    return parser
+
+
+def config_from_args(args) -> dict:
+    """Extrai da linha de comandos os parâmetros de configuração."""
+    keys = ("duration", "load", "allocation_algorithm", "routing", "holding_time", "num_slots", "block_index", "precompute_routes", "num_max_pet", "num_max_slots", "bitrates", "guard_band", "fragmentation", "defragmentation", "defrag_period", "defrag_max_moves", "seed", "traffic", "trace_file", "kernel", "log_file", "log_level")
+    return {key: getattr(args, key) for key in keys}
+
+
+def batch_main(args, network, defaults, node_range=None, parser=None):
+    """
+    Executa o modo batch a partir dos argumentos da linha de comandos.
+
+    Args:
+        args (argparse.Namespace): Argumentos lidos com build_arg_parser.
+        network (networkx.Graph): O grafo da rede.
+        defaults (dict): Configuração por omissão da topologia.
+        node_range (range): Identificadores dos nós que geram e recebem pedidos.
+        parser (argparse.ArgumentParser): O parser, usado para reportar combinações de argumentos inválidas.
+    """
+    def error(message):
+        if parser is not None:
+            parser.error(message)
+        raise SystemExit(f"erro: {message}")
+
+    config = make_config(config_from_args(args), **defaults)
+    if args.topology_file:
+        try:
+            network, node_range = load_topology(args.topology_file), None
+        except (OSError, ValueError) as e:
+            error(f"não foi possível ler a topologia {args.topology_file}: {e}")
+    topology = as_topology(network)
+    if config["bitrates"] and not topology.has_lengths:
+        error(f"--bitrates requer o comprimento (km) de todas as ligações, que a topologia {topology.name} não tem")
+    if args.save_trace:
+        count = write_trace(args.save_trace, network, config, node_range)
+        print(f"{count} pedidos gravados em {args.save_trace}")
+        return
+    print_results(run_simulation(network, config, node_range), as_json=args.json)
+
+
+def print_results(results, as_json=False):
+    """
+    Apresenta os resultados de uma simulação em modo batch.
+
+    Args:
+        results (dict): Resultados devolvidos por run_simulation.
+        as_json (bool): Se verdadeiro, imprime uma linha JSON.
+    """
+    if as_json:
+        print(json.dumps(results))
+        return
+    print("Pedidos: {}  Aceites: {}  Bloqueados: {}  Taxa de Bloqueio: {:.4f}  ({:.3f}s)".format(
+        results["requests"], results["accepted"], results["blocked"],
+        results["blocking_probability"], results["wall_time"]))
+    if "fragmentation" in results:
+        for label, key in (("Fragmentação média", "mean"), ("Fragmentação nos bloqueios", "at_blocking")):
+            m = results["fragmentation"][key]
+            print("{}: externa {:.3f}  entropia {:.3f}  maior bloco {:.1f}  blocos livres {:.2f}".format(
+                label, m["external_fragmentation"], m["entropy"], m["largest_block"], m["free_blocks"]))
+    if "defragmentation" in results:
+        d = results["defragmentation"]
+        print("Desfragmentação ({}): {} execuções  {} lightpaths movidos  {} pedidos recuperados  {} sem espectro suficiente  ({:.3f}s)".format(
+            d["trigger"], d["runs"], d["moves"], d["recovered"], d["skipped"], d["elapsed"]))
@@ -0,0 +1,278 @@
+from bisect import bisect_left, bisect_right, insort
+from components.spectrum_search import runs_from_mask, fit_mask
+from components.fragmentation import FragmentationTracker
+
+
+class FreeBlockIndex:
+    """
+    Índice dos blocos de slots livres de uma fibra, atualizado incrementalmente em cada alocação e libertação.
+    Os blocos são guardados por início (lista ordenada e dicionário início -> comprimento) e por tamanho
+    (lista ordenada de (comprimento, início)). Uma árvore de máximos sobre as posições dos slots, com o comprimento
+    de cada bloco na posição do seu início, permite encontrar o primeiro bloco suficiente em O(log S).
+    """
+
+    def __init__(self, num_slots: int, mask: int = None):
+        """
+        Inicializa o índice.
+
+        Args:
+            num_slots (int): Número de slots da fibra.
+            mask (int): Máscara inicial de slots livres (por omissão, todos livres).
+        """
+        self.num_slots = num_slots
+        self.size = 1
+        while self.size < num_slots:
+            self.size <<= 1
+        self.rebuild((1 << num_slots) - 1 if mask is None else mask)
+
+    def rebuild(self, mask: int):
+        """Reconstrói o índice a partir de uma máscara de slots livres."""
+        self.tree = [0] * (2 * self.size)
+        self.starts = []
+        self.lengths = {}
+        self.by_size = []
+        for start, length in runs_from_mask(mask):
+            self._add(start, length)
+
+    def _set(self, pos: int, value: int):
+        """Atualiza a folha pos da árvore de máximos e os seus ascendentes."""
+        tree = self.tree
+        i = pos + self.size
+        tree[i] = value
+        i >>= 1
+        while i:
+            best = max(tree[2 * i], tree[2 * i + 1])
+            if tree[i] == best:
+                break
+            tree[i] = best
+            i >>= 1
+
+    def _add(self, start: int, length: int):
+        insort(self.starts, start)
+        self.lengths[start] = length
+        insort(self.by_size, (length, start))
+        self._set(start, length)
+
+    def _remove(self, start: int) -> int:
+        length = self.lengths.pop(start)
+        del self.starts[bisect_left(self.starts, start)]
+        del self.by_size[bisect_left(self.by_size, (length, start))]
+        self._set(start, 0)
+        return length
+
+    @property
+    def largest(self) -> int:
+        """Comprimento do maior bloco livre."""
+        return self.tree[1]
+
+    def blocks(self) -> list:
+        """Blocos livres como tuplos (primeiro slot, comprimento), por ordem crescente."""
+        return [(start, self.lengths[start]) for start in self.starts]
+
+    def first_fit(self, n: int) -> int:
+        """
+        Primeiro bloco com pelo menos n slots, descendo a árvore de máximos (O(log S)).
+
+        Returns:
+            int: Início do bloco, ou -1 se não existir.
+        """
+        tree = self.tree
+        if tree[1] < n:
+            return -1
+        i = 1
+        while i < self.size:
+            i = 2 * i if tree[2 * i] >= n else 2 * i + 1
+        return i - self.size
+
+    def best_fit(self, n: int) -> int:
+        """
+        Menor bloco com pelo menos n slots (o de menor início, em caso de empate), por bissecção (O(log B)).
+
+        Returns:
+            int: Início do bloco, ou -1 se não existir.
+        """
+        k = bisect_left(self.by_size, (n, -1))
+        return self.by_size[k][1] if k < len(self.by_size) else -1
+
+    def allocate(self, start: int, n: int):
+        """
+        Ocupa [start, start + n), que tem de estar contido num bloco livre, partindo esse bloco.
+        """
+        block_start = self.starts[bisect_right(self.starts, start) - 1]
+        length = self._remove(block_start)
+        if start > block_start:
+            self._add(block_start, start - block_start)
+        end = start + n
+        if end < block_start + length:
+            self._add(end, block_start + length - end)
+
+    def release(self, start: int, n: int):
+        """
+        Liberta [start, start + n), juntando-o aos blocos livres vizinhos.
+        """
+        end = start + n
+        k = bisect_left(self.starts, start)
+        if k > 0:
+            left = self.starts[k - 1]
+            if left + self.lengths[left] == start:
+                start = left
+                self._remove(left)
+        if end in self.lengths:
+            end += self._remove(end)
+        self._add(start, end - start)
+
+
+class SpectrumGrid:
+    """
+    Estado espectral das fibras da rede.
+    Cada fibra é guardada como um inteiro Python usado como máscara de bits: o bit k a 1 indica que o slot k está livre.
+    As operações sobre um caminho (interseção, procura e libertação de blocos) trabalham com palavras inteiras em vez de slot a slot.
+    """
+
+    def __init__(self, num_fibers: int, num_slots: int, indexed: bool = False, fragmentation: bool = False,
+                 guard_band: int = 0):
+        """
+        Inicializa a grelha espectral com todos os slots livres.
+
+        Args:
+            num_fibers (int): Número de fibras (arestas) da rede.
+            num_slots (int): Número de slots espectrais por fibra.
+            indexed (bool): Se verdadeiro, mantém também um FreeBlockIndex por fibra, usado nas procuras
+                sobre uma só fibra (caminhos de um salto).
+            fragmentation (bool): Se verdadeiro, mantém as métricas de fragmentação num FragmentationTracker.
+            guard_band (int): Slots de banda de guarda incluídos nos pedidos. A guarda não é necessária acima do
+                último slot: as procuras tratam guard_band slots virtuais acima do espectro como livres e as
+                alocações são cortadas em num_slots.
+        """
+        self.num_fibers = num_fibers
+        self.num_slots = num_slots
+        self.full = (1 << num_slots) - 1
+        self.edge = ((1 << guard_band) - 1) << num_slots  # Slots virtuais acima do espectro, sempre livres
+        self.masks = [self.full] * num_fibers
+        self.used = [0] * num_fibers  # Slots ocupados em cada fibra, mantidos em cada alocação e libertação
+        self.indexes = [FreeBlockIndex(num_slots + guard_band, self.full | self.edge)
+                        for _ in range(num_fibers)] if indexed else None
+        self.fragmentation = FragmentationTracker(num_fibers, num_slots) if fragmentation else None
+
+    def reset(self):
+        """Liberta todos os slots de todas as fibras."""
+        self.masks = [self.full] * self.num_fibers
+        self.used = [0] * self.num_fibers
+        if self.indexes is not None:
+            for block_index in self.indexes:
+                block_index.rebuild(self.full | self.edge)
+        if self.fragmentation is not None:
+            self.fragmentation.reset()
+
+    def common(self, index) -> int:
+        """
+        Calcula os slots livres simultaneamente em todas as fibras indicadas (AND ao longo do caminho).
+
+        Args:
+            index (list): Índices das fibras.
+
+        Returns:
+            int: Máscara dos slots livres em comum.
+        """
+        mask = self.full
+        masks = self.masks
+        for i in index:
+            mask &= masks[i]
+        return mask
+
+    def available(self, index) -> int:
+        """
+        Máscara usada nas procuras: os slots livres em comum, mais os slots virtuais da guarda acima do espectro.
+
+        Args:
+            index (list): Índices das fibras.
+
+        Returns:
+            int: Máscara dos slots livres em comum, com os bits acima de num_slots a 1.
+        """
+        return self.common(index) | self.edge
+
+    @staticmethod
+    def block(start: int, n: int) -> int:
+        """Máscara de n slots contíguos a partir de start."""
+        return ((1 << n) - 1) << start
+
+    def allocate(self, index, start: int, n: int):
+        """
+        Ocupa o bloco [start, start + n) em todas as fibras indicadas, cortado no último slot do espectro.
+
+        Args:
+            index (list): Índices das fibras.
+            start (int): Primeiro slot do bloco.
+            n (int): Número de slots (incluindo a banda de guarda, que pode passar do fim do espectro).
+        """
+        n = min(n, self.num_slots - start)
+        clear = ~self.block(start, n)
+        masks = self.masks
+        used = self.used
+        if self.fragmentation is not None:
+            for i in index:
+                self.fragmentation.allocate(i, masks[i], start, n)
+        for i in index:
+            masks[i] &= clear
+            used[i] += n
+        if self.indexes is not None:
+            for i in index:
+                self.indexes[i].allocate(start, n)
+
+    def release(self, index, start: int, n: int):
+        """
+        Liberta o bloco [start, start + n) em todas as fibras indicadas, cortado no último slot do espectro.
+
+        Args:
+            index (list): Índices das fibras.
+            start (int): Primeiro slot do bloco.
+            n (int): Número de slots, como na alocação.
+        """
+        n = min(n, self.num_slots - start)
+        block = self.block(start, n)
+        masks = self.masks
+        used = self.used
+        if self.fragmentation is not None:
+            for i in index:
+                self.fragmentation.release(i, masks[i], start, n)
+        for i in index:
+            masks[i] |= block
+            used[i] -= n
+        if self.indexes is not None:
+            for i in index:
+                self.indexes[i].release(start, n)
+
+    def fit(self, index, n: int, policy: str = "first_fit") -> int:
+        """
+        Procura um bloco de n slots livres em todas as fibras indicadas.
+        Numa só fibra com índice, first fit e best fit são respondidos pelo FreeBlockIndex; nos restantes casos,
+        pela máscara comum do caminho.
+
+        Args:
+            index (list): Índices das fibras.
+            n (int): Número de slots contíguos necessários.
+            policy (str): Política de procura (ver spectrum_search.search).
+
+        Returns:
+            int: Índice do primeiro slot do bloco, ou -1 se não existir.
+        """
+        if self.indexes is not None and len(index) == 1:
+            block_index = self.indexes[index[0]]
+            if policy == "first_fit":
+                return block_index.first_fit(n)
+            if policy == "best_fit":
+                return block_index.best_fit(n)
+        return fit_mask(self.available(index), n, policy)
+
+    def free_blocks(self, mask: int) -> list:
+        """
+        Extrai numa só passagem os blocos contíguos de slots livres de uma máscara.
+
+        Args:
+            mask (int): Máscara de slots livres.
+
+        Returns:
+            list: Blocos livres como tuplos (primeiro slot, comprimento), por ordem crescente.
+        """
+        return runs_from_mask(mask)
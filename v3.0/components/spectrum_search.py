@@ -0,0 +1,246 @@
+"""
+Procura de blocos de slots livres no espectro.
+As políticas de alocação trabalham sobre uma máscara de bits (SpectrumGrid): uma redução por deslocamentos marca os
+slots onde começa uma janela de n slots livres e as políticas escolhem entre esses bits, sem testarem janela a janela.
+As listas de slots livres das versões anteriores (checkSlots*) são percorridas diretamente, sem conversão em máscara.
+"""
+
+import numpy as np
+
+POLICIES = ("first_fit", "last_fit", "best_fit", "exact_fit", "random_fit")
+
+
+def runs_from_mask(mask: int) -> list:
+    """
+    Extrai os blocos máximos de slots livres de uma máscara (bit a 1 = slot livre).
+
+    Args:
+        mask (int): Máscara de slots livres.
+
+    Returns:
+        list: Blocos livres como tuplos (primeiro slot, comprimento), por ordem crescente.
+    """
+    # Bits onde começa e onde termina cada bloco de uns
+    starts = mask & ~(mask << 1)
+    ends = mask & ~(mask >> 1)
+    runs = []
+    while starts:
+        low_start = starts & -starts
+        low_end = ends & -ends
+        start = low_start.bit_length() - 1
+        runs.append((start, low_end.bit_length() - start))
+        starts ^= low_start
+        ends ^= low_end
+    return runs
+
+
+def runs_from_slots(slots) -> list:
+    """
+    Extrai numa só passagem os blocos máximos de uma lista de índices de slots livres.
+
+    Args:
+        slots (list): Índices dos slots livres, por ordem crescente e sem repetições.
+
+    Returns:
+        list: Blocos livres como tuplos (primeiro slot, comprimento), por ordem crescente.
+    """
+    runs = []
+    start = prev = None
+    for s in slots:
+        if prev is None or s != prev + 1:
+            if start is not None:
+                runs.append((start, prev - start + 1))
+            start = s
+        prev = s
+    if start is not None:
+        runs.append((start, prev - start + 1))
+    return runs
+
+
+def largest_run(mask: int) -> int:
+    """
+    Comprimento do maior bloco de slots livres de uma máscara.
+
+    Args:
+        mask (int): Máscara de slots livres.
+
+    Returns:
+        int: Comprimento do maior bloco (0 se não houver slots livres).
+    """
+    return max((length for _, length in runs_from_mask(mask)), default=0)
+
+
+def search(runs, n: int, policy: str = "first_fit", rng=None) -> int:
+    """
+    Escolhe o primeiro slot de um bloco de n slots contíguos segundo uma política.
+
+    Args:
+        runs (list): Blocos livres (primeiro slot, comprimento), por ordem crescente.
+        n (int): Número de slots necessários.
+        policy (str): "first_fit" (menor índice), "last_fit" (maior índice), "best_fit" (menor bloco com pelo menos
+            n slots), "exact_fit" (apenas blocos com exatamente n slots) ou "random_fit" (bloco suficiente ao acaso).
+        rng (numpy.random.Generator): Gerador usado por "random_fit" (por omissão, um novo).
+
+    Returns:
+        int: Índice do primeiro slot a ocupar, ou -1 se nenhum bloco servir.
+    """
+    if policy == "first_fit":
+        for start, length in runs:
+            if length >= n:
+                return start
+        return -1
+    if policy == "last_fit":
+        for start, length in reversed(runs):
+            if length >= n:
+                return start + length - n
+        return -1
+    if policy == "best_fit":
+        # Menor bloco com pelo menos n slots (o primeiro, em caso de empate); ocupa os n primeiros slots desse bloco
+        best, best_length = -1, None
+        for start, length in runs:
+            if length == n:
+                return start
+            if length > n and (best_length is None or length < best_length):
+                best, best_length = start, length
+        return best
+    if policy == "exact_fit":
+        for start, length in runs:
+            if length == n:
+                return start
+        return -1
+    if policy == "random_fit":
+        fits = [start for start, length in runs if length >= n]
+        if not fits:
+            return -1
+        rng = rng if rng is not None else np.random.default_rng()
+        return fits[int(rng.integers(len(fits)))]
+    raise ValueError(f"Política de procura desconhecida: {policy}")
+
+
+def windows(mask: int, n: int) -> int:
+    """
+    Redução por deslocamentos: o bit k do resultado fica a 1 apenas se os slots k..k+n-1 estiverem livres.
+
+    Args:
+        mask (int): Máscara de slots livres.
+        n (int): Número de slots necessários.
+
+    Returns:
+        int: Máscara dos inícios de janelas de n slots livres.
+    """
+    run = mask
+    width = 1
+    while width < n and run:
+        step = min(width, n - width)
+        run &= run >> step
+        width += step
+    return run
+
+
+def _lowest(bits: int) -> int:
+    return (bits & -bits).bit_length() - 1
+
+
+def _select(mask: int, run: int, n: int, policy: str, rng=None) -> int:
+    """Aplica uma política aos inícios de janela run (ver windows) de uma máscara com pelo menos uma janela."""
+    if policy == "first_fit":
+        return _lowest(run)
+    if policy == "last_fit":
+        return run.bit_length() - 1
+    # Inícios de bloco com pelo menos n slots, e destes os seguidos de um slot ocupado em k + n (blocos exatos)
+    heads = run & ~(mask << 1)
+    exact = heads & ~(mask >> n)
+    if policy == "exact_fit":
+        return _lowest(exact) if exact else -1
+    if policy == "best_fit":
+        return _lowest(exact) if exact else search(runs_from_mask(mask), n, "best_fit")
+    if policy == "random_fit":
+        rng = rng if rng is not None else np.random.default_rng()
+        for _ in range(int(rng.integers(heads.bit_count()))):
+            heads &= heads - 1
+        return _lowest(heads)
+    raise ValueError(f"Política de procura desconhecida: {policy}")
+
+
+def fit_mask(mask: int, n: int, policy: str = "first_fit", rng=None) -> int:
+    """
+    Escolhe o bloco diretamente sobre uma máscara.
+    Todas as políticas partem da redução por deslocamentos (windows), que rejeita de imediato as máscaras sem bloco
+    suficiente. First fit, last fit, exact fit e random fit escolhem entre os bits dessa redução; best fit também,
+    quando existe um bloco exato, e só nos restantes casos percorre runs_from_mask.
+
+    Args:
+        mask (int): Máscara de slots livres.
+        n (int): Número de slots necessários.
+        policy (str): Política de procura (ver search).
+        rng (numpy.random.Generator): Gerador usado por "random_fit".
+
+    Returns:
+        int: Índice do primeiro slot a ocupar, ou -1 se nenhum bloco servir.
+    """
+    run = windows(mask, n)
+    if not run:
+        if policy not in POLICIES:
+            raise ValueError(f"Política de procura desconhecida: {policy}")
+        return -1
+    return _select(mask, run, n, policy, rng)
+
+
+def search_all(mask: int, n: int, rng=None) -> dict:
+    """
+    Responde a todas as políticas com uma só redução da máscara (e, no máximo, uma extração dos blocos, para o
+    best fit sem bloco exato).
+
+    Args:
+        mask (int): Máscara de slots livres.
+        n (int): Número de slots necessários.
+        rng (numpy.random.Generator): Gerador usado por "random_fit".
+
+    Returns:
+        dict: Primeiro slot escolhido por cada política (-1 se nenhum bloco servir).
+    """
+    run = windows(mask, n)
+    if not run:
+        return dict.fromkeys(POLICIES, -1)
+    heads = run & ~(mask << 1)
+    exact = heads & ~(mask >> n)
+    exact = _lowest(exact) if exact else -1
+    rng = rng if rng is not None else np.random.default_rng()
+    for _ in range(int(rng.integers(heads.bit_count()))):
+        heads &= heads - 1
+    return {
+        "first_fit": _lowest(run),
+        "last_fit": run.bit_length() - 1,
+        "best_fit": exact if exact >= 0 else search(runs_from_mask(mask), n, "best_fit"),
+        "exact_fit": exact,
+        "random_fit": _lowest(heads),
+    }
+
+
+def fit_slots(slots, n: int, policy: str = "first_fit", rng=None) -> int:
+    """
+    Escolhe o bloco numa lista de índices de slots livres (o formato das versões anteriores), sem a converter em
+    máscara. First fit pára na primeira janela de n slots consecutivos; as restantes políticas usam os blocos
+    extraídos numa só passagem.
+
+    Args:
+        slots (list): Índices dos slots livres, em qualquer ordem e sem repetições.
+        n (int): Número de slots necessários.
+        policy (str): Política de procura (ver search).
+        rng (numpy.random.Generator): Gerador usado por "random_fit".
+
+    Returns:
+        int: Índice do primeiro slot a ocupar, ou -1 se nenhum bloco servir.
+    """
+    slots = sorted(slots)
+    if policy == "first_fit":
+        for i in range(len(slots) - n + 1):
+            if slots[i + n - 1] - slots[i] == n - 1:
+                return slots[i]
+        return -1
+    return search(runs_from_slots(slots), n, policy, rng)
+
+
+def block_slots(start: int, n: int) -> list:
+    """Lista dos n slots a partir de start (o formato devolvido pelas funções checkSlots*), ou [] se start < 0."""
+    return list(range(start, start + n)) if start >= 0 else []
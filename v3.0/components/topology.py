@@ -0,0 +1,283 @@
+"""
+Topologias de rede: leitura de ficheiros e representação compilada.
+Lê topologias em GML, GraphML, JSON (formato próprio, ver topologies/nsfnet.json) e no formato nativo do SNDlib,
+com o comprimento das ligações em km, e compila-as numa Topology: índices densos de nós e de fibras, a adjacência em
+CSR (indptr/indices/edge_ids) e o comprimento de cada fibra, usados diretamente pelo Control para indexar os recursos
+dos nós e o espectro e pela RoutingTable e pela ModulationTable para converter caminhos em fibras e em comprimentos.
+"""
+
+from bisect import bisect_left
+import json
+import math
+import os
+import re
+import networkx as nx
+import numpy as np
+
+TOPOLOGIES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "topologies")
+
+EARTH_RADIUS = 6371.0  # Raio médio da Terra (km)
+
+
+class Topology:
+    """
+    Topologia compilada.
+    Os nós são numerados de 0 a N-1 pela ordem do grafo (node_index) e as fibras de 0 a E-1 pela ordem de
+    network.edges(), os mesmos índices usados pela SpectrumGrid. A adjacência fica em CSR: as fibras que saem do nó i
+    são edge_ids[indptr[i]:indptr[i + 1]] e os respetivos vizinhos indices[indptr[i]:indptr[i + 1]], por ordem
+    crescente, pelo que a fibra entre dois nós se encontra por bissecção na linha da origem (edge). A Topology é a
+    fonte única dos índices das fibras (RoutingTable) e dos comprimentos (ModulationTable).
+    """
+
+    def __init__(self, network: nx.Graph, name: str = None, length: str = "length"):
+        """
+        Compila um grafo.
+
+        Args:
+            network (networkx.Graph): O grafo da rede (dirigido: uma fibra por sentido).
+            name (str): Nome da topologia.
+            length (str): Atributo das arestas com o comprimento (km).
+        """
+        self.network = network
+        self.name = name if name is not None else network.graph.get("name")
+        self.nodes = list(network.nodes())
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+
+        self.edges = []
+        src, dst, ids, lengths = [], [], [], []
+        node_index = self.node_index
+        for i, (u, v, data) in enumerate(network.edges(data=True)):
+            self.edges.append((u, v))
+            src.append(node_index[u])
+            dst.append(node_index[v])
+            ids.append(i)
+            if not network.is_directed():
+                # Num grafo não dirigido, a fibra aparece nos dois sentidos com o mesmo índice
+                src.append(node_index[v])
+                dst.append(node_index[u])
+                ids.append(i)
+            lengths.append(data.get(length, np.nan))
+        self.lengths = np.asarray(lengths, dtype=float)
+
+        # Adjacência CSR, com as linhas ordenadas pelo índice do vizinho
+        src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+        order = np.lexsort((dst, src))
+        self.indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(self.nodes)), out=self.indptr[1:])
+        self.indices = dst[order]
+        self.edge_ids = np.asarray(ids, dtype=np.int64)[order]
+        # Cópias em listas Python para as consultas escalares (mais rápidas que indexar arrays NumPy elemento a elemento)
+        self._indptr = self.indptr.tolist()
+        self._indices = self.indices.tolist()
+        self._edge_ids = self.edge_ids.tolist()
+
+    @property
+    def num_nodes(self) -> int:
+        """Número de nós."""
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        """Número de fibras."""
+        return len(self.edges)
+
+    @property
+    def has_lengths(self) -> bool:
+        """Indica se todas as fibras têm comprimento."""
+        return not np.isnan(self.lengths).any()
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Índices dos vizinhos do nó de índice i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def out_edges(self, i: int) -> np.ndarray:
+        """Índices das fibras que saem do nó de índice i."""
+        return self.edge_ids[self.indptr[i]:self.indptr[i + 1]]
+
+    def edge(self, i: int, j: int) -> int:
+        """
+        Índice da fibra do nó de índice i para o nó de índice j, por bissecção na linha i da adjacência.
+
+        Raises:
+            KeyError: Se não houver fibra de i para j.
+        """
+        lo, hi = self._indptr[i], self._indptr[i + 1]
+        k = bisect_left(self._indices, j, lo, hi)
+        if k == hi or self._indices[k] != j:
+            raise KeyError((self.nodes[i], self.nodes[j]))
+        return self._edge_ids[k]
+
+    def path_edges(self, path) -> list:
+        """
+        Converte um caminho (lista de nós) na lista dos índices das fibras percorridas.
+
+        Args:
+            path (list): Nós do caminho.
+
+        Returns:
+            list: Índices das fibras.
+        """
+        node_index, indptr, indices, edge_ids = self.node_index, self._indptr, self._indices, self._edge_ids
+        fibers = []
+        i = node_index[path[0]]
+        for node in path[1:]:
+            j = node_index[node]
+            lo, hi = indptr[i], indptr[i + 1]
+            k = bisect_left(indices, j, lo, hi)
+            if k == hi or indices[k] != j:
+                raise KeyError((self.nodes[i], node))
+            fibers.append(edge_ids[k])
+            i = j
+        return fibers
+
+
+def as_topology(network) -> Topology:
+    """Devolve a topologia compilada de um grafo (ou a própria, se já for uma Topology)."""
+    return network if isinstance(network, Topology) else Topology(network)
+
+
+def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Distância (km) ao longo da superfície da Terra entre duas coordenadas em graus."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def build_network(nodes, links, directed: bool = False, name: str = None, coordinates: dict = None) -> nx.DiGraph:
+    """
+    Constrói o grafo dirigido de uma topologia.
+
+    Args:
+        nodes (list): Identificadores (inteiros) dos nós, pela ordem pretendida.
+        links (list): Ligações (origem, destino, comprimento em km ou None).
+        directed (bool): Se falso, cada ligação dá uma fibra em cada sentido.
+        name (str): Nome da topologia.
+        coordinates (dict): Nó -> (longitude, latitude), usado para os comprimentos em falta.
+
+    Returns:
+        networkx.DiGraph: O grafo, com o atributo "length" nas arestas cujo comprimento é conhecido.
+    """
+    G = nx.DiGraph(name=name)
+    G.add_nodes_from(nodes)
+    if not directed:
+        # Ligações ordenadas: os vizinhos de cada nó (e os índices das fibras) ficam por ordem crescente
+        links = sorted((min(u, v), max(u, v), length) for u, v, length in links)
+    for u, v, length in links:
+        if length is None and coordinates and u in coordinates and v in coordinates:
+            length = round(haversine(*coordinates[u], *coordinates[v]), 1)
+        attrs = {} if length is None else {"length": length}
+        G.add_edge(u, v, **attrs)
+        if not directed:
+            G.add_edge(v, u, **attrs)
+    return G
+
+
+def from_networkx(G: nx.Graph, name: str = None, length: str = "length") -> nx.DiGraph:
+    """
+    Converte um grafo lido de GML ou GraphML no formato usado pelo simulador.
+    Os nós passam a inteiros 0..N-1 (o identificador original fica no atributo "label"), o comprimento vem do
+    atributo length, "distance" ou "weight", e, na falta destes, das coordenadas Longitude/Latitude dos nós
+    (como nos ficheiros do Topology Zoo).
+    """
+    labels = list(G.nodes())
+    relabel = {node: i for i, node in enumerate(labels)}
+    coordinates = {}
+    for node, data in G.nodes(data=True):
+        lon, lat = data.get("Longitude", data.get("x")), data.get("Latitude", data.get("y"))
+        if lon is not None and lat is not None:
+            coordinates[relabel[node]] = (float(lon), float(lat))
+    links = []
+    for u, v, data in G.edges(data=True):
+        value = next((data[key] for key in (length, "distance", "weight") if key in data), None)
+        links.append((relabel[u], relabel[v], float(value) if value is not None else None))
+    network = build_network(range(len(labels)), links, directed=G.is_directed(), name=name or G.graph.get("name"),
+                            coordinates=coordinates)
+    nx.set_node_attributes(network, {relabel[node]: str(node) for node in labels}, "label")
+    return network
+
+
+def read_json(path: str) -> nx.DiGraph:
+    """
+    Lê uma topologia em JSON:
+        {"name": ..., "directed": false, "nodes": [0, 1, ...], "links": [[0, 1, 2100], ...]}
+    Cada ligação é [origem, destino] ou [origem, destino, comprimento em km]. Nós que não sejam inteiros são
+    renumerados pela ordem de "nodes".
+    """
+    with open(path) as f:
+        data = json.load(f)
+    nodes = data["nodes"]
+    links = [(link[0], link[1], link[2] if len(link) > 2 else None) for link in data["links"]]
+    if not all(isinstance(node, int) for node in nodes):
+        relabel = {node: i for i, node in enumerate(nodes)}
+        network = build_network(range(len(nodes)), [(relabel[u], relabel[v], l) for u, v, l in links],
+                                directed=data.get("directed", False), name=data.get("name"))
+        nx.set_node_attributes(network, {i: str(node) for node, i in relabel.items()}, "label")
+        return network
+    return build_network(nodes, links, directed=data.get("directed", False), name=data.get("name"))
+
+
+def read_sndlib(path: str) -> nx.DiGraph:
+    """
+    Lê uma topologia no formato nativo do SNDlib (secções NODES e LINKS).
+    O SNDlib não guarda comprimentos: são calculados a partir das coordenadas (longitude, latitude) dos nós.
+    """
+    with open(path) as f:
+        text = f.read()
+
+    def section(name):
+        match = re.search(rf"^{name}\s*\((.*?)^\)", text, re.MULTILINE | re.DOTALL)
+        if match is None:
+            raise ValueError(f"Ficheiro SNDlib sem a secção {name}: {path}")
+        return match.group(1)
+
+    names, coordinates = [], {}
+    for name, lon, lat in re.findall(r"^\s*(\S+)\s*\(\s*(\S+)\s+(\S+)\s*\)", section("NODES"), re.MULTILINE):
+        coordinates[len(names)] = (float(lon), float(lat))
+        names.append(name)
+    index = {name: i for i, name in enumerate(names)}
+    links = [(index[u], index[v], None)
+             for u, v in re.findall(r"^\s*\S+\s*\(\s*(\S+)\s+(\S+)\s*\)", section("LINKS"), re.MULTILINE)]
+    network = build_network(range(len(names)), links, name=os.path.splitext(os.path.basename(path))[0],
+                            coordinates=coordinates)
+    nx.set_node_attributes(network, dict(enumerate(names)), "label")
+    return network
+
+
+def read_gml(path: str) -> nx.DiGraph:
+    """Lê uma topologia em GML, identificando os nós pelo atributo label (ou pelo id, se os labels se repetirem)."""
+    try:
+        G = nx.read_gml(path)
+    except nx.NetworkXError:
+        G = nx.read_gml(path, label="id")
+    return from_networkx(G)
+
+
+READERS = {
+    ".json": read_json,
+    ".gml": read_gml,
+    ".graphml": lambda path: from_networkx(nx.read_graphml(path)),
+    ".txt": read_sndlib,
+}
+
+
+def load_topology(path: str) -> Topology:
+    """
+    Lê e compila uma topologia.
+
+    Args:
+        path (str): Caminho do ficheiro (.json, .gml, .graphml ou .txt do SNDlib), ou o nome de uma topologia
+            incluída em topologies/ (por exemplo "nsfnet").
+
+    Returns:
+        Topology: A topologia compilada.
+    """
+    if not os.path.exists(path) and os.path.exists(os.path.join(TOPOLOGIES_DIR, path + ".json")):
+        path = os.path.join(TOPOLOGIES_DIR, path + ".json")
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Formato de topologia desconhecido: {ext} (disponíveis: {', '.join(READERS)})")
+    network = READERS[ext](path)
+    if not network.graph.get("name"):
+        network.graph["name"] = os.path.splitext(os.path.basename(path))[0]
+    return Topology(network)
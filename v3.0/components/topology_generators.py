@@ -0,0 +1,150 @@
+"""
+Geradores de topologias ópticas sintéticas de grande dimensão.
+Os nós são colocados num plano em km (por omissão um quadrado de 4000 km de lado, a escala de uma rede continental)
+e cada ligação tem o comprimento euclidiano entre os seus extremos, pelo que as topologias geradas podem ser usadas
+com a modulação adaptativa. Todas as topologias são conexas e devolvidas já compiladas (Topology).
+"""
+
+import math
+import networkx as nx
+import numpy as np
+from components.topology import Topology, build_network
+
+AREA = 4000.0      # Lado do quadrado onde são colocados os nós (km)
+SPACING = 200.0    # Distância entre nós vizinhos nos anéis e grelhas (km)
+
+
+def _random_positions(n: int, rng: np.random.Generator, area: float) -> np.ndarray:
+    return rng.uniform(0.0, area, size=(n, 2))
+
+
+def _distances(positions: np.ndarray) -> np.ndarray:
+    return np.sqrt(((positions[:, None, :] - positions[None, :, :]) ** 2).sum(axis=-1))
+
+
+def _topology(name: str, n: int, links, positions: np.ndarray) -> Topology:
+    """Constrói a topologia com os comprimentos euclidianos das ligações (mínimo de 1 km)."""
+    links = [(int(u), int(v), max(1.0, round(float(math.dist(positions[u], positions[v])), 1))) for u, v in links]
+    network = build_network(range(n), links, name=name)
+    nx.set_node_attributes(network, {i: (float(x), float(y)) for i, (x, y) in enumerate(positions)}, "pos")
+    return Topology(network)
+
+
+def _connect(n: int, links: set, distances: np.ndarray) -> set:
+    """Liga cada componente isolada à componente principal pelo par de nós mais próximo."""
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(links)
+    components = sorted(nx.connected_components(G), key=len, reverse=True)
+    main = list(components[0])
+    for component in components[1:]:
+        component = list(component)
+        block = distances[np.ix_(component, main)]
+        i, j = np.unravel_index(np.argmin(block), block.shape)
+        links.add((min(component[i], main[j]), max(component[i], main[j])))
+        main.extend(component)
+    return links
+
+
+def waxman(n: int, degree: float = 3.0, alpha: float = None, area: float = AREA, seed=None) -> Topology:
+    """
+    Topologia de Waxman: cada par (u, v) é ligado com probabilidade β·exp(-d(u, v) / (α·L)), sendo L a maior
+    distância entre nós. β é escolhido de forma que o grau médio esperado seja degree (as redes ópticas reais
+    têm grau médio entre 2,5 e 4), em vez de ser fixo, pelo que a densidade não cresce com n.
+
+    Args:
+        n (int): Número de nós.
+        degree (float): Grau médio pretendido.
+        alpha (float): Peso das ligações longas (maior alpha, mais ligações longas). Por omissão 2/√n, que acompanha
+            a distância entre nós vizinhos, de forma que o comprimento das ligações diminui à medida que a rede
+            fica mais densa.
+        area (float): Lado do quadrado onde são colocados os nós (km).
+        seed: Semente do gerador aleatório.
+
+    Returns:
+        Topology: A topologia gerada.
+    """
+    rng = np.random.default_rng(seed)
+    alpha = alpha if alpha is not None else 2 / math.sqrt(n)
+    positions = _random_positions(n, rng, area)
+    distances = _distances(positions)
+    iu, ju = np.triu_indices(n, k=1)
+    weights = np.exp(-distances[iu, ju] / (alpha * distances.max()))
+    beta = min(1.0, degree * n / 2 / weights.sum())
+    chosen = rng.random(len(weights)) < beta * weights
+    links = _connect(n, set(zip(iu[chosen].tolist(), ju[chosen].tolist())), distances)
+    return _topology(f"waxman-{n}", n, links, positions)
+
+
+def ring(n: int, spacing: float = SPACING, seed=None) -> Topology:
+    """
+    Anel de n nós igualmente espaçados (ligações de spacing km).
+
+    Args:
+        n (int): Número de nós.
+        spacing (float): Comprimento de cada ligação (km).
+        seed: Ignorado (o anel é determinístico).
+    """
+    radius = spacing / (2 * math.sin(math.pi / n))
+    angles = 2 * math.pi * np.arange(n) / n
+    positions = radius * np.column_stack([np.cos(angles), np.sin(angles)])
+    return _topology(f"ring-{n}", n, [(i, (i + 1) % n) for i in range(n)], positions)
+
+
+def grid(n: int, spacing: float = SPACING, seed=None) -> Topology:
+    """
+    Grelha aproximadamente quadrada com n nós, preenchida por linhas (ligações de spacing km).
+
+    Args:
+        n (int): Número de nós.
+        spacing (float): Distância entre nós vizinhos (km).
+        seed: Ignorado (a grelha é determinística).
+    """
+    cols = math.ceil(math.sqrt(n))
+    positions = spacing * np.array([(i % cols, i // cols) for i in range(n)], dtype=float)
+    links = [(i, i + 1) for i in range(n - 1) if (i + 1) % cols]
+    links += [(i, i + cols) for i in range(n - cols)]
+    return _topology(f"grid-{n}", n, links, positions)
+
+
+def barabasi_albert(n: int, m: int = 2, area: float = AREA, seed=None) -> Topology:
+    """
+    Topologia livre de escala de Barabási–Albert (ligação preferencial, m ligações por novo nó), com os nós
+    colocados ao acaso no plano.
+
+    Args:
+        n (int): Número de nós.
+        m (int): Ligações de cada novo nó (grau médio ≈ 2m).
+        area (float): Lado do quadrado onde são colocados os nós (km).
+        seed: Semente do gerador aleatório.
+    """
+    rng = np.random.default_rng(seed)
+    G = nx.barabasi_albert_graph(n, m, seed=int(rng.integers(2 ** 31)))
+    positions = _random_positions(n, rng, area)
+    return _topology(f"barabasi_albert-{n}", n, G.edges(), positions)
+
+
+GENERATORS = {
+    "waxman": waxman,
+    "ring": ring,
+    "grid": grid,
+    "barabasi_albert": barabasi_albert,
+}
+
+
+def generate_topology(kind: str, n: int, seed=None, **kwargs) -> Topology:
+    """
+    Gera uma topologia sintética.
+
+    Args:
+        kind (str): Tipo de topologia (chave de GENERATORS).
+        n (int): Número de nós.
+        seed: Semente do gerador aleatório.
+        **kwargs: Parâmetros específicos do gerador.
+
+    Returns:
+        Topology: A topologia gerada.
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Topologia sintética desconhecida: {kind} (disponíveis: {', '.join(GENERATORS)})")
+    return GENERATORS[kind](n, seed=seed, **kwargs)
@@ -0,0 +1,210 @@
+"""
+Geração vetorizada de tráfego.
+Em vez de sortear cada pedido dentro de um processo SimPy por fonte, gera de uma só vez o traço completo de chegadas
+(tempos, durações, origem/destino, número de slots e tamanho) como um array estruturado NumPy, que pode depois ser
+reproduzido por um único processo e reutilizado entre comparações de algoritmos.
+Os traços podem ser gravados em ficheiros .npy e reproduzidos a partir de um mapeamento em memória.
+"""
+
+import os
+import shutil
+import numpy as np
+import simpy
+from components.light_path_request import LightPathRequest
+
+# Campos de LightPathRequest, pela mesma ordem do construtor
+TRACE_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("src", np.int32),
+    ("dst", np.int32),
+    ("time", np.float64),
+    ("duration", np.float64),
+    ("nslots", np.int32),
+    ("flow_id", np.int32),
+    ("size", np.int32),
+    ("bitrate", np.int32),
+])
+
+# Formato dos traços gravados antes do campo bitrate (reproduzidos com bitrate = 0)
+LEGACY_TRACE_DTYPE = np.dtype(TRACE_DTYPE.descr[:-1])
+
+
+def generate_trace_chunks(sources, node_range, num_requests, holding_time, load, num_max_slots=3, numberNodes=None, streams=None, until=None, chunk_size=1 << 18, bitrates=None):
+    """
+    Gera o traço de pedidos de todas as fontes por blocos, sem nunca o materializar por inteiro.
+    Cada fonte segue o mesmo modelo de LightPathGenerator: chegadas de Poisson com tempo médio entre pedidos
+    holding_time / (load * (numberNodes - 1)), durações exponenciais, destino uniforme entre os restantes nós,
+    número de slots uniforme em [1, num_max_slots] e tamanho uniforme em [1, 1000]; com bitrates, cada pedido tem
+    também um débito uniforme entre as classes indicadas e o número de slots fica a cargo do controlador.
+    Em cada ronda todas as fontes geram um bloco e só são emitidos os pedidos anteriores ao menor dos últimos
+    tempos gerados, pelo que a junção das fontes fica ordenada por tempo.
+
+    Args:
+        sources (list): Nós que geram pedidos.
+        node_range (list): Nós que podem ser destino.
+        num_requests (int): Número total de pedidos (os primeiros no tempo, somando todas as fontes).
+        holding_time (float): Duração média dos lightpaths.
+        load (float): Carga da rede.
+        num_max_slots (int): Número máximo de slots por pedido.
+        numberNodes (int): Número de nós usado no cálculo do tempo entre pedidos (por omissão, len(node_range)).
+        streams (list): Uma SeedSequence ou Generator por fonte (por omissão, entropia nova).
+        until (float): Se indicado, descarta os pedidos que chegam depois deste instante.
+        chunk_size (int): Número aproximado de pedidos gerados por ronda.
+        bitrates (list): Classes de débito (Gb/s); None gera apenas o número de slots.
+
+    Yields:
+        numpy.ndarray: Blocos consecutivos do traço, com dtype TRACE_DTYPE e ordenados por tempo de chegada.
+    """
+    node_range = np.asarray(list(node_range))
+    numberNodes = numberNodes if numberNodes is not None else len(node_range)
+    time_between_req = holding_time / (load * (numberNodes - 1))
+    streams = streams if streams is not None else [None] * len(sources)
+    rngs = [stream if isinstance(stream, np.random.Generator) else np.random.default_rng(stream) for stream in streams]
+    block = max(1, min(num_requests, chunk_size // max(1, len(sources))))
+
+    last_time = [0.0] * len(sources)
+    pending = np.empty(0, dtype=TRACE_DTYPE)
+    emitted = 0
+    while emitted < num_requests and len(sources) > 0:
+        parts = [pending]
+        for k, (src, rng) in enumerate(zip(sources, rngs)):
+            part = np.empty(block, dtype=TRACE_DTYPE)
+            destinations = node_range[node_range != src]
+            part["src"] = src
+            part["time"] = last_time[k] + np.cumsum(rng.exponential(time_between_req, block))
+            part["duration"] = rng.exponential(holding_time, block)
+            part["dst"] = destinations[rng.integers(0, len(destinations), block)]
+            part["nslots"] = rng.integers(1, num_max_slots + 1, block)
+            part["size"] = rng.integers(1, 1001, block)
+            part["bitrate"] = np.asarray(bitrates)[rng.integers(0, len(bitrates), block)] if bitrates else 0
+            last_time[k] = part["time"][-1]
+            parts.append(part)
+
+        merged = np.concatenate(parts)
+        merged = merged[np.argsort(merged["time"], kind="stable")]
+        horizon = min(last_time)
+        ready = int(np.searchsorted(merged["time"], horizon, side="right"))
+        chunk, pending = merged[:ready], merged[ready:]
+
+        chunk = chunk[:num_requests - emitted]
+        done = until is not None and horizon >= until
+        if until is not None:
+            chunk = chunk[chunk["time"] < until]
+        chunk["id"] = np.arange(emitted, emitted + len(chunk))
+        chunk["flow_id"] = 0
+        emitted += len(chunk)
+        if len(chunk):
+            yield chunk
+        if done:
+            break
+
+
+def generate_trace(sources, node_range, num_requests, holding_time, load, num_max_slots=3, numberNodes=None, streams=None, until=None, bitrates=None) -> np.ndarray:
+    """
+    Gera o traço completo de pedidos de todas as fontes em memória (ver generate_trace_chunks).
+
+    Returns:
+        numpy.ndarray: Array estruturado com dtype TRACE_DTYPE, ordenado por tempo de chegada.
+    """
+    chunks = list(generate_trace_chunks(sources, node_range, num_requests, holding_time, load, num_max_slots,
+                                        numberNodes, streams, until, bitrates=bitrates))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=TRACE_DTYPE)
+
+
+def save_trace(path, trace):
+    """
+    Grava um traço em formato .npy colunar, que pode depois ser mapeado em memória.
+
+    Args:
+        path (str): Caminho do ficheiro.
+        trace: Array estruturado com dtype TRACE_DTYPE ou iterável de blocos (por exemplo, generate_trace_chunks),
+            gravados um a um sem juntar o traço em memória.
+
+    Returns:
+        int: Número de pedidos gravados.
+    """
+    if isinstance(trace, np.ndarray):
+        np.save(path, trace.astype(TRACE_DTYPE, copy=False))
+        return len(trace)
+
+    raw_path = str(path) + ".part"
+    count = 0
+    with open(raw_path, "wb") as raw:
+        for chunk in trace:
+            chunk.astype(TRACE_DTYPE, copy=False).tofile(raw)
+            count += len(chunk)
+
+    header = {"descr": np.lib.format.dtype_to_descr(TRACE_DTYPE), "fortran_order": False, "shape": (count,)}
+    with open(path, "wb") as f, open(raw_path, "rb") as raw:
+        np.lib.format.write_array_header_1_0(f, header)
+        shutil.copyfileobj(raw, f)
+    os.remove(raw_path)
+    return count
+
+
+def load_trace(path, mmap=True) -> np.ndarray:
+    """
+    Lê um traço gravado com save_trace.
+
+    Args:
+        path (str): Caminho do ficheiro .npy.
+        mmap (bool): Se verdadeiro, mapeia o ficheiro em memória em vez de o ler por inteiro.
+
+    Returns:
+        numpy.ndarray: Traço com dtype TRACE_DTYPE (numpy.memmap se mmap for verdadeiro).
+    """
+    trace = np.load(path, mmap_mode="r" if mmap else None)
+    if trace.dtype != TRACE_DTYPE and trace.dtype != LEGACY_TRACE_DTYPE:
+        raise ValueError(f"Formato de traço inválido em {path}: {trace.dtype}")
+    return trace
+
+
+def iter_requests(trace, chunk_size=65536):
+    """
+    Percorre um traço e cria os LightPathRequest à medida que são necessários.
+    Com um traço mapeado em memória, só o bloco corrente é lido do disco.
+
+    Args:
+        trace (numpy.ndarray): Array estruturado com dtype TRACE_DTYPE.
+        chunk_size (int): Número de registos convertidos de cada vez.
+
+    Yields:
+        LightPathRequest: O próximo pedido, por ordem de chegada.
+    """
+    for start in range(0, len(trace), chunk_size):
+        for fields in trace[start:start + chunk_size].tolist():
+            yield LightPathRequest(*fields)
+
+
+class TraceReplayer:
+    """
+    Processo SimPy único que reproduz um traço de pedidos.
+    Estabelece a variável membro "out" à entidade que receberá os pedidos.
+    """
+
+    def __init__(self, env: simpy.Environment, trace: np.ndarray):
+        """
+        Inicializa o reprodutor de traços.
+
+        Args:
+            env: O ambiente de simulação do SimPy.
+            trace: Array estruturado com dtype TRACE_DTYPE, ordenado por tempo de chegada.
+        """
+        self.env = env
+        self.trace = trace
+        self.out = None
+        self.action = env.process(self.run())
+
+    def run(self):
+        """
+        Entrega cada pedido ao destino no seu instante de chegada e sinaliza o fim do traço.
+        """
+        env = self.env
+        for p in iter_requests(self.trace):
+            yield env.timeout(p.time - env.now)
+            if self.out:
+                self.out.put(p)
+
+        # Sinaliza o fim dos pedidos do traço
+        if self.out:
+            self.out.put(None)
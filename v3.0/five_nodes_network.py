@@ -3,6 +3,9 @@ import simpy
 import time
 from components.light_path_control import Control
 from components.light_path_generator import LightPathGenerator
+from components import simulation
+from components.rsa import SPECTRUM_STRATEGIES
+from components.topology import load_topology
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
@@ -11,23 +14,19 @@ from rich.tree import Tree
 import matplotlib.pyplot as plt
 
 # Constantes
-NODES = [1, 2, 3, 4, 5]
-EDGES = [
-    (1, 2), (2, 1), (1, 4), (4, 1),
-    (2, 3), (3, 2), (2, 5), (5, 2),
-    (3, 5), (5, 3), (4, 5), (5, 4)
-]
-ALLOCATION_ALGORITHMS = {"0": "first_fit", "1": "best_gap"}
+TOPOLOGY_FILE = "five_nodes"  # topologies/five_nodes.json
+ALLOCATION_ALGORITHMS = {str(i): name for i, name in enumerate(SPECTRUM_STRATEGIES)}
 
 console = Console()
 
-def create_network():
-    """Cria o grafo da rede com 5 nós e arestas bidirecionais."""
-    G = nx.DiGraph()
+def create_network(show=True):
+    """Cria o grafo da rede com 5 nós e arestas bidirecionais (show=False dispensa a apresentação)."""
+    G = load_topology(TOPOLOGY_FILE).network
+    if not show:
+        return G
+
     console.print("[bold blue]Criação do grafo com 5 nós e arestas bidirecionais:[/bold blue]")
-    G.add_nodes_from(NODES)
-    G.add_edges_from(EDGES)
-    
+
     # Desenho do grafo
     tree = Tree("Rede Óptica")
     edge_id = 1
@@ -87,7 +86,7 @@ def collect_statistics(control):
         table.add_column("Tempo de Envio", justify="right", style="red")
         table.add_column("Duração", justify="right", style="yellow")
 
-        for pkt in control.pkt_sent:
+        for pkt in control.pkt_sent.values():
             table.add_row(
                 str(pkt.id),
                 str(pkt.src),
@@ -102,8 +101,8 @@ def collect_statistics(control):
 
 def analyze_performance(control):
     """Analisa o desempenho da simulação."""
-    total_requests = len(control.pkt_sent) + len(control.pkt_lost)
-    blocking_probability = len(control.pkt_lost) / total_requests if total_requests > 0 else 0
+    total_requests = control.accepted + control.blocked
+    blocking_probability = control.blocked / total_requests if total_requests > 0 else 0
     console.print(f"[bold blue]Taxa de Bloqueio: {blocking_probability:.2f}[/bold blue]")
 
 def get_simulation_parameters():
@@ -112,16 +111,41 @@ def get_simulation_parameters():
         duration = float(input('Duração(s) >> '))
         show_resources = input('Mostrar recursos (1 para True, 0 para False) >> ') == '1'
         load = float(input('Carga de tráfego (0.0 a 1.0) >> '))
+        options = ", ".join(f"{key} para {name}" for key, name in ALLOCATION_ALGORITHMS.items())
         allocation_algorithm = ALLOCATION_ALGORITHMS.get(
-            input('Algoritmo de alocação (0 para first_fit, 1 para best_gap) >> '), "first_fit"
+            input(f'Algoritmo de alocação ({options}) >> '), "first_fit"
         )
         return duration, show_resources, load, allocation_algorithm
     except ValueError:
         console.print("[bold red]Erro: Por favor, insira um valor válido para a duração![/bold red]")
         return None
 
+def default_config():
+    """Configuração por omissão da simulação de 5 nós em modo batch."""
+    return simulation.make_config()
+
+def run_simulation(config=None, trace=None):
+    """
+    Executa a simulação de 5 nós sem interação, renderização nem sincronização com o tempo real.
+
+    Args:
+        config (dict): Parâmetros a alterar em relação a default_config().
+        trace (numpy.ndarray): Traço de pedidos a reproduzir (por omissão, gerado a partir da configuração).
+
+    Returns:
+        dict: Resultados da simulação.
+    """
+    config = simulation.make_config(config, **default_config())
+    return simulation.run_simulation(create_network(show=False), config, node_range=range(1, 6), trace=trace)
+
 def main():
     """Função principal para configurar e executar a simulação."""
+    parser = simulation.build_arg_parser("Simulação da rede de 5 nós", default_config())
+    args = parser.parse_args()
+    if args.batch:
+        simulation.batch_main(args, create_network(show=False), default_config(), node_range=range(1, 6), parser=parser)
+        return
+
     # Criar o grafo da rede
     G = create_network()
 
@@ -143,12 +167,18 @@ def main():
     env.process(real_time_step(env, start_time))
 
     # Executar a simulação com Rich Live
-    with Live(console=console, refresh_per_second=1) as live:
-        while env.peek() < duration:
-            elapsed_sim_time = env.now
-            clock_panel = Panel(f"[bold cyan]Tempo Simulado: {elapsed_sim_time:.2f}s[/bold cyan]")
-            live.update(clock_panel)
-            env.step()
+    if ps.dashboard is not None:
+        # O painel de recursos é redesenhado pela sua própria thread, a taxa fixa
+        with ps.dashboard:
+            while env.peek() < duration:
+                env.step()
+    else:
+        with Live(console=console, refresh_per_second=1) as live:
+            while env.peek() < duration:
+                elapsed_sim_time = env.now
+                clock_panel = Panel(f"[bold cyan]Tempo Simulado: {elapsed_sim_time:.2f}s[/bold cyan]")
+                live.update(clock_panel)
+                env.step()
 
     console.print("[bold green]Simulação concluída.[/bold green]")
 
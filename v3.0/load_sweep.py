@@ -0,0 +1,127 @@
+"""
+Varrimento de carga para curvas de probabilidade de bloqueio.
+Executa a grelha cargas x algoritmos de alocação x replicações em paralelo (um processo por simulação independente)
+e agrega as replicações de cada ponto (carga, algoritmo) com um intervalo de confiança t.
+"""
+
+import argparse
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from rich.console import Console
+from rich.table import Table
+from replications import TOPOLOGIES, run_point, replication_configs, summarize
+
+console = Console()
+
+ALLOCATION_ALGORITHMS = ["first_fit", "best_gap"]
+
+
+def aggregate(results, alpha=0.05):
+    """
+    Agrega as replicações de cada ponto (carga, algoritmo).
+
+    Args:
+        results (list): Resultados devolvidos por run_point.
+        alpha (float): Nível de significância do intervalo de confiança.
+
+    Returns:
+        list: Uma linha por ponto com pedidos, bloqueados, probabilidade de bloqueio média e intervalo de confiança.
+    """
+    groups = {}
+    for r in results:
+        key = (r["config"]["load"], r["config"]["allocation_algorithm"])
+        groups.setdefault(key, []).append(r)
+
+    rows = []
+    for (load, algorithm), runs in sorted(groups.items()):
+        row = {"load": load, "allocation_algorithm": algorithm}
+        row.update(summarize(runs, alpha))
+        rows.append(row)
+    return rows
+
+
+def run_sweep(topology, loads, algorithms=ALLOCATION_ALGORITHMS, replications=1, config=None, seed=0, workers=None):
+    """
+    Executa o varrimento completo em paralelo.
+
+    Args:
+        topology (str): Nome da topologia (chave de TOPOLOGIES).
+        loads (list): Cargas a simular.
+        algorithms (list): Algoritmos de alocação a comparar.
+        replications (int): Número de replicações independentes de cada ponto.
+        config (dict): Parâmetros comuns a todas as simulações.
+        seed (int): Semente raiz.
+        workers (int): Número de processos (None usa todos os núcleos).
+
+    Returns:
+        list: Linhas agregadas por (carga, algoritmo).
+    """
+    points = []
+    for load, algorithm in product(loads, algorithms):
+        point = dict(config or {})
+        point.update(load=load, allocation_algorithm=algorithm)
+        points.extend(replication_configs(point, replications, seed))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_point, [topology] * len(points), points))
+    return aggregate(results)
+
+
+def print_sweep(rows):
+    """Apresenta a tabela de probabilidade de bloqueio por carga e algoritmo."""
+    table = Table(title="Probabilidade de Bloqueio vs. Carga")
+    table.add_column("Carga", justify="right", style="cyan")
+    table.add_column("Algoritmo", justify="left", style="magenta")
+    table.add_column("Replicações", justify="right")
+    table.add_column("Pedidos", justify="right")
+    table.add_column("Bloqueados", justify="right")
+    table.add_column("Taxa de Bloqueio", justify="right", style="green")
+    table.add_column("Intervalo de Confiança", justify="right", style="yellow")
+    for row in rows:
+        table.add_row(
+            f"{row['load']:g}",
+            row["allocation_algorithm"],
+            str(row["replications"]),
+            str(row["requests"]),
+            str(row["blocked"]),
+            f"{row['blocking_probability']:.4f}",
+            f"[{row['ic_low']:.4f}, {row['ic_high']:.4f}]"
+        )
+    console.print(table)
+
+
+def write_csv(rows, path):
+    """Grava as linhas agregadas num ficheiro CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    """Lê os parâmetros da linha de comandos e executa o varrimento."""
+    parser = argparse.ArgumentParser(description="Varrimento de carga em paralelo")
+    parser.add_argument("--topology", choices=sorted(TOPOLOGIES), default="nsfnet")
+    parser.add_argument("--loads", type=float, nargs="+", required=True, help="cargas a simular")
+    parser.add_argument("--algorithms", nargs="+", default=ALLOCATION_ALGORITHMS, help="algoritmos de alocação")
+    parser.add_argument("--routing", default=None, help="estratégia de encaminhamento")
+    parser.add_argument("--replications", type=int, default=1, help="número de replicações por ponto")
+    parser.add_argument("--seed", type=int, default=0, help="semente raiz")
+    parser.add_argument("--workers", type=int, default=None, help="número de processos (por omissão, todos os núcleos)")
+    parser.add_argument("--duration", type=float, default=None, help="duração da simulação (s)")
+    parser.add_argument("--holding-time", dest="holding_time", type=float, default=None, help="duração média dos lightpaths (s)")
+    parser.add_argument("--requests", dest="num_max_pet", type=int, default=None, help="número máximo de pedidos")
+    parser.add_argument("--csv", default=None, help="ficheiro CSV de saída")
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in ("duration", "holding_time", "num_max_pet", "routing") if getattr(args, key) is not None}
+    rows = run_sweep(args.topology, args.loads, args.algorithms, args.replications, config, args.seed, args.workers)
+    print_sweep(rows)
+    if args.csv:
+        write_csv(rows, args.csv)
+        console.print(f"[bold green]Resultados gravados em {args.csv}[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import networkx as nx
 import simpy
 import time
-from statsmodels.stats.proportion import proportion_confint
 from components.light_path_control import Control
 from components.light_path_generator import LightPathGenerator
+from components import simulation
+from components.rsa import SPECTRUM_STRATEGIES
+from components.topology import load_topology
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
@@ -23,15 +25,17 @@ LOAD = 0.1                  # Carga da rede
 NUM_MAX_SLOTS = 24          # Número máximo de slots por conexão
 NUM_MAX_PET = 1000          # Número máximo de pacotes por conexão
 NUM_ELIM = 100              # Número de elementos a serem eliminados da lista TASA_BLOQ
+TOPOLOGY_FILE = "nsfnet"        # topologies/nsfnet.json (ligações e comprimentos em km)
+ALLOCATION_ALGORITHMS = {str(i): name for i, name in enumerate(SPECTRUM_STRATEGIES)}
+
+def create_network(show=True):
+    """Cria o grafo da rede NSFNET com 14 nós e arestas bidirecionais (show=False dispensa a apresentação)."""
+    G = load_topology(TOPOLOGY_FILE).network
+    if not show:
+        return G
 
-def create_network():
-    """Cria o grafo da rede NSFNET com 14 nós e arestas bidirecionais."""
-    G = nx.DiGraph()
     console.print("[bold blue]Criação do grafo NSFNET com 14 nós e arestas bidirecionais:[/bold blue]")
-    G.add_nodes_from(range(14))  # Nós de 0 a 13
-    edges = [(0,1), (0,2), (0,7), (1,0), (1,2), (1,3), (2,0), (2,1), (2,5), (3,1), (3,4), (3,10), (4,3), (4,5), (4,6), (5,2), (5,4), (5,9), (5,13), (6,4), (6,7), (7,0), (7,6), (7,8), (8,7), (8,9), (8,11), (8,12), (9,5), (9,8), (10,3), (10,11), (10,12), (11,8), (11,10), (11,13), (12,8), (12,10), (12,13), (13,5), (13,11), (13,12)]
-    G.add_edges_from(edges)
-    
+
     # Desenho do grafo
     tree = Tree("Rede Óptica NSFNET")
     edge_id = 1
@@ -56,7 +60,7 @@ def visualize_network(G):
 
 def setup_simulation(env, G, duration, show_resources, load, allocation_algorithm):
     """Configura a simulação com geradores de lightpaths e controlador."""
-    ps = Control(env, G, debug=True, tab=show_resources, allocation_algorithm=allocation_algorithm)  # Habilitar a depuração para uma saída simples
+    ps = Control(env, G, debug=True, tab=show_resources, allocation_algorithm=allocation_algorithm, num_slots=SLOTS_NUMBER, num_txrx=TXRX_NUMBER)  # Habilitar a depuração para uma saída simples
     console.print("[bold blue]Controlador criado e inicializado.[/bold blue]")
 
     # Criar os geradores de lightpaths
@@ -92,7 +96,7 @@ def collect_statistics(control):
         table.add_column("Duração", justify="right", style="yellow")
         table.add_column("Caminho", justify="right", style="white")
 
-        for pkt in control.pkt_sent:
+        for pkt in control.pkt_sent.values():
             table.add_row(
                 str(pkt.id),
                 str(pkt.src),
@@ -108,21 +112,38 @@ def collect_statistics(control):
 
 def analyze_performance(control):
     """Analisa o desempenho da simulação."""
-    total_requests = len(control.pkt_sent) + len(control.pkt_lost)
-    blocking_probability = len(control.pkt_lost) / total_requests if total_requests > 0 else 0
+    total_requests = control.accepted + control.blocked
+    blocking_probability = control.blocked / total_requests if total_requests > 0 else 0
     console.print(f"[bold blue]Taxa de Bloqueio: {blocking_probability:.2f}[/bold blue]")
+    console.print("[bold blue]Para um intervalo de confiança, execute replicações independentes com replications.py.[/bold blue]")
 
-    # Calcular intervalo de confiança
-    count = control.pkt_lost.count(1)
-    nobs = total_requests
-    if nobs > 0:
-        ic = proportion_confint(count, nobs, alpha=0.05, method='normal')
-        console.print(f"[bold blue]Intervalo de Confiança: {ic}[/bold blue]")
-    else:
-        console.print("[bold red]Nenhuma observação disponível para calcular a proporção.[/bold red]")
+def default_config():
+    """Configuração por omissão da simulação NSFNET em modo batch."""
+    return simulation.make_config(duration=DURATION, load=LOAD, num_slots=SLOTS_NUMBER, num_txrx=TXRX_NUMBER,
+                                  num_max_pet=NUM_MAX_PET, num_max_slots=NUM_MAX_SLOTS)
+
+def run_simulation(config=None, trace=None):
+    """
+    Executa a simulação NSFNET sem interação, renderização nem sincronização com o tempo real.
+
+    Args:
+        config (dict): Parâmetros a alterar em relação a default_config().
+        trace (numpy.ndarray): Traço de pedidos a reproduzir (por omissão, gerado a partir da configuração).
+
+    Returns:
+        dict: Resultados da simulação.
+    """
+    config = simulation.make_config(config, **default_config())
+    return simulation.run_simulation(create_network(show=False), config, trace=trace)
 
 def main():
     """Função principal para configurar e executar a simulação."""
+    parser = simulation.build_arg_parser("Simulação da rede NSFNET", default_config())
+    args = parser.parse_args()
+    if args.batch:
+        simulation.batch_main(args, create_network(show=False), default_config(), parser=parser)
+        return
+
     # Criar o grafo da rede
     G = create_network()
 
@@ -136,11 +157,10 @@ def main():
         show_resources_input = input('Mostrar recursos (1 para True, 0 para False) >> ')
         show_resources = show_resources_input == '1'    
         load = float(input('Carga de tráfego (0.0 a 1.0) >> '))
-        allocation_algorithm_input = input('Algoritmo de alocação (0 para first_fit, 1 para best_gap) >> ')
-        if allocation_algorithm_input == '0':
-            allocation_algorithm = "first_fit"
-        elif allocation_algorithm_input == '1':
-            allocation_algorithm = "best_gap"
+        options = ", ".join(f"{key} para {name}" for key, name in ALLOCATION_ALGORITHMS.items())
+        allocation_algorithm_input = input(f'Algoritmo de alocação ({options}) >> ')
+        if allocation_algorithm_input in ALLOCATION_ALGORITHMS:
+            allocation_algorithm = ALLOCATION_ALGORITHMS[allocation_algorithm_input]
         else:
             console.print("[bold red]Erro: Inserido um valor inválido! first_fit assumido como algoritmo padrão[/bold red]")
             allocation_algorithm = "first_fit"
@@ -156,12 +176,18 @@ def main():
     env.process(real_time_step(env, start_time))
 
     # Executar a simulação com Rich Live
-    with Live(console=console, refresh_per_second=1) as live:
-        while env.peek() < duration:
-            elapsed_sim_time = env.now
-            clock_panel = Panel(f"[bold cyan]Tempo Simulado: {elapsed_sim_time:.2f}s[/bold cyan]")
-            live.update(clock_panel)
-            env.step()
+    if ps.dashboard is not None:
+        # O painel de recursos é redesenhado pela sua própria thread, a taxa fixa
+        with ps.dashboard:
+            while env.peek() < duration:
+                env.step()
+    else:
+        with Live(console=console, refresh_per_second=1) as live:
+            while env.peek() < duration:
+                elapsed_sim_time = env.now
+                clock_panel = Panel(f"[bold cyan]Tempo Simulado: {elapsed_sim_time:.2f}s[/bold cyan]")
+                live.update(clock_panel)
+                env.step()
 
     console.print("[bold green]Simulação concluída.[/bold green]")
 
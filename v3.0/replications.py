@@ -0,0 +1,145 @@
+"""
+Replicações independentes de uma simulação.
+Cada replicação usa fluxos aleatórios derivados da mesma semente por SeedSequence, as replicações correm em paralelo
+e a probabilidade de bloqueio é reportada como média com intervalo de confiança t de Student.
+"""
+
+import argparse
+import importlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy import stats
+from rich.console import Console
+
+console = Console()
+
+# Topologias disponíveis e o módulo que expõe run_simulation(config)
+TOPOLOGIES = {"nsfnet": "nsfnet_network", "five_nodes": "five_nodes_network"}
+
+
+def run_point(topology, config):
+    """
+    Executa uma simulação (função de topo para poder ser enviada aos processos).
+
+    Args:
+        topology (str): Nome da topologia (chave de TOPOLOGIES).
+        config (dict): Parâmetros da simulação, incluindo "seed" e "replication".
+
+    Returns:
+        dict: Resultados da simulação.
+    """
+    module = importlib.import_module(TOPOLOGIES[topology])
+    return module.run_simulation(config)
+
+
+def t_confidence_interval(values, alpha=0.05):
+    """
+    Calcula a média e o intervalo de confiança t de Student de uma amostra de replicações.
+
+    Args:
+        values (list): Valores observados em cada replicação.
+        alpha (float): Nível de significância.
+
+    Returns:
+        tuple: (média, limite inferior, limite superior). Com menos de duas replicações o intervalo reduz-se à média.
+    """
+    values = np.asarray(values, dtype=float)
+    mean = float(values.mean()) if values.size else 0.0
+    if values.size < 2:
+        return mean, mean, mean
+    half_width = float(stats.t.ppf(1 - alpha / 2, values.size - 1) * values.std(ddof=1) / np.sqrt(values.size))
+    return mean, mean - half_width, mean + half_width
+
+
+def summarize(results, alpha=0.05):
+    """
+    Resume um conjunto de replicações do mesmo ponto.
+
+    Args:
+        results (list): Resultados de cada replicação.
+        alpha (float): Nível de significância.
+
+    Returns:
+        dict: Número de replicações, pedidos, bloqueados e probabilidade de bloqueio média com intervalo t.
+    """
+    mean, ic_low, ic_high = t_confidence_interval([r["blocking_probability"] for r in results], alpha)
+    return {
+        "replications": len(results),
+        "requests": sum(r["requests"] for r in results),
+        "blocked": sum(r["blocked"] for r in results),
+        "blocking_probability": mean,
+        "ic_low": ic_low,
+        "ic_high": ic_high,
+    }
+
+
+def replication_configs(config, replications, seed=0):
+    """
+    Gera as configurações das replicações independentes de um ponto.
+
+    Args:
+        config (dict): Parâmetros comuns.
+        replications (int): Número de replicações.
+        seed (int): Semente raiz partilhada; cada replicação usa um fluxo derivado diferente.
+
+    Returns:
+        list: Uma configuração por replicação.
+    """
+    configs = []
+    for r in range(replications):
+        point = dict(config or {})
+        point.update(seed=seed, replication=r)
+        configs.append(point)
+    return configs
+
+
+def run_replications(topology, replications, config=None, seed=0, workers=None, alpha=0.05):
+    """
+    Executa N replicações independentes em paralelo.
+
+    Args:
+        topology (str): Nome da topologia.
+        replications (int): Número de replicações.
+        config (dict): Parâmetros da simulação.
+        seed (int): Semente raiz.
+        workers (int): Número de processos (None usa todos os núcleos).
+        alpha (float): Nível de significância.
+
+    Returns:
+        dict: Resumo das replicações (ver summarize).
+    """
+    configs = replication_configs(config, replications, seed)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_point, [topology] * len(configs), configs))
+    return summarize(results, alpha)
+
+
+def main():
+    """Lê os parâmetros da linha de comandos e executa as replicações."""
+    parser = argparse.ArgumentParser(description="Replicações independentes com intervalo de confiança t")
+    parser.add_argument("--topology", choices=sorted(TOPOLOGIES), default="nsfnet")
+    parser.add_argument("--replications", type=int, default=10, help="número de replicações")
+    parser.add_argument("--seed", type=int, default=0, help="semente raiz")
+    parser.add_argument("--workers", type=int, default=None, help="número de processos (por omissão, todos os núcleos)")
+    parser.add_argument("--load", type=float, default=None, help="carga de tráfego")
+    parser.add_argument("--algorithm", dest="allocation_algorithm", default=None, help="algoritmo de alocação")
+    parser.add_argument("--duration", type=float, default=None, help="duração da simulação (s)")
+    parser.add_argument("--holding-time", dest="holding_time", type=float, default=None, help="duração média dos lightpaths (s)")
+    parser.add_argument("--requests", dest="num_max_pet", type=int, default=None, help="número máximo de pedidos")
+    parser.add_argument("--json", action="store_true", help="imprime o resumo em JSON")
+    args = parser.parse_args()
+
+    keys = ("load", "allocation_algorithm", "duration", "holding_time", "num_max_pet")
+    config = {key: getattr(args, key) for key in keys if getattr(args, key) is not None}
+    summary = run_replications(args.topology, args.replications, config, args.seed, args.workers)
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        console.print(f"[bold blue]Taxa de Bloqueio: {summary['blocking_probability']:.4f} "
+                      f"(IC 95%: [{summary['ic_low']:.4f}, {summary['ic_high']:.4f}], "
+                      f"{summary['replications']} replicações)[/bold blue]")
+
+
+if __name__ == "__main__":
+    main()
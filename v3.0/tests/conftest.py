@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Os testes importam o pacote components a partir da raiz da v3.0
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.fast_kernel import Clock  # noqa: E402
+from components.light_path_control import Control  # noqa: E402
+from components.topology import load_topology  # noqa: E402
+
+
+@pytest.fixture
+def make_control():
+    """Fábrica de controladores silenciosos sobre a topologia five_nodes, com 10 slots por fibra."""
+    def make(**kwargs):
+        options = dict(debug=True, tab=False, verbose=False, num_slots=10)
+        options.update(kwargs)
+        return Control(Clock(), load_topology("five_nodes"), **options)
+    return make
@@ -0,0 +1,73 @@
+import numpy as np
+
+from components.light_path_request import LightPathRequest
+
+
+def occupy(control, widths):
+    """Ocupa a fibra 1 -> 2 com lightpaths lado a lado; os de índice par expiram em t = 1, os ímpares ficam."""
+    requests = []
+    for i, n in enumerate(widths):
+        pkt = LightPathRequest(i, 1, 2, 0.0, duration=1.0 if i % 2 == 0 else 100.0, nslots=n)
+        control.put(pkt)
+        requests.append(pkt)
+    control.env.now = 2.0
+    return requests
+
+
+def test_blocking_defrag_moves_only_what_the_request_needs(make_control):
+    control = make_control(defragmentation="blocking")
+    _, kept, _ = occupy(control, [3, 3, 3])
+    pkt = LightPathRequest(9, 1, 2, 2.0, duration=1.0, nslots=5)
+    control.put(pkt)
+    assert control.blocked == 0
+    assert kept.slot_used[1] == 0
+    assert pkt.slot_used[1] == 3
+    assert control.defragmenter.report()["moves"] == 1
+
+
+class CountingRng:
+    """Gerador que conta as escolhas feitas pelo random fit."""
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.draws = 0
+
+    def integers(self, *args, **kwargs):
+        self.draws += 1
+        return self.rng.integers(*args, **kwargs)
+
+
+def test_blocking_defrag_dry_run_does_not_consume_the_random_fit_rng(make_control):
+    rng = CountingRng()
+    control = make_control(defragmentation="blocking", allocation_algorithm="random_fit", rng=rng)
+    occupy(control, [3, 3, 3])
+    assert rng.draws == 3
+    control.put(LightPathRequest(9, 1, 2, 2.0, duration=1.0, nslots=5))
+    assert control.blocked == 0 and control.defragmenter.report()["moves"] == 1
+    assert rng.draws == 4  # Apenas a alocação real depois da compactação
+
+
+def test_blocking_defrag_skips_when_no_fiber_has_enough_free_slots(make_control):
+    control = make_control(defragmentation="blocking")
+    _, b, _, d = occupy(control, [3, 3, 1, 3])
+    control.put(LightPathRequest(9, 1, 2, 2.0, duration=1.0, nslots=5))
+    report = control.defragmenter.report()
+    assert control.blocked == 1
+    assert (report["moves"], report["skipped"]) == (0, 1)
+    assert (b.slot_used[1], d.slot_used[1]) == (3, 7)
+
+
+def test_blocking_defrag_moves_nothing_when_max_moves_is_not_enough(make_control):
+    control = make_control(defragmentation="blocking", defrag_max_moves=1)
+    _, b, _, d, _ = occupy(control, [2, 2, 2, 2, 2])
+    control.put(LightPathRequest(9, 1, 2, 2.0, duration=1.0, nslots=6))
+    report = control.defragmenter.report()
+    assert control.blocked == 1
+    assert (report["runs"], report["moves"], report["recovered"]) == (1, 0, 0)
+    assert (b.slot_used[1], d.slot_used[1]) == (2, 6)
+
+    control.defragmenter.max_moves = 2
+    control.put(LightPathRequest(10, 1, 2, 2.0, duration=1.0, nslots=6))
+    assert control.blocked == 1
+    assert (b.slot_used[1], d.slot_used[1]) == (0, 2)
+    assert control.defragmenter.report()["moves"] == 2
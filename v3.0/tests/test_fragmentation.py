@@ -0,0 +1,78 @@
+import math
+import random
+
+import pytest
+
+from components.spectrum import SpectrumGrid
+from components.spectrum_search import runs_from_mask
+
+
+def recompute_fiber(mask, num_slots):
+    """Métricas de uma fibra recalculadas de raiz a partir dos blocos livres da máscara."""
+    lengths = [length for _, length in runs_from_mask(mask)]
+    free = sum(lengths)
+    largest = max(lengths, default=0)
+    return {
+        "external_fragmentation": 1.0 - largest / free if free else 0.0,
+        "entropy": -sum(l / num_slots * math.log(l / num_slots) for l in lengths),
+        "largest_block": largest,
+        "free_blocks": len(lengths),
+        "free_slots": free,
+    }
+
+
+def recompute_network(masks, num_slots):
+    fibers = [recompute_fiber(mask, num_slots) for mask in masks]
+    F = len(fibers)
+    return {
+        "external_fragmentation": sum(m["external_fragmentation"] for m in fibers) / F,
+        "entropy": sum(m["entropy"] for m in fibers) / F,
+        "largest_block": max(m["largest_block"] for m in fibers),
+        "free_blocks": sum(m["free_blocks"] for m in fibers) / F,
+        "free_slots": sum(m["free_slots"] for m in fibers),
+    }
+
+
+def assert_metrics(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, abs=1e-9), key
+
+
+@pytest.mark.parametrize("num_slots", [1, 10, 80, 320])
+def test_tracker_matches_recomputation(num_slots):
+    rng = random.Random(num_slots)
+    num_fibers = 4
+    grid = SpectrumGrid(num_fibers, num_slots, fragmentation=True)
+    tracker = grid.fragmentation
+    allocated = []
+    for step in range(2000):
+        if allocated and rng.random() < 0.45:
+            grid.release(*allocated.pop(rng.randrange(len(allocated))))
+        else:
+            index = tuple(sorted(rng.sample(range(num_fibers), rng.randint(1, num_fibers))))
+            n = rng.randint(1, max(1, num_slots // 8))
+            start = grid.fit(index, n, rng.choice(["first_fit", "best_fit", "last_fit"]))
+            if start < 0:
+                continue
+            grid.allocate(index, start, n)
+            allocated.append((index, start, n))
+        for i in range(num_fibers):
+            assert_metrics(tracker.fiber(i), recompute_fiber(grid.masks[i], num_slots))
+        assert_metrics(tracker.network(), recompute_network(grid.masks, num_slots))
+
+    grid.reset()
+    assert_metrics(tracker.network(), recompute_network(grid.masks, num_slots))
+
+
+def test_summary_separates_blocked_samples():
+    grid = SpectrumGrid(2, 10, fragmentation=True)
+    tracker = grid.fragmentation
+    tracker.observe()
+    grid.allocate((0,), 2, 3)
+    tracker.observe(blocked=True)
+    summary = tracker.summary()
+    blocked = recompute_network(grid.masks, 10)
+    assert summary["at_blocking"]["external_fragmentation"] == pytest.approx(blocked["external_fragmentation"])
+    assert summary["mean"]["external_fragmentation"] == pytest.approx(blocked["external_fragmentation"] / 2)
+    assert summary["mean"]["free_blocks"] == pytest.approx((1 + blocked["free_blocks"]) / 2)
@@ -0,0 +1,56 @@
+import pytest
+
+from components.light_path_request import LightPathRequest
+
+
+@pytest.mark.parametrize("block_index", [False, True])
+@pytest.mark.parametrize("allocation_algorithm", ["first_fit", "best_gap", "last_fit", "exact_fit", "random_fit"])
+def test_guard_band_not_required_at_spectrum_edge(make_control, block_index, allocation_algorithm):
+    control = make_control(guard_band=2, block_index=block_index, allocation_algorithm=allocation_algorithm)
+    # n = S - G + 1: só cabe se a guarda não for reservada para lá do último slot
+    disp, slot_used, path = control.allocate(1, 2, 9)
+    assert disp
+    index, start, n = slot_used
+    assert n == 11 and start + 9 <= 10  # Os 9 slots do pedido ficam dentro do espectro
+    assert control.slots.masks[index[0]] == (1 << start) - 1
+    assert control.slots.used[index[0]] == 10 - start
+
+    control.slots.release(*slot_used)
+    assert control.slots.masks[index[0]] == control.slots.full
+    assert control.slots.used[index[0]] == 0
+    assert control.allocate(1, 2, 10)[0] is True  # O espectro todo, sem guarda
+
+
+def test_guard_band_still_separates_neighbours(make_control):
+    control = make_control(guard_band=2)
+    disp, first, _ = control.allocate(1, 2, 3)
+    assert disp and first[1:] == (0, 5)
+    disp, second, _ = control.allocate(1, 2, 5)
+    assert disp and second[1:] == (5, 7)
+    assert control.slots.masks[first[0][0]] == 0
+    assert not control.allocate(1, 2, 1)[0]
+
+
+def test_put_keeps_requested_width_at_spectrum_edge(make_control):
+    control = make_control(guard_band=2)
+    pkt = LightPathRequest(0, 1, 2, 0.0, duration=1.0, nslots=9)
+    control.put(pkt)
+    assert control.accepted == 1
+    assert pkt.nslots == 9
+
+    control.env.now = 2.0
+    control.remove(control.env.now)
+    assert control.slots.masks == [control.slots.full] * control.slots.num_fibers
+
+
+def test_largest_block_ranks_paths_by_free_block_before_length(make_control):
+    control = make_control(routing="largest_block")
+    assert control.slots.fragmentation is not None and not control.fragmentation
+    shortest = control.routing.routes(1, 2)[0]
+    control.slots.allocate(shortest[1], 0, 8)
+    candidates = control.rsa.routing.candidates(control.routing, control.slots, 1, 2)
+    assert candidates[-1] == shortest
+    assert candidates[:-1] == control.routing.routes(1, 2)[1:]  # Empates: ordem dos k caminhos mais curtos
+
+    disp, _, path = control.allocate(1, 2, 2)
+    assert disp and path != shortest[0]
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from components.spectrum import FreeBlockIndex, SpectrumGrid
+
+
+def scan_blocks(mask, num_slots):
+    """Blocos livres (início, comprimento) por varrimento linear da máscara, slot a slot."""
+    blocks, start = [], None
+    for s in range(num_slots + 1):
+        free = s < num_slots and (mask >> s) & 1
+        if free and start is None:
+            start = s
+        elif not free and start is not None:
+            blocks.append((start, s - start))
+            start = None
+    return blocks
+
+
+def scan_first_fit(mask, num_slots, n):
+    return next((start for start, length in scan_blocks(mask, num_slots) if length >= n), -1)
+
+
+def scan_best_fit(mask, num_slots, n):
+    fits = [(length, start) for start, length in scan_blocks(mask, num_slots) if length >= n]
+    return min(fits)[1] if fits else -1
+
+
+@pytest.mark.parametrize("num_slots", [1, 10, 64, 80, 320])
+def test_free_block_index_matches_linear_scan(num_slots):
+    rng = random.Random(num_slots)
+    full = (1 << num_slots) - 1
+    mask = full
+    index = FreeBlockIndex(num_slots, mask)
+    allocated = []
+    for _ in range(2000):
+        if allocated and (rng.random() < 0.45 or mask == 0):
+            start, n = allocated.pop(rng.randrange(len(allocated)))
+            index.release(start, n)
+            mask |= ((1 << n) - 1) << start
+        else:
+            start, length = rng.choice(scan_blocks(mask, num_slots))
+            n = rng.randint(1, length)
+            start += rng.randint(0, length - n)
+            index.allocate(start, n)
+            mask &= ~(((1 << n) - 1) << start)
+            allocated.append((start, n))
+
+        blocks = scan_blocks(mask, num_slots)
+        assert index.blocks() == blocks
+        assert index.largest == max((length for _, length in blocks), default=0)
+        largest = index.largest
+        for n in {1, 2, max(1, largest), largest + 1, rng.randint(1, num_slots)}:
+            assert index.first_fit(n) == scan_first_fit(mask, num_slots, n)
+            assert index.best_fit(n) == scan_best_fit(mask, num_slots, n)
+
+
+def test_free_block_index_rebuild():
+    rng = random.Random(1)
+    for _ in range(200):
+        mask = rng.getrandbits(80)
+        index = FreeBlockIndex(80, mask)
+        assert index.blocks() == scan_blocks(mask, 80)
+        index.rebuild((1 << 80) - 1)
+        assert index.blocks() == [(0, 80)]
+
+
+def test_indexed_grid_matches_plain_grid():
+    rng = random.Random(7)
+    plain = SpectrumGrid(4, 40)
+    indexed = SpectrumGrid(4, 40, indexed=True)
+    active = []
+    for _ in range(1000):
+        fiber = (rng.randrange(4),)
+        if active and rng.random() < 0.4:
+            args = active.pop(rng.randrange(len(active)))
+            plain.release(*args)
+            indexed.release(*args)
+        else:
+            n = rng.randint(1, 6)
+            for policy in ("first_fit", "best_fit"):
+                assert indexed.fit(fiber, n, policy) == plain.fit(fiber, n, policy)
+            start = plain.fit(fiber, n, "first_fit")
+            if start >= 0:
+                plain.allocate(fiber, start, n)
+                indexed.allocate(fiber, start, n)
+                active.append((fiber, start, n))
+        assert indexed.masks == plain.masks
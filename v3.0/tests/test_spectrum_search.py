@@ -0,0 +1,29 @@
+import random
+
+import numpy as np
+import pytest
+
+from components.spectrum_search import POLICIES, fit_mask, fit_slots, runs_from_mask, runs_from_slots, search, search_all
+
+
+@pytest.mark.parametrize("num_slots", [1, 10, 80, 320])
+def test_mask_and_list_searches_match_search_over_runs(num_slots):
+    rng = random.Random(num_slots)
+    for _ in range(300):
+        free = [s for s in range(num_slots) if rng.random() < 0.6]
+        mask = sum(1 << s for s in free)
+        runs = runs_from_mask(mask)
+        assert runs_from_slots(free) == runs
+        for n in {1, 2, 3, rng.randint(1, num_slots)}:
+            expected = {p: search(runs, n, p, np.random.default_rng(7)) for p in POLICIES}
+            for policy in POLICIES:
+                assert fit_mask(mask, n, policy, np.random.default_rng(7)) == expected[policy]
+                assert fit_slots(free[::-1], n, policy, np.random.default_rng(7)) == expected[policy]
+            assert search_all(mask, n, np.random.default_rng(7)) == expected
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        fit_mask(0b111, 2, "worst_fit")
+    with pytest.raises(ValueError):
+        fit_mask(0, 2, "worst_fit")
@@ -0,0 +1,27 @@
+import networkx as nx
+import pytest
+
+from components.topology import Topology, load_topology
+
+
+@pytest.mark.parametrize("name", ["five_nodes", "nsfnet"])
+def test_csr_resolves_every_edge_in_both_directions(name):
+    topology = load_topology(name)
+    for i, (u, v) in enumerate(topology.edges):
+        a, b = topology.node_index[u], topology.node_index[v]
+        assert topology.edge(a, b) == i
+        assert topology.path_edges([u, v]) == [i]
+        if not topology.network.is_directed():
+            assert topology.edge(b, a) == i
+    for i in range(topology.num_nodes):
+        assert list(topology.neighbors(i)) == sorted(topology.neighbors(i))
+        assert len(topology.out_edges(i)) == len(topology.neighbors(i))
+
+
+def test_path_edges_rejects_missing_fiber():
+    G = nx.DiGraph()
+    G.add_edges_from([(1, 2), (2, 3)])
+    topology = Topology(G)
+    assert topology.path_edges([1, 2, 3]) == [0, 1]
+    with pytest.raises(KeyError):
+        topology.path_edges([3, 2])
@@ -1,5 +1,9 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import simpy
-from dash import Dash, html, dcc
+from dash import Dash, Patch, html, dcc, callback_context, no_update
 from dash.dependencies import Input, Output, State
 import networkx as nx
 import numpy as np
@@ -70,14 +74,122 @@ class PacketGenerator:
                 self.log(f"Pacote perdido: {src} -> {dst} (recursos insuficientes)")
 
 # --- Simulação ---
-def run_simulation(duration):
+def run_simulation(duration, logs=None, progress=None, steps=100):
+    """
+    Executa a simulação por etapas, para que o progresso possa ser acompanhado.
+
+    Args:
+        duration (float): Duração da simulação.
+        logs (list): Lista onde os logs são acrescentados (por omissão, uma nova).
+        progress (callable): Função chamada com a fração concluída (0 a 1) no fim de cada etapa.
+        steps (int): Número de etapas em que a simulação é dividida.
+    """
     env = simpy.Environment()
     network = Network()
-    logs = []  # Lista para armazenar os logs da simulação
+    logs = logs if logs is not None else []  # Lista para armazenar os logs da simulação
     PacketGenerator(env, network, logs, load=0.7)
-    env.run(until=duration)
+    for i in range(1, steps + 1):
+        env.run(until=duration * i / steps)
+        if progress:
+            progress(i / steps)
     return network, logs
 
+# --- Execução em segundo plano ---
+MAX_LOG_LINES = 500  # Linhas de log mantidas na página (as mais antigas são removidas)
+JOB_TTL = 60.0       # Segundos sem sondagem ao fim dos quais uma simulação é cancelada e esquecida (separador fechado)
+
+class JobCancelled(Exception):
+    """Interrompe uma simulação cancelada."""
+
+class SimulationJob:
+    """Estado de uma simulação submetida ao JobRunner."""
+    def __init__(self, duration):
+        self.id = uuid.uuid4().hex
+        self.duration = duration
+        self.status = "pendente"  # pendente, a correr, concluída ou erro
+        self.progress = 0.0
+        self.logs = []  # Só é acrescentada pela thread da simulação
+        self.network = None
+        self.error = None
+        self.cancelled = False
+        self.last_seen = time.monotonic()  # Última sondagem da página que submeteu a simulação
+
+    def run(self):
+        if self.cancelled:
+            self.status = "cancelada"
+            return
+        self.status = "a correr"
+        try:
+            self.network, _ = run_simulation(self.duration, self.logs, self.set_progress)
+            self.status = "concluída"
+        except JobCancelled:
+            self.status = "cancelada"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "erro"
+
+    def set_progress(self, value):
+        # Chamado no fim de cada etapa: é aqui que um cancelamento interrompe a simulação
+        if self.cancelled:
+            raise JobCancelled()
+        self.progress = value
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def done(self):
+        return self.status in ("concluída", "erro", "cancelada")
+
+class JobRunner:
+    """Executa as simulações numa pool de threads, fora dos pedidos HTTP, identificadas por um job ID."""
+    def __init__(self, max_workers=2):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, duration, previous=None):
+        """
+        Submete uma simulação e devolve o seu job ID.
+
+        Args:
+            duration (float): Duração da simulação.
+            previous (str): Job ID da simulação anterior da mesma página, que é cancelada e esquecida.
+        """
+        if previous:
+            self.discard(previous)
+        self.evict()
+        job = SimulationJob(duration)
+        with self.lock:
+            self.jobs[job.id] = job
+        self.pool.submit(job.run)
+        return job.id
+
+    def get(self, job_id):
+        """Devolve a simulação e regista a sondagem (as simulações sem sondagem acabam por ser esquecidas)."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            job.last_seen = time.monotonic()
+        return job
+
+    def discard(self, job_id):
+        """Cancela (se ainda estiver a correr) e esquece uma simulação."""
+        with self.lock:
+            job = self.jobs.pop(job_id, None)
+        if job is not None:
+            job.cancel()
+
+    def evict(self, ttl=JOB_TTL):
+        """Cancela e esquece as simulações que nenhuma página sonda há mais de ttl segundos."""
+        now = time.monotonic()
+        with self.lock:
+            stale = [job_id for job_id, job in self.jobs.items() if now - job.last_seen > ttl]
+        for job_id in stale:
+            self.discard(job_id)
+
+runner = JobRunner()
+
 # --- Interface com Dash ---
 app = Dash(__name__)
 app.title = "Desenvolvimento e Teste de Simulador de Redes Ópticas Elásticas com Python"
@@ -99,10 +211,12 @@ app.layout = html.Div([
         html.Div([
             html.Div([
                 html.H3("Logs da Simulação", style={'color': '#808184'}),
-                dcc.Textarea(
+                # Uma linha por filho: as novas linhas são acrescentadas com Patch, sem reenviar as anteriores
+                html.Div(
                     id='log-output',
-                    style={'width': '100%', 'height': '400px', 'backgroundColor': '#333333', 'color': '#ffffff'},
-                    readOnly=True
+                    children=[],
+                    style={'width': '100%', 'height': '400px', 'overflowY': 'auto', 'whiteSpace': 'pre', 'fontFamily': 'monospace',
+                           'backgroundColor': '#333333', 'color': '#ffffff'}
                 )
             ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '10px'}),
 
@@ -125,96 +239,152 @@ app.layout = html.Div([
         ], style={'marginBottom': '20px', 'display': 'flex', 'justifyContent': 'space-between'}),
 
         html.Div(id='output', style={'marginTop': '20px', 'fontSize': '16px', 'color': '#ffffff'}),
+
+        # Simulação em curso (job ID, linhas de log já enviadas e linhas na página) e sondagem do seu progresso
+        dcc.Store(id='job-store'),
+        dcc.Interval(id='job-interval', interval=500, disabled=True),
     ])
 ])
 
-# Callback para rodar a simulação
+def build_figures(network):
+    """Constrói os gráficos e tabelas a partir do estado final da rede."""
+    # Visualização do uso de slots
+    edges = list(network.graph.edges(data=True))
+    slots_usage = [
+        len([s for s in edge[2]['slots'] if not s]) for edge in edges
+    ]
+    fig = go.Figure(data=[
+        go.Bar(x=[f"{u}-{v}" for u, v, _ in edges], y=slots_usage, name="Uso de Slots")
+    ])
+    fig.update_layout(title="Uso de Slots nos Enlaces", xaxis_title="Enlaces", yaxis_title="Slots Usados", plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
+
+    # Desenho dos nós e ligações
+    pos = nx.spring_layout(network.graph)
+    edge_x = []
+    edge_y = []
+    for edge in network.graph.edges():
+        x0, y0 = pos[edge[0]]
+        x1, y1 = pos[edge[1]]
+        edge_x.append(x0)
+        edge_x.append(x1)
+        edge_x.append(None)
+        edge_y.append(y0)
+        edge_y.append(y1)
+        edge_y.append(None)
+    edge_trace = go.Scatter(
+        x=edge_x, y=edge_y,
+        line=dict(width=2, color='#888'),
+        hoverinfo='none',
+        mode='lines')
+
+    node_x = []
+    node_y = []
+    for node in network.graph.nodes():
+        x, y = pos[node]
+        node_x.append(x)
+        node_y.append(y)
+    node_trace = go.Scatter(
+        x=node_x, y=node_y,
+        mode='markers+text',
+        hoverinfo='text',
+        marker=dict(
+            showscale=True,
+            colorscale='YlGnBu',
+            size=10,
+            colorbar=dict(
+                thickness=15,
+                title='Node Connections',
+                xanchor='left',
+                titleside='right'
+            ),
+        ),
+        text=[str(node) for node in network.graph.nodes()])
+
+    fig_network = go.Figure(data=[edge_trace, node_trace])
+    fig_network.update_layout(title="Topologia da Rede", showlegend=False, plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
+
+    # Tabela de slots por enlace
+    slots_table = go.Figure(data=[go.Table(
+        header=dict(values=['Enlace', 'Slots Usados'], fill_color='#808184', font=dict(color='white')),
+        cells=dict(values=[[f"{u}-{v}" for u, v, _ in edges], slots_usage], fill_color='#333333', font=dict(color='white'))
+    )])
+    slots_table.update_layout(title="Tabela de Slots por Enlace", plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
+
+    # Tabela de transmissores e receptores por nó
+    txrx_data = np.zeros((network.graph.number_of_nodes(), 2))
+    for node in network.graph.nodes():
+        txrx_data[node-1, 0] = 10  # Exemplo: 10 transmissores por nó
+        txrx_data[node-1, 1] = 10  # Exemplo: 10 receptores por nó
+    txrx_table = go.Figure(data=[go.Table(
+        header=dict(values=['Nó', 'Transmissores', 'Receptores'], fill_color='#808184', font=dict(color='white')),
+        cells=dict(values=[[node for node in network.graph.nodes()], txrx_data[:, 0], txrx_data[:, 1]], fill_color='#333333', font=dict(color='white'))
+    )])
+    txrx_table.update_layout(title="Tabela de Transmissores e Receptores por Nó", plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
+
+    return fig_network, slots_table, txrx_table
+
+def append_logs(job, job_data):
+    """
+    Prepara o envio das novas linhas de log de uma simulação.
+    Só as novas linhas seguem para a página (Patch), que mantém no máximo MAX_LOG_LINES linhas.
+
+    Returns:
+        tuple: (Patch ou no_update, novo estado do job-store).
+    """
+    offset, shown = job_data['offset'], job_data['shown']
+    new_logs = job.logs[offset:offset + MAX_LOG_LINES]
+    if not new_logs:
+        return no_update, job_data
+    patch = Patch()
+    excess = shown + len(new_logs) - MAX_LOG_LINES
+    for _ in range(max(0, excess)):
+        del patch[0]
+    patch.extend([html.Div(line) for line in new_logs])
+    return patch, {'job_id': job.id, 'offset': offset + len(new_logs), 'shown': min(MAX_LOG_LINES, shown + len(new_logs))}
+
+# Callback para submeter a simulação e acompanhar o seu progresso
 @app.callback(
-    [Output('output', 'children'), Output('log-output', 'value'), Output('simulation-graph', 'figure'), Output('slots-table', 'figure'), Output('txrx-table', 'figure')],
-    Input('run-simulation-btn', 'n_clicks'),
-    State('duration-input', 'value')
+    [Output('output', 'children'), Output('log-output', 'children'), Output('simulation-graph', 'figure'), Output('slots-table', 'figure'), Output('txrx-table', 'figure'),
+     Output('job-store', 'data'), Output('job-interval', 'disabled')],
+    [Input('run-simulation-btn', 'n_clicks'), Input('job-interval', 'n_intervals')],
+    [State('duration-input', 'value'), State('job-store', 'data')]
 )
-def update_simulation(n_clicks, duration):
-    if n_clicks > 0 and duration:
+def update_simulation(n_clicks, n_intervals, duration, job_data):
+    triggered = [t['prop_id'] for t in callback_context.triggered]
+
+    # Novo clique: cancela a simulação anterior desta página, submete a nova e começa a sondagem
+    if 'run-simulation-btn.n_clicks' in triggered:
+        previous = job_data['job_id'] if job_data else None
+        if n_clicks > 0 and duration:
+            job_id = runner.submit(duration, previous=previous)
+            return "Simulação em curso... 0%", [], go.Figure(), go.Figure(), go.Figure(), {'job_id': job_id, 'offset': 0, 'shown': 0}, False
+        if previous:
+            runner.discard(previous)
+        return "Insira a duração e clique em 'Rodar Simulação'.", [], go.Figure(), go.Figure(), go.Figure(), None, True
+
+    # Sondagem: acrescenta apenas as novas linhas de log
+    if job_data:
+        job = runner.get(job_data['job_id'])
+        if job is None:
+            return "A simulação já não existe.", no_update, no_update, no_update, no_update, None, True
+        logs, job_data = append_logs(job, job_data)
+
+        # Só termina depois de enviar todas as linhas, em blocos de no máximo MAX_LOG_LINES por sondagem
+        if not job.done or job_data['offset'] < len(job.logs):
+            return f"Simulação em curso... {job.progress:.0%}", logs, no_update, no_update, no_update, job_data, False
+
+        runner.discard(job.id)
+        if job.status == "erro":
+            return f"Ocorreu um erro: {job.error}", logs, go.Figure(), go.Figure(), go.Figure(), None, True
+        if job.status == "cancelada":
+            return "Simulação cancelada.", logs, go.Figure(), go.Figure(), go.Figure(), None, True
         try:
-            network, logs = run_simulation(duration)
-            # Visualização do uso de slots
-            edges = list(network.graph.edges(data=True))
-            slots_usage = [
-                len([s for s in edge[2]['slots'] if not s]) for edge in edges
-            ]
-            fig = go.Figure(data=[
-                go.Bar(x=[f"{u}-{v}" for u, v, _ in edges], y=slots_usage, name="Uso de Slots")
-            ])
-            fig.update_layout(title="Uso de Slots nos Enlaces", xaxis_title="Enlaces", yaxis_title="Slots Usados", plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
-
-            # Desenho dos nós e ligações
-            pos = nx.spring_layout(network.graph)
-            edge_x = []
-            edge_y = []
-            for edge in network.graph.edges():
-                x0, y0 = pos[edge[0]]
-                x1, y1 = pos[edge[1]]
-                edge_x.append(x0)
-                edge_x.append(x1)
-                edge_x.append(None)
-                edge_y.append(y0)
-                edge_y.append(y1)
-                edge_y.append(None)
-            edge_trace = go.Scatter(
-                x=edge_x, y=edge_y,
-                line=dict(width=2, color='#888'),
-                hoverinfo='none',
-                mode='lines')
-
-            node_x = []
-            node_y = []
-            for node in network.graph.nodes():
-                x, y = pos[node]
-                node_x.append(x)
-                node_y.append(y)
-            node_trace = go.Scatter(
-                x=node_x, y=node_y,
-                mode='markers+text',
-                hoverinfo='text',
-                marker=dict(
-                    showscale=True,
-                    colorscale='YlGnBu',
-                    size=10,
-                    colorbar=dict(
-                        thickness=15,
-                        title='Node Connections',
-                        xanchor='left',
-                        titleside='right'
-                    ),
-                ),
-                text=[str(node) for node in network.graph.nodes()])
-
-            fig_network = go.Figure(data=[edge_trace, node_trace])
-            fig_network.update_layout(title="Topologia da Rede", showlegend=False, plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
-
-            # Tabela de slots por enlace
-            slots_table = go.Figure(data=[go.Table(
-                header=dict(values=['Enlace', 'Slots Usados'], fill_color='#808184', font=dict(color='white')),
-                cells=dict(values=[[f"{u}-{v}" for u, v, _ in edges], slots_usage], fill_color='#333333', font=dict(color='white'))
-            )])
-            slots_table.update_layout(title="Tabela de Slots por Enlace", plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
-
-            # Tabela de transmissores e receptores por nó
-            txrx_data = np.zeros((network.graph.number_of_nodes(), 2))
-            for node in network.graph.nodes():
-                txrx_data[node-1, 0] = 10  # Exemplo: 10 transmissores por nó
-                txrx_data[node-1, 1] = 10  # Exemplo: 10 receptores por nó
-            txrx_table = go.Figure(data=[go.Table(
-                header=dict(values=['Nó', 'Transmissores', 'Receptores'], fill_color='#808184', font=dict(color='white')),
-                cells=dict(values=[[node for node in network.graph.nodes()], txrx_data[:, 0], txrx_data[:, 1]], fill_color='#333333', font=dict(color='white'))
-            )])
-            txrx_table.update_layout(title="Tabela de Transmissores e Receptores por Nó", plot_bgcolor='#0e1012', paper_bgcolor='#0e1012', font=dict(color='#ffffff'))
-
-            return "Simulação concluída.", "\n".join(logs), fig_network, slots_table, txrx_table
+            fig_network, slots_table, txrx_table = build_figures(job.network)
         except Exception as e:
-            return f"Ocorreu um erro: {str(e)}", "", go.Figure(), go.Figure(), go.Figure()
-    return "Insira a duração e clique em 'Rodar Simulação'.", "", go.Figure(), go.Figure(), go.Figure()
+            return f"Ocorreu um erro: {str(e)}", logs, go.Figure(), go.Figure(), go.Figure(), None, True
+        return "Simulação concluída.", logs, fig_network, slots_table, txrx_table, None, True
+
+    return "Insira a duração e clique em 'Rodar Simulação'.", [], go.Figure(), go.Figure(), go.Figure(), None, True
 
 # Executar o servidor
 if __name__ == '__main__':